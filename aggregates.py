@@ -0,0 +1,90 @@
+"""Order-level aggregates shared by every page of the app."""
+from collections import OrderedDict
+from functools import wraps
+import threading
+
+from instrumentation import count_cache, span
+
+SUMMARY_COLUMNS = ['Total', 'Lines', 'Kg', 'Paid', 'Pending_Amount']
+
+
+def memoize_by_version(maxsize=2):
+    """Cache a function's result on its first argument, a data version key.
+
+    The remaining arguments (usually DataFrames) are not hashed, the version
+    key alone decides whether a cached result is still valid. Results are
+    shared across sessions and returned without copying, so callers must
+    treat them as read-only. Concurrent callers missing on the same version
+    wait for the first one's result instead of computing it again.
+    """
+    def decorator(fn):
+        cache = OrderedDict()
+        in_flight = {}
+        lock = threading.Lock()
+
+        @wraps(fn)
+        def wrapper(version, *args, **kwargs):
+            with lock:
+                if version in cache:
+                    cache.move_to_end(version)
+                    count_cache(fn.__name__, hit=True)
+                    return cache[version]
+                done = in_flight.get(version)
+                if done is None:
+                    done = in_flight[version] = threading.Event()
+                    owner = True
+                else:
+                    owner = False
+            if not owner:
+                with span(f"wait {fn.__name__}"):
+                    done.wait()
+                with lock:
+                    if version in cache:
+                        count_cache(fn.__name__, hit=True)
+                        return cache[version]
+                # The first caller failed; compute it here and let its error surface here too
+                return fn(version, *args, **kwargs)
+            count_cache(fn.__name__, hit=False)
+            try:
+                with span(fn.__name__):
+                    result = fn(version, *args, **kwargs)
+                with lock:
+                    cache[version] = result
+                    while len(cache) > maxsize:
+                        cache.popitem(last=False)
+            finally:
+                with lock:
+                    del in_flight[version]
+                done.set()
+            return result
+
+        wrapper.cache_clear = cache.clear
+        return wrapper
+
+    return decorator
+
+
+def build_order_summary(orders_df, order_items_df, payments_df=None):
+    """One row per order with its total, line count, kg, amount paid and amount due.
+
+    Built in a single groupby pass over the line items (and one over the
+    payments ledger) and indexed by Order_ID, so per-order lookups are O(1).
+    Orders marked Paid owe nothing whatever the ledger says; Pending orders
+    owe their total less any part payments.
+    """
+    per_order = order_items_df.groupby('Order_ID').agg(
+        Total=('Amount', 'sum'),
+        Lines=('Amount', 'size'),
+        Kg=('quantity', 'sum'),
+    )
+    summary = per_order.reindex(orders_df['Order_ID'], fill_value=0)
+    if payments_df is not None and len(payments_df):
+        paid = payments_df.groupby('Order_ID')['Amount'].sum().reindex(summary.index, fill_value=0)
+        summary['Paid'] = paid.to_numpy(dtype='float64')
+    else:
+        summary['Paid'] = 0.0
+    pending = (orders_df['Payment'] == 'Pending').to_numpy()
+    summary['Pending_Amount'] = (summary['Total'] - summary['Paid']).clip(lower=0).where(pending, 0)
+    summary['Lines'] = summary['Lines'].astype('int64')
+    return summary[SUMMARY_COLUMNS]
+
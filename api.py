@@ -0,0 +1,327 @@
+"""Read-only JSON API over the order book for kitchen displays and delivery phones.
+
+    GET /api/version
+    GET /api/orders[?since=V]
+    GET /api/order-items[?since=V]
+    GET /api/stock
+    GET /api/deliveries/today[?drivers=N]
+
+The server is a stdlib ThreadingHTTPServer. It runs on a thread inside the
+Streamlit process when DIWALI_API_PORT is set, sharing that process's
+order book, or on its own over the SQLite database with ``python api.py``.
+There is no authentication, so it listens on 127.0.0.1 unless
+DIWALI_API_HOST (or --host) names another interface.
+
+Every response carries an ETag derived from the API version, so a poll
+whose If-None-Match still matches gets a 304 without any data being read.
+Bodies are serialized once per version and then served from memory. The
+order and line item endpoints take ``since``, a version from an earlier
+response, and return only the orders that changed after it plus the ids
+of removed ones. Changes are found by comparing per-order fingerprints
+of consecutive snapshots, once per version.
+"""
+import argparse
+import gzip
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from secrets import token_hex
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+import pandas as pd
+from pandas.util import hash_pandas_object
+
+from deliveries import plan_deliveries
+from planner import stock_plan_from_rollup
+
+logger = logging.getLogger(__name__)
+
+# Serialized bodies kept per version: one per endpoint, query and ``since`` seen
+MAX_CACHED_BODIES = 64
+GZIP_MIN_BYTES = 1024
+# Same limit as the Deliveries page
+MAX_DRIVERS = 20
+
+
+class BadRequest(ValueError):
+    pass
+
+
+def order_fingerprints(snapshot):
+    """One uint64 per order of ``snapshot`` that changes when the order, its lines or its payments do."""
+    orders = snapshot.orders_df
+    fingerprints = (hash_pandas_object(orders, index=False).to_numpy()
+                    ^ hash_pandas_object(snapshot.summary.reindex(orders['Order_ID']), index=False).to_numpy())
+    lines = snapshot.order_items_df
+    positions = pd.Index(orders['Order_ID']).get_indexer(lines['Order_ID'])
+    known = positions >= 0
+    # Summing wraps around in uint64, which is fine for a fingerprint and ignores line order
+    line_sums = np.zeros(len(orders), dtype=np.uint64)
+    np.add.at(line_sums, positions[known], hash_pandas_object(lines, index=False).to_numpy()[known])
+    return pd.Series(fingerprints ^ line_sums, index=orders['Order_ID'].to_numpy())
+
+
+@dataclass(frozen=True)
+class Revision:
+    """One API version: the snapshot it serves and when each order last changed."""
+    number: int
+    snapshot: object
+    fingerprints: pd.Series
+    # Order_ID -> revision number of its last change
+    changed_at: pd.Series
+    # Order_ID -> revision number it was removed in
+    removed_at: dict
+
+
+class ApiState:
+    """The current revision and its serialized bodies, shared by all request threads."""
+
+    def __init__(self, book, sync_interval=5.0):
+        self.book = book
+        self.sync_interval = sync_interval
+        # Revision numbers restart with the process; the epoch tells a client its ``since`` is stale
+        self.epoch = token_hex(4)
+        self.head = None
+        self._synced_at = None
+        self._bodies = {}
+        self._lock = threading.Lock()
+
+    def version(self, revision):
+        return f"{self.epoch}.{revision.number}"
+
+    def current(self):
+        """The revision for the book's current version, syncing the book at most every ``sync_interval``."""
+        now = time.monotonic()
+        if self._synced_at is None or now - self._synced_at >= self.sync_interval:
+            self._synced_at = now
+            self.book.sync()
+        head = self.head
+        if head is None or head.snapshot.version != self.book.version:
+            with self._lock:
+                if self.head is None or self.head.snapshot.version != self.book.version:
+                    self.head = self._advance(self.head, self.book.snapshot())
+                    self._bodies = {}
+                head = self.head
+        return head
+
+    def _advance(self, previous, snapshot):
+        fingerprints = order_fingerprints(snapshot)
+        if previous is None:
+            return Revision(0, snapshot, fingerprints, pd.Series(0, index=fingerprints.index), {})
+        number = previous.number + 1
+        old = previous.fingerprints.reindex(fingerprints.index, fill_value=0)
+        changed = ~fingerprints.index.isin(previous.fingerprints.index) | (old != fingerprints).to_numpy()
+        changed_at = previous.changed_at.reindex(fingerprints.index, fill_value=number).mask(changed, number)
+        removed = previous.fingerprints.index.difference(fingerprints.index)
+        removed_at = {order_id: at for order_id, at in previous.removed_at.items() if order_id not in fingerprints.index}
+        removed_at.update(dict.fromkeys(removed.tolist(), number))
+        return Revision(number, snapshot, fingerprints, changed_at, removed_at)
+
+    def since(self, revision, token):
+        """Revision number a ``since`` token refers to, or None when the client needs everything."""
+        if token is None:
+            return None
+        epoch, _, number = token.partition('.')
+        if epoch != self.epoch or not number.isdigit() or int(number) > revision.number:
+            return None
+        return int(number)
+
+    def etag(self, revision, key):
+        digest = hashlib.sha1(repr((self.epoch, revision.number, key)).encode()).hexdigest()[:20]
+        return f'"{digest}"'
+
+    def body(self, revision, key, build):
+        """``(raw, gzipped)`` for ``key`` at ``revision``, built on first request."""
+        cached = self._bodies.get((revision.number, key))
+        if cached is None:
+            raw = build(revision).encode('utf-8')
+            cached = (raw, gzip.compress(raw, 6) if len(raw) >= GZIP_MIN_BYTES else None)
+            with self._lock:
+                if self.head is revision:
+                    if len(self._bodies) >= MAX_CACHED_BODIES:
+                        self._bodies.pop(next(iter(self._bodies)))
+                    self._bodies[(revision.number, key)] = cached
+        return cached
+
+
+def _records(frame):
+    return frame.to_json(orient='records', date_format='iso', date_unit='s')
+
+
+def _envelope(api, revision, **parts):
+    """A JSON object of the version plus already serialized ``parts``."""
+    fields = [f'"version":{json.dumps(api.version(revision))}']
+    fields += [f'{json.dumps(name)}:{value}' for name, value in parts.items()]
+    return '{' + ','.join(fields) + '}'
+
+
+def _changes(api, revision, since, frame):
+    """Rows of ``frame`` (keyed by Order_ID) for orders changed after ``since``, and removed order ids."""
+    if since is None:
+        return frame, []
+    changed = revision.changed_at.index[revision.changed_at.to_numpy() > since]
+    removed = sorted(order_id for order_id, at in revision.removed_at.items() if at > since)
+    return frame[frame['Order_ID'].isin(changed)], removed
+
+
+def orders_body(api, revision, query):
+    snapshot = revision.snapshot
+    since = api.since(revision, query.get('since'))
+    orders, removed = _changes(api, revision, since, snapshot.orders_df)
+    orders = orders.merge(snapshot.summary, left_on='Order_ID', right_index=True, how='left')
+    return _envelope(api, revision, full=json.dumps(since is None), orders=_records(orders),
+                     removed=json.dumps(removed))
+
+
+def order_items_body(api, revision, query):
+    since = api.since(revision, query.get('since'))
+    # A changed order's lines are sent in full; clients replace that order's lines
+    lines, removed = _changes(api, revision, since, revision.snapshot.order_items_df)
+    return _envelope(api, revision, full=json.dumps(since is None), order_items=_records(lines),
+                     removed=json.dumps(removed))
+
+
+def stock_body(api, revision, query):
+    snapshot = revision.snapshot
+    plan = stock_plan_from_rollup(snapshot.version, snapshot.items_df, snapshot.rollup)
+    return _envelope(api, revision, stock=_records(plan.summary.reset_index()))
+
+
+def deliveries_body(api, revision, query):
+    try:
+        drivers = int(query.get('drivers', 1))
+    except ValueError:
+        raise BadRequest("drivers must be a whole number")
+    if not 1 <= drivers <= MAX_DRIVERS:
+        raise BadRequest(f"drivers must be between 1 and {MAX_DRIVERS}")
+    snapshot = revision.snapshot
+    today = date.fromisoformat(query['day'])
+    plan = plan_deliveries(snapshot.orders_df, snapshot.order_items_df, snapshot.summary, today, drivers=drivers)
+    return _envelope(api, revision, date=json.dumps(today.isoformat()), stops=_records(plan.stops))
+
+
+def version_body(api, revision, query):
+    return _envelope(api, revision, data_version=json.dumps(revision.snapshot.version),
+                     orders=str(len(revision.snapshot.orders_df)))
+
+
+ROUTES = {
+    '/api/version': version_body,
+    '/api/orders': orders_body,
+    '/api/order-items': order_items_body,
+    '/api/stock': stock_body,
+    '/api/deliveries/today': deliveries_body,
+}
+
+
+def _matches(if_none_match, etag):
+    if if_none_match is None:
+        return False
+    tags = [tag.strip().removeprefix('W/') for tag in if_none_match.split(',')]
+    return '*' in tags or etag in tags
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = "DiwaliOrdersAPI"
+    # Keep-alive, so a polling client reuses one connection
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        route = ROUTES.get(url.path.rstrip('/'))
+        if route is None:
+            return self._send(404, json.dumps({'error': 'not found'}).encode())
+        query = {name: values[-1] for name, values in parse_qs(url.query).items()}
+        # Today's deliveries change at midnight even when the data does not
+        query['day'] = date.today().isoformat()
+        api = self.server.api
+        try:
+            revision = api.current()
+            key = (route.__name__, tuple(sorted(query.items())))
+            etag = api.etag(revision, key)
+            if _matches(self.headers.get('If-None-Match'), etag):
+                return self._send(304, b'', etag)
+            raw, gzipped = api.body(revision, key, lambda revision: route(api, revision, query))
+        except BadRequest as error:
+            return self._send(400, json.dumps({'error': str(error)}).encode())
+        except Exception:
+            logger.exception("API request failed: %s", self.path)
+            return self._send(500, json.dumps({'error': 'internal error'}).encode())
+        if gzipped is not None and 'gzip' in self.headers.get('Accept-Encoding', ''):
+            return self._send(200, gzipped, etag, encoding='gzip')
+        self._send(200, raw, etag)
+
+    def _send(self, status, body, etag=None, encoding=None):
+        self.send_response(status)
+        if etag is not None:
+            self.send_header('ETag', etag)
+            # Clients may keep the body but must revalidate it on every poll
+            self.send_header('Cache-Control', 'no-cache')
+        if status != 304:
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+        if encoding is not None:
+            self.send_header('Content-Encoding', encoding)
+            self.send_header('Vary', 'Accept-Encoding')
+        self.end_headers()
+        if status != 304:
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logger.debug(format, *args)
+
+
+class ApiServer:
+    def __init__(self, book, host='127.0.0.1', port=8502, sync_interval=5.0):
+        self.api = ApiState(book, sync_interval)
+        self.httpd = ThreadingHTTPServer((host, port), _Handler)
+        self.httpd.daemon_threads = True
+        self.httpd.api = self.api
+        self._thread = None
+
+    @property
+    def port(self):
+        return self.httpd.server_address[1]
+
+    def start(self):
+        """Serve on a daemon thread."""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="api", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def main(argv=None):
+    from orderbook import OrderBook
+    from storage import SQLiteStore
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--db', default=os.environ.get("DIWALI_DB_PATH", "diwali_orders.db"))
+    parser.add_argument('--host', default=os.environ.get("DIWALI_API_HOST", "127.0.0.1"))
+    parser.add_argument('--port', type=int, default=int(os.environ.get("DIWALI_API_PORT") or 8502))
+    parser.add_argument('--sync-interval', type=float, default=5.0,
+                        help="seconds between checks of the database for new writes")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+    server = ApiServer(OrderBook(SQLiteStore(args.db)), args.host, args.port, args.sync_interval)
+    logger.info("serving on %s:%d", args.host, server.port)
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+
+if __name__ == '__main__':
+    main()
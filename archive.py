@@ -0,0 +1,155 @@
+"""Season archive: past Diwali seasons stored as partitioned Parquet files.
+
+Each season lives in its own directory, ``<root>/season=<year>/``, with one
+Parquet file per table. Queries name the seasons and columns they need,
+so only those partitions and column chunks are read, memory-mapped. The
+live store keeps serving the current season; nothing here runs on the
+normal load path.
+"""
+import os
+import shutil
+
+import pandas as pd
+
+from aggregates import memoize_by_version
+from storage import ITEM_COLUMNS, ORDER_COLUMNS, ORDER_ITEM_COLUMNS, PAYMENT_COLUMNS
+
+TABLES = {'items': ITEM_COLUMNS, 'orders': ORDER_COLUMNS, 'order_items': ORDER_ITEM_COLUMNS,
+          'payments': PAYMENT_COLUMNS}
+
+
+def season_of(delivery_dates):
+    """Season label for each delivery date: the year of that Diwali, missing where the date is."""
+    years = delivery_dates.dt.year
+    return years.astype('Int64').astype(str).where(years.notna())
+
+
+class SeasonArchive:
+    def __init__(self, root):
+        self.root = root
+
+    def _path(self, season, table=None):
+        directory = os.path.join(self.root, f"season={season}")
+        return directory if table is None else os.path.join(directory, f"{table}.parquet")
+
+    def seasons(self):
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(name.split('=', 1)[1] for name in os.listdir(self.root)
+                      if name.startswith('season=') and not name.endswith('.tmp')
+                      and os.path.exists(self._path(name.split('=', 1)[1], 'orders')))
+
+    def version(self):
+        """Changes whenever a season is written or removed."""
+        stamps = [f"{season}@{os.stat(self._path(season, 'orders')).st_mtime_ns}" for season in self.seasons()]
+        return f"archive:{self.root}:{','.join(stamps)}"
+
+    def write_season(self, season, items_df, orders_df, order_items_df, payments_df=None):
+        """Write (or replace) one season; readers never see a half-written partition."""
+        final = self._path(season)
+        staging = final + '.tmp'
+        shutil.rmtree(staging, ignore_errors=True)
+        os.makedirs(staging)
+        if payments_df is None:
+            payments_df = pd.DataFrame(columns=PAYMENT_COLUMNS)
+        for table, frame in (('items', items_df), ('orders', orders_df), ('order_items', order_items_df),
+                             ('payments', payments_df)):
+            frame = frame[TABLES[table]].reset_index(drop=True)
+            # Plain strings on disk; the compact dtypes are an in-memory concern
+            frame = frame.astype({column: object for column, dtype in frame.dtypes.items()
+                                  if isinstance(dtype, pd.CategoricalDtype)})
+            frame.to_parquet(os.path.join(staging, f"{table}.parquet"), index=False)
+        shutil.rmtree(final, ignore_errors=True)
+        os.replace(staging, final)
+
+    def archive_store(self, store, season=None):
+        """Copy the store's orders into the archive.
+
+        Orders are partitioned by the year of their delivery date unless
+        ``season`` is given, in which case they all go to that partition.
+        Without ``season``, orders that have no delivery date are left out.
+        Returns the seasons written.
+        """
+        items_df, orders_df, order_items_df = store.load_all()
+        payments_df = store.load_payments()
+        seasons = season_of(orders_df['Delivery_Date'])
+        written = []
+        for label in ([season] if season else sorted(seasons.dropna().unique())):
+            orders = orders_df[seasons == label] if season is None else orders_df
+            lines = order_items_df[order_items_df['Order_ID'].isin(orders['Order_ID'])]
+            payments = payments_df[payments_df['Order_ID'].isin(orders['Order_ID'])]
+            self.write_season(label, items_df, orders, lines, payments)
+            written.append(label)
+        return written
+
+    def read(self, table, seasons=None, columns=None):
+        """One table across ``seasons`` (default all), with a Season column.
+
+        Seasons archived before a table existed (payments) are skipped.
+        """
+        frames = []
+        for season in seasons if seasons is not None else self.seasons():
+            if not os.path.exists(self._path(season, table)):
+                continue
+            frame = pd.read_parquet(self._path(season, table), columns=columns, memory_map=True)
+            frames.append(frame.assign(Season=season))
+        if not frames:
+            return pd.DataFrame(columns=(columns or TABLES[table]) + ['Season'])
+        return pd.concat(frames, ignore_index=True)
+
+
+def _with_live(archive, table, columns, live_season, live_frame):
+    # The live store is authoritative for its season even if it was archived before
+    seasons = [season for season in archive.seasons() if season != live_season]
+    history = archive.read(table, seasons, columns)
+    if live_frame is None:
+        return history
+    live = live_frame[columns].assign(Season=live_season)
+    return pd.concat([history, live.astype({column: object for column, dtype in live.dtypes.items()
+                                            if isinstance(dtype, pd.CategoricalDtype)})],
+                     ignore_index=True)
+
+
+@memoize_by_version(maxsize=4)
+def season_lines(version, archive, live_season=None, orders_df=None, order_items_df=None):
+    """Line items of every season joined to their order's customer and season."""
+    orders = _with_live(archive, 'orders', ['Order_ID', 'Customer_Name', 'Phone'], live_season, orders_df)
+    lines = _with_live(archive, 'order_items', ['Order_ID', 'Item_Name', 'quantity', 'Amount'],
+                       live_season, order_items_df)
+    # Order_IDs restart each season, so join on both
+    orders['Customer_Key'] = orders['Customer_Name'].str.casefold().str.strip()
+    return lines.merge(orders[['Season', 'Order_ID', 'Customer_Key']], on=['Season', 'Order_ID'], how='inner')
+
+
+def revenue_by_season(lines):
+    """Orders, customers and revenue per season with year-over-year growth."""
+    per_season = lines.groupby('Season').agg(
+        Orders=('Order_ID', 'nunique'),
+        Customers=('Customer_Key', 'nunique'),
+        Revenue=('Amount', 'sum'),
+    ).sort_index()
+    per_season['Revenue_Growth'] = per_season['Revenue'].pct_change()
+    return per_season
+
+
+def repeat_customers(lines):
+    """Per season: customers who also ordered in an earlier season, and new ones."""
+    first_season = lines.groupby('Customer_Key')['Season'].min()
+    customers = lines[['Season', 'Customer_Key']].drop_duplicates()
+    returning = customers['Season'] != customers['Customer_Key'].map(first_season)
+    counts = customers.assign(Returning=returning).groupby('Season')['Returning'].agg(['sum', 'size'])
+    return pd.DataFrame({
+        'Returning': counts['sum'].astype('int64'),
+        'New': (counts['size'] - counts['sum']).astype('int64'),
+        'Repeat_Rate': counts['sum'] / counts['size'],
+    })
+
+
+def item_demand_growth(lines):
+    """Kg per item per season, with growth of the latest season over the one before."""
+    demand = lines.pivot_table(index='Item_Name', columns='Season', values='quantity',
+                               aggfunc='sum', fill_value=0).sort_index(axis=1)
+    if demand.shape[1] >= 2:
+        previous, latest = demand.iloc[:, -2], demand.iloc[:, -1]
+        demand['Growth'] = (latest - previous) / previous.where(previous > 0)
+    return demand
@@ -0,0 +1,46 @@
+"""Memory and latency of the plain vs compact table representation.
+
+    python benchmarks/bench_compact.py --lines 1000000
+"""
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from compact import compact_tables, memory_usage  # noqa: E402
+from synthetic_data import generate_tables  # noqa: E402
+
+
+OPERATIONS = {
+    'status mask': lambda i, o, l: o[o['Status'] == 'Active'],
+    'item filter': lambda i, o, l: l[l['Item_Name'] == 'Chakli'],
+    'kg per item': lambda i, o, l: l.groupby('Item_Name', observed=True)['quantity'].sum(),
+    'join lines to orders': lambda i, o, l: l.merge(o[['Order_ID', 'Status', 'Payment']], on='Order_ID'),
+    'amount by status/payment': lambda i, o, l: l.merge(o[['Order_ID', 'Status', 'Payment']], on='Order_ID')
+        .groupby(['Status', 'Payment'], observed=True)['Amount'].sum(),
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--lines', type=int, default=500000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    plain = generate_tables(args.lines)
+    compact = compact_tables(*plain)
+
+    print(f"{len(plain[1]):,} orders, {len(plain[2]):,} line items")
+    before, after = memory_usage(*plain), memory_usage(*compact)
+    print(f"{'memory':<26}{before / 2**20:>10.1f} MiB{after / 2**20:>10.1f} MiB{before / after:>8.1f}x")
+    for name, operation in OPERATIONS.items():
+        timings = []
+        for tables in (plain, compact):
+            timings.append(min(timeit.repeat(lambda: operation(*tables), number=1, repeat=args.repeat)))
+        print(f"{name:<26}{timings[0] * 1000:>10.1f} ms {timings[1] * 1000:>10.1f} ms {timings[0] / timings[1]:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,153 @@
+"""Latency and peak memory of every page computation at festival scale.
+
+    python benchmarks/bench_pages.py                      # 1k and 100k line items
+    python benchmarks/bench_pages.py --scales 1k,100k,1M --json results.json
+    python benchmarks/bench_pages.py --compare results.json
+
+Tables are generated with synthetic_data and compacted exactly as the
+order book does. Every run uses a fresh version key so memoized results
+are never reused, i.e. these are the cold, once-per-data-version costs.
+With --compare the run fails if any computation got slower than the
+baseline by more than --threshold.
+"""
+import argparse
+import io
+import itertools
+import json
+import os
+import sys
+import timeit
+import tracemalloc
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aggregates import build_order_summary  # noqa: E402
+from api import order_fingerprints  # noqa: E402
+from compact import compact_payments, compact_tables  # noqa: E402
+from customers import CustomerDirectory  # noqa: E402
+from deliveries import delivery_sheets_html, plan_deliveries  # noqa: E402
+from exports import write_export  # noqa: E402
+from item_index import ItemIndex  # noqa: E402
+from payments import build_receivables, reminder_messages  # noqa: E402
+from order_index import OrderIndex  # noqa: E402
+from orderbook import BookSnapshot  # noqa: E402
+from planner import build_stock_plan  # noqa: E402
+from rollups import DailyRollup  # noqa: E402
+from synthetic_data import DIWALI, SCALES, generate_payments, generate_tables  # noqa: E402
+from validation import validate_tables  # noqa: E402
+from views import dashboard_view, item_customers_view, order_listing, stock_analysis_table  # noqa: E402
+
+TODAY = DIWALI - pd.Timedelta(days=3)
+_versions = itertools.count()
+
+
+def _version():
+    return f"bench:{next(_versions)}"
+
+
+def computations(items_df, orders_df, order_items_df):
+    """Name -> zero-argument callable for each page computation."""
+    payments_df = compact_payments(generate_payments(orders_df, order_items_df))
+    summary = build_order_summary(orders_df, order_items_df, payments_df)
+    dues = build_receivables(orders_df, summary, TODAY)
+    item_index = ItemIndex(orders_df, order_items_df)
+    order_index = OrderIndex(orders_df, order_items_df)
+    rollup = DailyRollup.build(orders_df, order_items_df)
+    directory = CustomerDirectory(orders_df, summary)
+    snapshot = BookSnapshot(_version(), items_df, orders_df, order_items_df, payments_df, summary, rollup)
+    busiest_item = rollup.by_item()['Orders'].idxmax()
+    flipped = orders_df.iloc[0]
+    flipped_lines = order_items_df[order_items_df['Order_ID'] == flipped['Order_ID']]
+    return {
+        'order summary': lambda: build_order_summary(orders_df, order_items_df, payments_df),
+        'rollup build': lambda: DailyRollup.build(orders_df, order_items_df),
+        'rollup status flip': lambda: rollup.updated(removed=(flipped, flipped_lines),
+                                                     added=(flipped.replace({'Active': 'Completed'}), flipped_lines)),
+        'dashboard': lambda: dashboard_view(_version(), items_df, orders_df, rollup, summary, TODAY),
+        'stock analysis': lambda: stock_analysis_table(build_stock_plan(items_df, orders_df, order_items_df)),
+        'item index build': lambda: ItemIndex(orders_df, order_items_df),
+        'item-wise customers': lambda: item_customers_view(item_index, rollup, busiest_item),
+        'order index build': lambda: OrderIndex(orders_df, order_items_df),
+        'order listing page': lambda: order_listing(order_index, summary, 'Active', page=3, page_size=25,
+                                                    customer='customer 1', payment='Pending'),
+        'customer directory build': lambda: CustomerDirectory(orders_df, summary),
+        'customer search': lambda: directory.search('custmer 12'),
+        'receivables': lambda: build_receivables(orders_df, summary, TODAY),
+        'reminders': lambda: reminder_messages(dues, orders_df, summary, TODAY),
+        'delivery sheets': lambda: delivery_sheets_html(plan_deliveries(orders_df, order_items_df, summary,
+                                                                        TODAY, drivers=4)),
+        # In-process, so the figure is the render cost a pool worker spreads out
+        'invoice zip (2k orders)': lambda: write_export(io.BytesIO(), orders_df.head(2000), order_items_df, summary,
+                                                        'Bench Snacks'),
+        'api order fingerprints': lambda: order_fingerprints(snapshot),
+        'validation': lambda: validate_tables(items_df, orders_df, order_items_df),
+    }
+
+
+def measure(fn, repeat):
+    seconds = min(timeit.repeat(fn, number=1, repeat=repeat))
+    tracemalloc.start()
+    try:
+        fn()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return seconds, peak
+
+
+def run(scales, repeat, seed=0):
+    results = {}
+    for scale in scales:
+        tables = compact_tables(*generate_tables(SCALES[scale], seed=seed))
+        print(f"\n{scale} line items ({len(tables[1]):,} orders, {len(tables[2]):,} lines)")
+        print(f"{'computation':<24}{'latency':>12}{'peak memory':>14}")
+        results[scale] = {}
+        for name, fn in computations(*tables).items():
+            seconds, peak = measure(fn, repeat)
+            results[scale][name] = {'seconds': seconds, 'peak_bytes': peak}
+            print(f"{name:<24}{seconds * 1000:>9.2f} ms{peak / 2**20:>10.1f} MiB")
+    return results
+
+
+def compare(results, baseline, threshold):
+    regressions = []
+    for scale, names in results.items():
+        for name, result in names.items():
+            before = baseline.get(scale, {}).get(name)
+            if before and result['seconds'] > before['seconds'] * threshold:
+                regressions.append(f"{scale} {name}: {before['seconds'] * 1000:.2f} ms -> "
+                                   f"{result['seconds'] * 1000:.2f} ms")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--scales', default='1k,100k', help=f"comma separated, from {', '.join(SCALES)}")
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--json', help="write results to this file")
+    parser.add_argument('--compare', help="baseline results file to check against")
+    parser.add_argument('--threshold', type=float, default=1.25)
+    args = parser.parse_args(argv)
+
+    scales = args.scales.split(',')
+    unknown = [scale for scale in scales if scale not in SCALES]
+    if unknown:
+        parser.error(f"unknown scales: {', '.join(unknown)}")
+
+    results = run(scales, args.repeat)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        if regressions:
+            print("\nRegressions:\n  " + "\n  ".join(regressions))
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
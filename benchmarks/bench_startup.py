@@ -0,0 +1,139 @@
+"""Cold-start and rerun latency of the app.
+
+    python benchmarks/bench_startup.py                    # 100k line items
+    python benchmarks/bench_startup.py --scale 1M --json startup.json
+    python benchmarks/bench_startup.py --compare startup.json
+
+Cold start is measured in fresh interpreters over a SQLite database of
+synthetic data. It covers importing what the entry script imports, then
+the order book's first load: once from the store, and once from the
+snapshot the first load saved. Reruns are measured with Streamlit's
+AppTest as the median rerun of each page after its first visit. With
+--compare the run fails if anything got slower than the baseline by
+more than --threshold, as in bench_pages.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from bench_pages import compare  # noqa: E402
+from synthetic_data import SCALES, generate_payments, generate_tables  # noqa: E402
+from storage import SQLiteStore  # noqa: E402
+
+# Modules the entry script imports before it has any data
+ENTRY_IMPORTS = ['streamlit', 'instrumentation', 'book_cache', 'orderbook', 'precompute', 'screens',
+                 'screens.common', 'settings', 'storage', 'validation']
+
+COLD_START = """
+import importlib, json, sys, time
+start = time.perf_counter()
+sys.path.insert(0, {root!r})
+for module in {modules!r}:
+    importlib.import_module(module)
+imported = time.perf_counter()
+from book_cache import BookCache
+from orderbook import OrderBook
+from storage import SQLiteStore
+book = OrderBook(SQLiteStore({db!r}), BookCache({snapshots!r}) if {snapshots!r} else None)
+book.sync()
+print(json.dumps({{'imports': imported - start, 'load': time.perf_counter() - imported}}))
+"""
+
+
+def cold_start(db, snapshots):
+    code = COLD_START.format(root=ROOT, modules=ENTRY_IMPORTS, db=db, snapshots=snapshots)
+    output = subprocess.run([sys.executable, '-c', code], check=True, capture_output=True, text=True).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+def run_cold(db, directory, repeat):
+    snapshots = os.path.join(directory, 'snapshots')
+    # The first load from the store saves the snapshot the later ones start from
+    from_store = [cold_start(db, '') for _ in range(repeat)]
+    cold_start(db, snapshots)
+    from_snapshot = [cold_start(db, snapshots) for _ in range(repeat)]
+    return {
+        'imports': min(run['imports'] for run in from_store + from_snapshot),
+        'first load from store': min(run['load'] for run in from_store),
+        'first load from snapshot': min(run['load'] for run in from_snapshot),
+    }
+
+
+def run_reruns(repeat):
+    from streamlit.testing.v1 import AppTest
+    from screens import PAGES
+
+    app = AppTest.from_file(os.path.join(ROOT, 'diwali_orders.py'), default_timeout=300)
+    app.run()
+    results = {}
+    for page in PAGES:
+        app.sidebar.radio[0].set_value(page)
+        app.run()
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            app.run()
+            timings.append(time.perf_counter() - start)
+        if app.exception:
+            raise RuntimeError(f"{page}: {app.exception[0].value}")
+        results[page] = statistics.median(timings)
+    return results
+
+
+def run(scale, repeat):
+    directory = tempfile.mkdtemp(prefix='bench_startup_')
+    db = os.path.join(directory, 'orders.db')
+    items_df, orders_df, order_items_df = generate_tables(SCALES[scale])
+    SQLiteStore(db).replace_all(items_df, orders_df, order_items_df, generate_payments(orders_df, order_items_df))
+    print(f"\n{scale} line items ({len(orders_df):,} orders, {len(order_items_df):,} lines)")
+
+    results = {'cold start': {}, 'rerun': {}}
+    print(f"{'cold start':<28}{'latency':>12}")
+    for name, seconds in run_cold(db, directory, repeat).items():
+        results['cold start'][name] = {'seconds': seconds}
+        print(f"{name:<28}{seconds * 1000:>9.1f} ms")
+
+    # The app reads its settings from the environment when first imported
+    os.environ.update(DIWALI_DB_PATH=db, DIWALI_SNAPSHOT_PATH=os.path.join(directory, 'app_snapshots'),
+                      DIWALI_ARCHIVE_PATH=os.path.join(directory, 'archive'), DIWALI_REFRESH_SECONDS='0')
+    print(f"\n{'rerun':<28}{'latency':>12}")
+    for page, seconds in run_reruns(repeat).items():
+        results['rerun'][page] = {'seconds': seconds}
+        print(f"{page:<28}{seconds * 1000:>9.1f} ms")
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--scale', default='100k', help=f"one of {', '.join(SCALES)}")
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--json', help="write results to this file")
+    parser.add_argument('--compare', help="baseline results file to check against")
+    parser.add_argument('--threshold', type=float, default=1.25)
+    args = parser.parse_args(argv)
+    if args.scale not in SCALES:
+        parser.error(f"unknown scale: {args.scale}")
+
+    results = run(args.scale, args.repeat)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        if regressions:
+            print("\nRegressions:\n  " + "\n  ".join(regressions))
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
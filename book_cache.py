@@ -0,0 +1,69 @@
+"""On-disk copy of the order book's latest snapshot, so a restart can skip the store load.
+
+The snapshot (compacted tables, payments, summary and rollup) is pickled
+to one file named after a hash of the store version it was read from or
+last written back to. When a new process first syncs, the book asks the
+store for its current version. If a file for that version exists, it is
+unpickled in a few milliseconds instead of reading, parsing and
+compacting every table again. Pickle keeps the categorical dtypes and the
+rollup exactly as they were. The directory belongs to the app and must
+not hold files from anywhere else.
+"""
+import hashlib
+import logging
+import os
+import pickle
+import tempfile
+
+logger = logging.getLogger(__name__)
+
+PREFIX = 'book_'
+SUFFIX = '.pkl'
+
+
+def _store_version(snapshot):
+    # Snapshots without one (older files, benchmarks) were never patched
+    return snapshot.store_version or snapshot.version
+
+
+class BookCache:
+    def __init__(self, directory):
+        self.directory = directory
+
+    def _path(self, version):
+        digest = hashlib.sha1(version.encode('utf-8')).hexdigest()[:16]
+        return os.path.join(self.directory, f"{PREFIX}{digest}{SUFFIX}")
+
+    def load(self, version):
+        """The saved snapshot of ``version``, or None."""
+        path = self._path(version)
+        try:
+            with open(path, 'rb') as f:
+                snapshot = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            # A file from an older release; the store is the source of truth and the next save replaces it
+            logger.warning("ignoring unreadable book snapshot for %s", version, exc_info=True)
+            os.unlink(path)
+            return None
+        return snapshot if _store_version(snapshot) == version else None
+
+    def save(self, snapshot):
+        """Write ``snapshot`` unless it is already saved, and delete older snapshots."""
+        path = self._path(_store_version(snapshot))
+        # Patches can leave the store version unchanged, so a patched snapshot replaces the file
+        if os.path.exists(path) and snapshot.version == _store_version(snapshot):
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        handle, temporary = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(handle, 'wb') as f:
+                pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temporary, path)
+        except BaseException:
+            os.unlink(temporary)
+            raise
+        for name in os.listdir(self.directory):
+            if name.startswith(PREFIX) and name.endswith(SUFFIX) and name != os.path.basename(path):
+                os.unlink(os.path.join(self.directory, name))
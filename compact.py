@@ -0,0 +1,90 @@
+"""Compact in-memory dtypes for the three tables.
+
+Names, statuses and other repeated strings become categoricals, with one
+item dictionary shared by items_df and order_items_df so item joins and
+group-bys run on integer codes. Order_ID is stored as int32 and quantity/rate are
+stored as float32; Amount stays float64 because float32 sums drift by
+whole rupees once totals reach a few lakh.
+"""
+import numpy as np
+import pandas as pd
+
+ORDER_CATEGORIES = ['Customer_Name', 'Address', 'Status', 'Payment']
+
+
+def _categories(*columns):
+    values = pd.concat([column.dropna().astype(str) for column in columns], ignore_index=True)
+    return pd.CategoricalDtype(pd.unique(values))
+
+
+def compact_tables(items_df, orders_df, order_items_df):
+    """Return compact copies of the three tables."""
+    item_dtype = _categories(items_df['Item_Name'], order_items_df['Item_Name'])
+    # int32, not the smallest type that fits, so appended orders can't overflow
+    order_id_dtype = 'int32'
+
+    items_df = items_df.astype({'Item_Name': item_dtype})
+    orders_df = orders_df.astype({'Order_ID': order_id_dtype,
+                                  **{column: 'category' for column in ORDER_CATEGORIES}})
+    order_items_df = order_items_df.astype({'Order_ID': order_id_dtype, 'Item_Name': item_dtype,
+                                            'quantity': 'float32', 'rate': 'float32'})
+    return items_df, orders_df, order_items_df
+
+
+def compact_payments(payments_df):
+    """Compact copy of the payments ledger, with the same Order_ID dtype as the orders."""
+    return payments_df.astype({'Payment_ID': 'int64', 'Order_ID': 'int32', 'Amount': 'float64',
+                               'Method': 'category'})
+
+
+def append_rows(frame, rows):
+    """Concatenate ``rows`` onto ``frame`` keeping its compact dtypes.
+
+    New strings are added to the categories instead of silently turning the
+    column back into Python objects.
+    """
+    rows = rows.reindex(columns=frame.columns)
+    frame = frame.copy()
+    for column, dtype in frame.dtypes.items():
+        if isinstance(dtype, pd.CategoricalDtype):
+            added = pd.Index(rows[column].dropna().unique())
+            dtype = pd.CategoricalDtype(dtype.categories.union(added.difference(dtype.categories), sort=False))
+            frame[column] = frame[column].cat.set_categories(dtype.categories)
+        rows[column] = rows[column].astype(dtype)
+    return pd.concat([frame, rows], ignore_index=True)
+
+
+def set_value(frame, position, column, value):
+    """``frame.iat[position, column] = value`` that extends categories as needed."""
+    series = frame[column]
+    if isinstance(series.dtype, pd.CategoricalDtype) and not pd.isna(value) \
+            and value not in series.cat.categories:
+        frame[column] = series.cat.add_categories([value])
+    frame.iat[position, frame.columns.get_loc(column)] = value
+
+
+def merge_categories(series, mapping):
+    """``series`` with values renamed by ``mapping``, merging categories that collide."""
+    if not isinstance(series.dtype, pd.CategoricalDtype):
+        return series.replace(mapping)
+    renamed = series.cat.categories.map(lambda value: mapping.get(value, value))
+    categories = renamed.unique()
+    # Code -1 (missing) picks the trailing -1
+    codes = np.append(categories.get_indexer(renamed), -1)[series.cat.codes.to_numpy()]
+    return pd.Series(pd.Categorical.from_codes(codes, dtype=pd.CategoricalDtype(categories)),
+                     index=series.index, name=series.name)
+
+
+def lookup(series, mapping):
+    """``series.map(mapping)`` as a plain Series, evaluated once per category."""
+    mapping = pd.Series(mapping, dtype=None if len(mapping) else float)
+    if not isinstance(series.dtype, pd.CategoricalDtype):
+        return series.map(mapping)
+    # Code -1 (missing) picks the trailing NaN
+    per_category = np.append(mapping.reindex(series.cat.categories).to_numpy(), np.nan)
+    return pd.Series(per_category[series.cat.codes.to_numpy()], index=series.index)
+
+
+def memory_usage(*frames):
+    """Total deep memory of the frames in bytes."""
+    return int(sum(frame.memory_usage(deep=True).sum() for frame in frames))
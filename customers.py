@@ -0,0 +1,161 @@
+"""Customer directory: search by name prefix or near-miss spelling.
+
+Names are split into lowercase tokens. A sorted token array answers
+prefix queries with two binary searches per query word. A trigram index
+catches misspellings by scoring every customer in one ``bincount`` over
+the posting lists of the query's trigrams; names containing most of the
+query's trigrams match, the closest in length first. Per-customer order counts and
+balances are aggregated once per data version, so looking up a customer
+costs only their own orders.
+
+Duplicate suggestions group names that are equal once honorifics,
+bracketed notes and word order are ignored, or that share a phone number.
+"""
+import numpy as np
+import pandas as pd
+
+from aggregates import memoize_by_version
+
+# Words that qualify a name rather than identify the person
+HONORIFICS = {'madam', 'mam', 'maam', 'sir', 'bai', 'tai', 'sister', 'bhau', 'dada', 'didi',
+              'kaku', 'kaka', 'mr', 'mrs', 'ms', 'dr', 'shri', 'smt'}
+# Share of the query's trigrams a name must contain to count as a close spelling
+MIN_SIMILARITY = 0.5
+CUSTOMER_COLUMNS = ['Customer_Name', 'Phone', 'Orders', 'Total', 'Outstanding', 'Last_Delivery']
+
+
+def name_key(names):
+    """Casefolded names with punctuation turned into single spaces."""
+    return names.str.casefold().str.replace(r'[^\w]+', ' ', regex=True).str.strip()
+
+
+def base_key(names):
+    """Name key without bracketed notes or honorifics, words sorted."""
+    words = name_key(names.str.replace(r'\(.*?\)', ' ', regex=True)).str.split()
+    return words.map(lambda tokens: ' '.join(sorted(token for token in tokens if token not in HONORIFICS)))
+
+
+def _trigrams(text):
+    padded = f"  {text} "
+    return {padded[start:start + 3] for start in range(len(padded) - 2)}
+
+
+class CustomerDirectory:
+    def __init__(self, orders_df, summary):
+        names = orders_df['Customer_Name'].astype(object)
+        totals = summary.reindex(orders_df['Order_ID'])
+        grouped = pd.DataFrame({
+            'Customer_Name': names,
+            'Phone': orders_df['Phone'],
+            'Total': totals['Total'].to_numpy(),
+            'Outstanding': totals['Pending_Amount'].to_numpy(),
+            'Delivery_Date': orders_df['Delivery_Date'],
+        }).groupby('Customer_Name', sort=True)
+        customers = grouped.agg(
+            Phone=('Phone', 'last'),
+            Orders=('Total', 'size'),
+            Total=('Total', 'sum'),
+            Outstanding=('Outstanding', 'sum'),
+            Last_Delivery=('Delivery_Date', 'max'),
+        ).reset_index()
+        self.customers = customers[CUSTOMER_COLUMNS]
+        self._orders_df = orders_df
+        self._summary = summary
+        self._positions = grouped.indices
+        # Position of each customer when listed busiest first
+        self._rank = np.empty(len(customers), dtype=np.int64)
+        self._rank[np.lexsort((customers['Customer_Name'].to_numpy(), -customers['Orders'].to_numpy()))] = \
+            np.arange(len(customers))
+
+        keys = name_key(customers['Customer_Name'])
+        tokens = keys.str.split().explode().dropna()
+        order = np.argsort(tokens.to_numpy(dtype=str), kind='stable')
+        self._tokens = tokens.to_numpy(dtype=str)[order]
+        self._token_owner = tokens.index.to_numpy()[order]
+
+        trigram_sets = keys.map(_trigrams)
+        trigrams = trigram_sets.explode().dropna()
+        self._trigram_count = trigram_sets.map(len).to_numpy()
+        self._trigram_postings = {trigram: owners.to_numpy()
+                                  for trigram, owners in trigrams.index.to_series().groupby(trigrams.to_numpy())}
+
+    def _prefix_matches(self, words):
+        matched = None
+        for word in words:
+            start = np.searchsorted(self._tokens, word, side='left')
+            stop = np.searchsorted(self._tokens, word + '\U0010ffff', side='left')
+            owners = np.unique(self._token_owner[start:stop])
+            matched = owners if matched is None else np.intersect1d(matched, owners, assume_unique=True)
+            if not len(matched):
+                break
+        return matched
+
+    def _similar(self, key, limit):
+        query = _trigrams(key)
+        postings = [self._trigram_postings[trigram] for trigram in query if trigram in self._trigram_postings]
+        if not postings:
+            return np.array([], dtype=int), np.array([])
+        shared = np.bincount(np.concatenate(postings), minlength=len(self.customers))
+        candidates = np.flatnonzero(shared >= MIN_SIMILARITY * len(query))
+        shared = shared[candidates]
+        containment = shared / len(query)
+        jaccard = shared / (len(query) + self._trigram_count[candidates] - shared)
+        best = np.lexsort((-jaccard, -containment))[:limit]
+        return candidates[best], containment[best]
+
+    def search(self, query, limit=10):
+        """Best matching customers: word-prefix matches first, then close spellings.
+
+        The result has a Match column, 1.0 for prefix matches and otherwise
+        the share of the query's trigrams found in the name.
+        """
+        key = name_key(pd.Series([query])).iloc[0]
+        if not key:
+            return self.customers.iloc[0:0].assign(Match=pd.Series(dtype=float))
+        matched = self._prefix_matches(key.split())
+        matched = matched[np.argsort(self._rank[matched])[:limit]]
+        prefix = self.customers.iloc[matched].assign(Match=1.0)
+        if len(prefix) >= limit:
+            return prefix
+        similar, score = self._similar(key, limit)
+        fuzzy = self.customers.iloc[similar].assign(Match=score)
+        fuzzy = fuzzy[~fuzzy.index.isin(prefix.index)]
+        return pd.concat([prefix, fuzzy]).head(limit)
+
+    def history(self, customer_name):
+        """A customer's orders, newest delivery first, with each order's Total and pending amount."""
+        positions = self._positions.get(customer_name)
+        if positions is None:
+            return self._orders_df.iloc[0:0].assign(Total=pd.Series(dtype=float),
+                                                    Pending_Amount=pd.Series(dtype=float))
+        orders = self._orders_df.iloc[positions]
+        totals = self._summary.reindex(orders['Order_ID'])
+        orders = orders.assign(Total=totals['Total'].to_numpy(), Pending_Amount=totals['Pending_Amount'].to_numpy())
+        return orders.sort_values(['Delivery_Date', 'Order_ID'], ascending=False)
+
+    def duplicates(self):
+        """Suggested merges: one row per group of names that look like the same customer.
+
+        Keep is the name with the most orders; Merge lists the others.
+        """
+        customers = self.customers.assign(Base=base_key(self.customers['Customer_Name']))
+        customers = customers.sort_values(['Orders', 'Customer_Name'], ascending=[False, True])
+        groups = []
+        for column, reason in (('Base', 'similar name'), ('Phone', 'same phone')):
+            keyed = customers[customers[column].notna() & (customers[column] != '')]
+            keyed = keyed[keyed.duplicated(column, keep=False)]
+            for _, group in keyed.groupby(column, sort=False):
+                names = list(group['Customer_Name'])
+                groups.append({'Keep': names[0], 'Merge': names[1:], 'Reason': reason,
+                               'Orders': int(group['Orders'].sum()),
+                               'Outstanding': float(group['Outstanding'].sum())})
+        suggestions = pd.DataFrame(groups, columns=['Keep', 'Merge', 'Reason', 'Orders', 'Outstanding'])
+        # A phone match that repeats a name match adds nothing
+        seen = suggestions.apply(lambda row: frozenset([row['Keep'], *row['Merge']]), axis=1) \
+            if len(suggestions) else pd.Series(dtype=object)
+        return suggestions[~seen.duplicated()].reset_index(drop=True)
+
+
+@memoize_by_version()
+def customer_directory(version, orders_df, summary):
+    return CustomerDirectory(orders_df, summary)
@@ -0,0 +1,179 @@
+"""Delivery planning: batch a day's active orders into driver routes.
+
+Orders are grouped by area, the last comma-separated part of their free
+text address, and whole areas are handed to drivers largest first, each
+to the driver with the least load so far, where load weighs kg and stop
+count equally. Areas bigger than RUN_SHARE of a driver's share are first
+cut into runs of neighbouring addresses, so a busy area can be split
+between drivers while each driver still gets contiguous streets. The packing lists and the printable sheets all come
+from one plan, so a single pass prepares everything for the day.
+"""
+from dataclasses import dataclass
+import heapq
+from html import escape
+
+import numpy as np
+import pandas as pd
+
+from instrumentation import timed
+from storage import filter_orders
+
+UNKNOWN_AREA = 'Unknown'
+# Largest unit handed to a driver, as a fraction of one driver's share of the day
+RUN_SHARE = 0.25
+STOP_COLUMNS = ['Delivery_Date', 'Driver', 'Stop', 'Area', 'Order_ID', 'Customer_Name', 'Phone',
+                'Address', 'Items', 'Kg', 'Total', 'Pending_Amount']
+
+SHEET_CSS = """
+body { font-family: sans-serif; font-size: 12px; }
+h1 { font-size: 18px; margin-bottom: 4px; }
+h2 { font-size: 14px; margin: 12px 0 4px; }
+table { border-collapse: collapse; width: 100%; }
+th, td { border: 1px solid #999; padding: 4px; text-align: left; vertical-align: top; }
+section { page-break-after: always; }
+@media print { section { break-after: page; } }
+"""
+
+
+@dataclass(frozen=True)
+class DeliveryPlan:
+    # One row per order, in driving order, with its batch and stop number
+    stops: pd.DataFrame
+    # Per (Delivery_Date, Driver): Stops, Kg, To_Collect, Areas
+    batches: pd.DataFrame
+    # (Delivery_Date, Driver, Item_Name) -> kg to load
+    loads: pd.Series
+
+    @property
+    def packing_list(self):
+        """Item x batch kg, with a Total column for the whole range."""
+        if self.loads.empty:
+            return pd.DataFrame(columns=['Total'])
+        table = self.loads.unstack(['Delivery_Date', 'Driver'], fill_value=0)
+        table.columns = [batch_label(day, driver) for day, driver in table.columns]
+        table['Total'] = table.sum(axis=1)
+        return table.sort_values('Total', ascending=False)
+
+
+def batch_label(day, driver):
+    return f"{pd.Timestamp(day):%d %b} · Driver {driver}"
+
+
+def area_of(addresses):
+    """Normalized locality for each address: its last comma-separated part."""
+    text = addresses.astype(object).fillna('').astype(str)
+    area = text.str.rsplit(',', n=1).str[-1].str.split().str.join(' ').str.title()
+    return area.where(area != '', UNKNOWN_AREA)
+
+
+def _assign_drivers(units, drivers):
+    """Driver number for each unit (a run of stops), longest-processing-time first."""
+    heap = [(0.0, driver) for driver in range(1, drivers + 1)]
+    assigned = {}
+    for key, weight in units.sort_values(ascending=False).items():
+        load, driver = heapq.heappop(heap)
+        assigned[key] = driver
+        heapq.heappush(heap, (load + weight, driver))
+    return pd.Series(assigned, dtype='int64')
+
+
+def _batch(stops, drivers):
+    """Add Driver and Stop to one or more days of stops."""
+    stops = stops.sort_values(['Delivery_Date', 'Area', 'Address_Key', 'Order_ID'])
+    day_totals = stops.groupby('Delivery_Date').agg(Kg=('Kg', 'sum'), Stops=('Order_ID', 'size'))
+    share = day_totals / drivers
+    share_kg = stops['Delivery_Date'].map(share['Kg']).clip(lower=1e-9)
+    share_stops = stops['Delivery_Date'].map(share['Stops'])
+    stops['Weight'] = stops['Kg'] / share_kg + 1 / share_stops
+
+    # A driver's share weighs 2 (half kg, half stops)
+    area = stops.groupby(['Delivery_Date', 'Area'])
+    runs = np.ceil(area['Weight'].transform('sum') / (2 * RUN_SHARE)).clip(lower=1).astype('int64')
+    stops['Run'] = area.cumcount() * runs // area['Order_ID'].transform('size')
+
+    units = stops.groupby(['Delivery_Date', 'Area', 'Run'])['Weight'].sum()
+    drivers_by_unit = pd.concat(
+        {day: _assign_drivers(day_units.droplevel(0), drivers) for day, day_units in units.groupby(level=0)},
+        names=['Delivery_Date'])
+    stops['Driver'] = drivers_by_unit.reindex(
+        pd.MultiIndex.from_frame(stops[['Delivery_Date', 'Area', 'Run']])).to_numpy()
+    stops = stops.sort_values(['Delivery_Date', 'Driver', 'Area', 'Address_Key', 'Order_ID'])
+    stops['Stop'] = stops.groupby(['Delivery_Date', 'Driver']).cumcount() + 1
+    return stops.reset_index(drop=True)
+
+
+@timed()
+def plan_deliveries(orders_df, order_items_df, summary, delivery_from, delivery_to=None, drivers=1):
+    """Active orders due from ``delivery_from`` to ``delivery_to`` batched over ``drivers`` per day."""
+    drivers = max(1, int(drivers))
+    orders = filter_orders(orders_df, status='Active', delivery_from=delivery_from,
+                           delivery_to=delivery_to if delivery_to is not None else delivery_from)
+    lines = order_items_df[order_items_df['Order_ID'].isin(orders['Order_ID'])]
+
+    totals = summary.reindex(orders['Order_ID'])
+    address = orders['Address'].astype(object).fillna('').astype(str)
+    stops = pd.DataFrame({
+        'Delivery_Date': orders['Delivery_Date'],
+        'Area': area_of(orders['Address']),
+        'Address_Key': address.str.casefold(),
+        'Order_ID': orders['Order_ID'],
+        'Customer_Name': orders['Customer_Name'].astype(object),
+        'Phone': orders['Phone'].astype(object).fillna(''),
+        'Address': address,
+        'Kg': totals['Kg'].fillna(0).to_numpy(),
+        'Total': totals['Total'].fillna(0).to_numpy(),
+        'Pending_Amount': totals['Pending_Amount'].fillna(0).to_numpy(),
+    })
+    described = lines['Item_Name'].astype(str) + ' ' + lines['quantity'].map('{:g}'.format).astype(str) + ' kg'
+    stops['Items'] = stops['Order_ID'].map(described.groupby(lines['Order_ID']).agg(', '.join)).fillna('')
+
+    if stops.empty:
+        stops = stops.assign(Driver=pd.Series(dtype='int64'), Stop=pd.Series(dtype='int64'))
+    else:
+        stops = _batch(stops, drivers)
+    stops = stops[STOP_COLUMNS]
+
+    batches = stops.groupby(['Delivery_Date', 'Driver']).agg(
+        Stops=('Order_ID', 'size'),
+        Kg=('Kg', 'sum'),
+        To_Collect=('Pending_Amount', 'sum'),
+        Areas=('Area', lambda areas: ', '.join(dict.fromkeys(areas))),
+    )
+    # One group-by over every line in the range gives each batch's load
+    batch_of = stops.set_index('Order_ID')[['Delivery_Date', 'Driver']]
+    loads = lines[['Order_ID', 'Item_Name', 'quantity']].merge(batch_of, left_on='Order_ID', right_index=True).groupby(
+        ['Delivery_Date', 'Driver', 'Item_Name'], observed=True)['quantity'].sum()
+    loads = loads[loads > 0]
+    return DeliveryPlan(stops=stops, batches=batches, loads=loads)
+
+
+def _table(frame, formats):
+    return frame.to_html(index=False, border=0, formatters=formats, na_rep='')
+
+
+def delivery_sheets_html(plan, title="Delivery sheets"):
+    """One printable HTML document: a page per batch, then the consolidated packing list."""
+    money = '₹{:,.0f}'.format
+    stop_formats = {'Kg': '{:.2f}'.format, 'Total': money, 'To collect': money}
+    parts = [f"<!DOCTYPE html><html><head><meta charset='utf-8'><title>{escape(title)}</title>"
+             f"<style>{SHEET_CSS}</style></head><body>"]
+    loads = plan.loads
+    for (day, driver), stops in plan.stops.groupby(['Delivery_Date', 'Driver'], sort=True):
+        batch = plan.batches.loc[(day, driver)]
+        load = loads[(loads.index.get_level_values('Delivery_Date') == day)
+                     & (loads.index.get_level_values('Driver') == driver)].droplevel([0, 1])
+        load = load.sort_values(ascending=False).rename('Kg').reset_index()
+        sheet = stops.rename(columns={'Customer_Name': 'Customer', 'Pending_Amount': 'To collect'})
+        sheet = sheet.assign(Signature='')[['Stop', 'Customer', 'Phone', 'Address', 'Items', 'Kg',
+                                            'Total', 'To collect', 'Signature']]
+        parts.append(
+            f"<section><h1>{escape(batch_label(day, driver))}</h1>"
+            f"<p>{int(batch['Stops'])} stops · {batch['Kg']:.2f} kg · collect {money(batch['To_Collect'])}"
+            f" · {escape(batch['Areas'])}</p>"
+            f"<h2>Load</h2>{_table(load.rename(columns={'Item_Name': 'Item'}), {'Kg': '{:.2f}'.format})}"
+            f"<h2>Stops</h2>{_table(sheet, stop_formats)}</section>")
+    packing = plan.packing_list.reset_index().rename(columns={'Item_Name': 'Item'})
+    parts.append(f"<section><h1>Packing list</h1>"
+                 f"{_table(packing, {column: '{:.2f}'.format for column in packing.columns[1:]})}</section>")
+    parts.append("</body></html>")
+    return ''.join(parts)
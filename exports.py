@@ -0,0 +1,230 @@
+"""Bulk export of invoices and a season report for a set of orders, as one ZIP.
+
+Invoice jobs are built a batch at a time from the selected orders and
+rendered in a process pool, with only a few batches in flight, so memory
+stays flat however many orders are selected. Rendered invoices are written
+into the ZIP as they come back, in order, followed by an Excel report with
+the orders, their line items and per-item totals. The ZIP goes to a
+temporary file, and an ExportJob runs the whole export on a background
+thread so the page can show progress instead of blocking.
+"""
+import io
+import multiprocessing
+import os
+import tempfile
+import threading
+import time
+import weakref
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import pandas as pd
+
+from invoices import render_batch
+
+BATCH_SIZE = 100
+# Smaller selections are rendered on the export thread; starting workers would cost more
+POOL_THRESHOLD = 500
+EXPORT_PREFIX = 'diwali_export_'
+# Older ZIPs in the temp directory belong to no live job
+STALE_EXPORT_SECONDS = 24 * 3600
+ORDER_REPORT_COLUMNS = ['Order_ID', 'Customer_Name', 'Phone', 'Address', 'Order_Date', 'Delivery_Date',
+                        'Status', 'Payment', 'Total', 'Paid', 'Due']
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def process_pool(workers=0):
+    """The process-wide render pool, started on first use.
+
+    Workers are spawned rather than forked, since forking a process that is
+    running Streamlit's threads is not safe.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=workers or min(4, os.cpu_count() or 1),
+                                        mp_context=multiprocessing.get_context('spawn'))
+        return _pool
+
+
+def reset_pool():
+    """Drop the render pool, e.g. after a worker died, so the next export starts a fresh one."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+def _with_totals(orders, summary):
+    totals = summary.reindex(orders['Order_ID'])
+    # Paid is what is no longer due, as in receivables: an order marked Paid may have no ledger rows
+    due = totals['Pending_Amount'].to_numpy()
+    return orders.assign(Total=totals['Total'].to_numpy(), Paid=totals['Total'].to_numpy() - due, Due=due)
+
+
+def _plain(frame):
+    """Records of ``frame`` with missing values as None and dates as text."""
+    frame = frame.assign(**{column: frame[column].dt.strftime('%d %b %Y')
+                            for column in ('Order_Date', 'Delivery_Date') if column in frame})
+    frame = frame.astype(object)
+    return frame.where(frame.notna(), None).to_dict('records')
+
+
+def invoice_jobs(orders, order_items_df, summary, batch_size=BATCH_SIZE):
+    """Yield lists of ``(order, lines)`` invoice jobs, ``batch_size`` orders at a time."""
+    lines = order_items_df[order_items_df['Order_ID'].isin(orders['Order_ID'])]
+    positions = lines.groupby('Order_ID').indices
+    items = lines['Item_Name'].astype(object).to_numpy()
+    quantities, rates, amounts = (lines[column].to_numpy(dtype='float64') for column in ('quantity', 'rate', 'Amount'))
+    orders = _with_totals(orders, summary)
+    for start in range(0, len(orders), batch_size):
+        yield [(order, [(items[position], quantities[position], rates[position], amounts[position])
+                        for position in positions.get(order['Order_ID'], ())])
+               for order in _plain(orders.iloc[start:start + batch_size])]
+
+
+def _rendered(batches, seller, pool, window):
+    """Rendered batches in submission order, with at most ``window`` batches in flight."""
+    if pool is None:
+        for batch in batches:
+            yield render_batch(batch, seller)
+        return
+    in_flight = deque()
+    for batch in batches:
+        in_flight.append(pool.submit(render_batch, batch, seller))
+        if len(in_flight) >= window:
+            yield in_flight.popleft().result()
+    while in_flight:
+        yield in_flight.popleft().result()
+
+
+def season_report(orders, order_items_df, summary):
+    """An Excel workbook (bytes) with Orders, Line Items and Items sheets."""
+    from openpyxl import Workbook
+
+    orders = _with_totals(orders, summary)[ORDER_REPORT_COLUMNS]
+    lines = order_items_df[order_items_df['Order_ID'].isin(orders['Order_ID'])].merge(
+        orders[['Order_ID', 'Customer_Name']], on='Order_ID', how='left')
+    lines = lines[['Order_ID', 'Customer_Name', 'Item_Name', 'quantity', 'rate', 'Amount']]
+    items = lines.groupby('Item_Name', observed=True).agg(
+        Orders=('Order_ID', 'nunique'),
+        Kg=('quantity', 'sum'),
+        Amount=('Amount', 'sum'),
+    ).sort_values('Amount', ascending=False).reset_index()
+
+    # Write-only mode streams rows to the file instead of building cell objects
+    workbook = Workbook(write_only=True)
+    for title, frame in (('Orders', orders), ('Line Items', lines), ('Items', items)):
+        sheet = workbook.create_sheet(title)
+        sheet.append(list(frame.columns))
+        frame = frame.astype(object)
+        for row in frame.where(frame.notna(), None).itertuples(index=False, name=None):
+            sheet.append([value.to_pydatetime() if isinstance(value, pd.Timestamp) else value for value in row])
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+    return buffer.getvalue()
+
+
+def write_export(file, orders, order_items_df, summary, seller, pool=None, progress=None):
+    """Write invoices for ``orders`` and the season report into a ZIP at ``file``.
+
+    With a ``pool`` the report is built in a worker alongside the invoices.
+    ``progress(done, total)`` is called after each batch of invoices.
+    """
+    # Only the selected orders' rows are handed on, and pickled, from here
+    order_items_df = order_items_df[order_items_df['Order_ID'].isin(orders['Order_ID'])]
+    summary = summary.reindex(orders['Order_ID'])
+    report = pool.submit(season_report, orders, order_items_df, summary) if pool is not None else None
+    with zipfile.ZipFile(file, 'w', zipfile.ZIP_DEFLATED) as archive:
+        done = 0
+        window = 2 * (pool._max_workers if pool is not None else 1)
+        for rendered in _rendered(invoice_jobs(orders, order_items_df, summary), seller, pool, window):
+            for name, data in rendered:
+                archive.writestr(name, data)
+            done += len(rendered)
+            if progress:
+                progress(done, len(orders))
+        archive.writestr('report.xlsx', report.result() if report is not None
+                         else season_report(orders, order_items_df, summary))
+
+
+def _remove(path):
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+
+def remove_stale_exports(max_age=STALE_EXPORT_SECONDS):
+    """Delete export ZIPs older than ``max_age`` seconds, e.g. left behind by a process that was killed."""
+    directory = tempfile.gettempdir()
+    cutoff = time.time() - max_age
+    for name in os.listdir(directory):
+        if not (name.startswith(EXPORT_PREFIX) and name.endswith('.zip')):
+            continue
+        path = os.path.join(directory, name)
+        try:
+            if os.path.getmtime(path) < cutoff:
+                os.unlink(path)
+        except FileNotFoundError:
+            # Another session removed it first
+            pass
+
+
+class ExportJob:
+    """One export running on a background thread, writing to a temporary ZIP file.
+
+    The ZIP is deleted by ``discard()`` or, at the latest, when the job is
+    garbage collected, e.g. once the session that started it has ended.
+    """
+
+    def __init__(self, orders, order_items_df, summary, seller, workers=0):
+        self.total = len(orders)
+        self.done = 0
+        self.path = None
+        self.error = None
+        self._args = (orders, order_items_df, summary, seller)
+        self._workers = workers
+        self._finished = threading.Event()
+        self._cleanup = None
+
+    @property
+    def running(self):
+        return not self._finished.is_set()
+
+    def start(self):
+        threading.Thread(target=self._run, name="export", daemon=True).start()
+        return self
+
+    def wait(self, timeout=None):
+        return self._finished.wait(timeout)
+
+    def _progress(self, done, total):
+        self.done = done
+
+    def _run(self):
+        pool = process_pool(self._workers) if self.total >= POOL_THRESHOLD else None
+        handle = tempfile.NamedTemporaryFile(prefix=EXPORT_PREFIX, suffix='.zip', delete=False)
+        self._cleanup = weakref.finalize(self, _remove, handle.name)
+        try:
+            with handle:
+                write_export(handle, *self._args, pool=pool, progress=self._progress)
+            self.path = handle.name
+        except Exception as error:
+            self.error = error
+            self._cleanup()
+            if isinstance(error, BrokenProcessPool):
+                reset_pool()
+        finally:
+            self._finished.set()
+
+    def discard(self):
+        """Delete the finished ZIP."""
+        if self._cleanup is not None:
+            self._cleanup()
+        self.path = None
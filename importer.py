@@ -0,0 +1,206 @@
+"""Chunked bulk import of orders and line items from CSV or Excel files.
+
+The input has one row per line item, with the order's columns repeated on
+every row. Rows are grouped into orders by their ``Order_Ref``, or by
+customer, phone and delivery date where that is blank. The file is
+read and validated a chunk at a time, and each chunk is appended to the
+store in its own transaction, so memory stays bounded by the chunk size
+and other sessions keep reading between chunks.
+"""
+from dataclasses import dataclass, field
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from storage import ORDER_COLUMNS
+from validation import PAYMENTS, STATUSES
+
+REQUIRED_COLUMNS = ['Customer_Name', 'Delivery_Date', 'Item_Name', 'quantity']
+OPTIONAL_COLUMNS = ['Order_Ref', 'Phone', 'Address', 'Status', 'Payment', 'Order_Date',
+                    'Notes', 'rate', 'Amount']
+REPORT_COLUMNS = ['Row', 'Column', 'Problem', 'Value']
+DEFAULT_DATE_FORMAT = '%m/%d/%Y'
+MAX_REPORTED = 10000
+
+
+@dataclass
+class ImportResult:
+    rows_read: int = 0
+    lines_imported: int = 0
+    orders_created: int = 0
+    rows_rejected: int = 0
+    problems_found: int = 0
+    problems: list = field(default_factory=list)
+
+    @property
+    def problems_truncated(self):
+        return self.problems_found > MAX_REPORTED
+
+    def report(self, frame):
+        # Keep at most MAX_REPORTED problem rows so a bad file can't grow memory
+        room = MAX_REPORTED - min(self.problems_found, MAX_REPORTED)
+        self.problems_found += len(frame)
+        if room and len(frame):
+            self.problems.append(frame.head(room))
+
+    def error_report(self):
+        """All rejected rows and warnings as one DataFrame, in file order."""
+        if not self.problems:
+            return pd.DataFrame(columns=REPORT_COLUMNS)
+        return pd.concat(self.problems, ignore_index=True).sort_values('Row', kind='stable')
+
+
+def read_chunks(file, filename, chunksize=5000, date_format=DEFAULT_DATE_FORMAT):
+    """Yield DataFrames of at most ``chunksize`` rows, all values as strings.
+
+    Excel date cells are written out in ``date_format``, the format the
+    text dates of the file are parsed with.
+    """
+    if filename.lower().endswith(('.xlsx', '.xlsm')):
+        yield from _excel_chunks(file, chunksize, date_format)
+    else:
+        yield from pd.read_csv(file, chunksize=chunksize, dtype=str, keep_default_na=False,
+                               skipinitialspace=True)
+
+
+def _excel_text(cell, date_format):
+    if cell is None:
+        return ''
+    if isinstance(cell, date):
+        return cell.strftime(date_format)
+    return str(cell)
+
+
+def _excel_chunks(file, chunksize, date_format):
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(file, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = [str(cell).strip() if cell is not None else '' for cell in next(rows, ())]
+        batch = []
+        width = len(header)
+        for row in rows:
+            row = list(row[:width]) + [None] * (width - len(row))
+            batch.append([_excel_text(cell, date_format) for cell in row])
+            if len(batch) == chunksize:
+                yield pd.DataFrame(batch, columns=header)
+                batch = []
+        if batch:
+            yield pd.DataFrame(batch, columns=header)
+    finally:
+        workbook.close()
+
+
+def _problems(chunk, mask, rows, column, problem):
+    values = chunk[column] if column in chunk else pd.Series('', index=chunk.index)
+    return pd.DataFrame({'Row': rows[mask.to_numpy()], 'Column': column,
+                         'Problem': problem, 'Value': values[mask].to_numpy()})
+
+
+def validate_chunk(chunk, item_rates, first_row=2, date_format=DEFAULT_DATE_FORMAT):
+    """Split a raw chunk into importable lines and a problem report.
+
+    ``item_rates`` maps Item_Name to the catalogue rate. Unknown items,
+    missing or non-numeric quantity/rate/Amount, unparseable dates, unknown
+    Status or Payment values and Amounts that don't equal quantity x rate
+    reject the row; a rate that differs from the catalogue is imported and
+    reported as a warning.
+    Returns (lines, problems) where ``lines`` has typed columns and keeps
+    the chunk's index.
+    """
+    chunk = chunk.reindex(columns=REQUIRED_COLUMNS + OPTIONAL_COLUMNS, fill_value='')
+    chunk = chunk.apply(lambda column: column.str.strip())
+    rows = first_row + np.arange(len(chunk))
+
+    blank = chunk == ''
+    item_rate = chunk['Item_Name'].map(item_rates)
+    quantity = pd.to_numeric(chunk['quantity'], errors='coerce')
+    rate = pd.to_numeric(chunk['rate'], errors='coerce').where(~blank['rate'], item_rate)
+    amount = pd.to_numeric(chunk['Amount'], errors='coerce')
+    computed = quantity * rate
+    delivery = pd.to_datetime(chunk['Delivery_Date'], format=date_format, errors='coerce')
+    ordered = pd.to_datetime(chunk['Order_Date'], format=date_format, errors='coerce')
+    # Any capitalisation of a known value is accepted; blank takes the default
+    status = chunk['Status'].str.casefold().map({value.casefold(): value for value in STATUSES})
+    payment = chunk['Payment'].str.casefold().map({value.casefold(): value for value in PAYMENTS})
+
+    checks = [
+        (blank['Customer_Name'], 'Customer_Name', 'missing customer'),
+        (item_rate.isna(), 'Item_Name', 'unknown item'),
+        (quantity.isna() | (quantity <= 0), 'quantity', 'quantity is not a positive number'),
+        (~blank['rate'] & rate.isna(), 'rate', 'rate is not a number'),
+        (~blank['Amount'] & amount.isna(), 'Amount', 'Amount is not a number'),
+        (amount.notna() & ((amount - computed).abs() > 0.005), 'Amount', 'Amount != quantity x rate'),
+        (delivery.isna(), 'Delivery_Date', f'date not in {date_format} format'),
+        (~blank['Order_Date'] & ordered.isna(), 'Order_Date', f'date not in {date_format} format'),
+        (~blank['Status'] & status.isna(), 'Status', f"not one of {', '.join(STATUSES)}"),
+        (~blank['Payment'] & payment.isna(), 'Payment', f"not one of {', '.join(PAYMENTS)}"),
+    ]
+    rejected = pd.Series(False, index=chunk.index)
+    problems = []
+    for mask, column, problem in checks:
+        rejected |= mask
+        problems.append(_problems(chunk, mask, rows, column, problem))
+    mismatch = ~rejected & (rate - item_rate).abs().gt(0.005)
+    problems.append(_problems(chunk, mismatch, rows, 'rate', 'warning: differs from catalogue rate'))
+
+    keep = ~rejected
+    # Rows without an Order_Ref fall back to their own customer, phone and date
+    key = chunk['Customer_Name'] + '|' + chunk['Phone'] + '|' + delivery.dt.strftime('%Y-%m-%d')
+    ref = chunk['Order_Ref'].where(~blank['Order_Ref'], key)
+    lines = pd.DataFrame({
+        'Ref': ref,
+        'Customer_Name': chunk['Customer_Name'],
+        'Phone': chunk['Phone'].replace('', None),
+        'Address': chunk['Address'].replace('', None),
+        'Delivery_Date': delivery,
+        'Status': status.fillna('Active'),
+        'Payment': payment.fillna('Pending'),
+        'Order_Date': ordered.fillna(pd.Timestamp.today().normalize()),
+        'Notes': chunk['Notes'].replace('', None),
+        'Item_Name': chunk['Item_Name'],
+        'quantity': quantity,
+        'rate': rate,
+        'Amount': computed,
+    })[keep]
+    return lines, pd.concat(problems, ignore_index=True)
+
+
+def import_orders(store, file, filename, items_df, chunksize=5000,
+                  date_format=DEFAULT_DATE_FORMAT, progress=None):
+    """Stream ``file`` into ``store`` and return an ImportResult.
+
+    ``progress`` is called after every chunk with the running result.
+    """
+    columns = None
+    item_rates = items_df.set_index('Item_Name')['Rate']
+    ref_ids = {}
+    result = ImportResult()
+
+    for chunk in read_chunks(file, filename, chunksize, date_format):
+        if columns is None:
+            columns = set(chunk.columns)
+            missing = [column for column in REQUIRED_COLUMNS if column not in columns]
+            if missing:
+                raise ValueError(f"Import file is missing columns: {', '.join(missing)}")
+
+        lines, problems = validate_chunk(chunk, item_rates, first_row=result.rows_read + 2,
+                                         date_format=date_format)
+        result.rows_read += len(chunk)
+        result.rows_rejected += len(chunk) - len(lines)
+        result.report(problems)
+
+        if len(lines):
+            new_refs = ~lines['Ref'].isin(ref_ids.keys())
+            orders = lines[new_refs].drop_duplicates('Ref')[['Ref'] + ORDER_COLUMNS[1:]]
+            created = store.append_orders(orders, lines[['Ref', 'Item_Name', 'quantity', 'rate', 'Amount']],
+                                          ref_ids)
+            ref_ids.update(created)
+            result.orders_created += len(created)
+            result.lines_imported += len(lines)
+
+        if progress is not None:
+            progress(result)
+    return result
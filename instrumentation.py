@@ -0,0 +1,175 @@
+"""Lightweight timing spans and cache counters for app reruns.
+
+Profiling is switched on per rerun with ``begin_rerun(enabled=True)``; the
+spans recorded in that rerun are returned by ``end_rerun()`` and also feed
+process-wide rolling windows used for p50/p95. When a rerun is not being
+profiled, ``span()`` returns a shared no-op context manager and counters
+return after one thread-local lookup, so the instrumentation can stay in
+the hot path permanently.
+"""
+from collections import defaultdict, deque
+from contextlib import contextmanager, nullcontext
+from functools import wraps
+import json
+import threading
+import time
+
+import numpy as np
+
+WINDOW = 200
+
+_local = threading.local()
+_lock = threading.Lock()
+_windows = defaultdict(lambda: deque(maxlen=WINDOW))
+_cache_counts = defaultdict(lambda: {'hits': 0, 'misses': 0})
+_NULL_SPAN = nullcontext()
+
+
+class Rerun:
+    def __init__(self):
+        self.spans = []
+        self._depth = 0
+        self._section = None
+        self._started = time.perf_counter()
+
+    def section(self, name):
+        """Close the current top-level section, if any, and open ``name``."""
+        self.close_section()
+        self._section = (len(self.spans), time.perf_counter())
+        self.spans.append([name, 0, 0.0])
+        self._depth = 1
+
+    def close_section(self):
+        if self._section is not None:
+            position, start = self._section
+            self.spans[position][2] = time.perf_counter() - start
+            self._section = None
+            self._depth = 0
+
+    @contextmanager
+    def span(self, name):
+        # Record in start order so the breakdown reads top to bottom
+        entry = [name, self._depth, 0.0]
+        self.spans.append(entry)
+        self._depth += 1
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            entry[2] = time.perf_counter() - start
+            self._depth -= 1
+
+    def breakdown(self):
+        return [{'span': name, 'depth': depth, 'ms': seconds * 1000}
+                for name, depth, seconds in self.spans]
+
+
+def begin_rerun(enabled):
+    _local.rerun = Rerun() if enabled else None
+
+
+def end_rerun():
+    """Finish the current rerun and return it, or None if it wasn't profiled."""
+    rerun = getattr(_local, 'rerun', None)
+    _local.rerun = None
+    if rerun is None:
+        return None
+    rerun.close_section()
+    total = time.perf_counter() - rerun._started
+    rerun.spans.insert(0, ['rerun', 0, total])
+    for entry in rerun.spans[1:]:
+        entry[1] += 1
+    with _lock:
+        for name, _, seconds in rerun.spans:
+            _windows[name].append(seconds)
+    return rerun
+
+
+def section(name):
+    """Start a sequential top-level section of the rerun (setup, load, render...)."""
+    rerun = getattr(_local, 'rerun', None)
+    if rerun is not None:
+        rerun.section(name)
+
+
+def span(name):
+    rerun = getattr(_local, 'rerun', None)
+    if rerun is None:
+        return _NULL_SPAN
+    return rerun.span(name)
+
+
+def timed(name=None):
+    """Decorator recording each call as a span."""
+    def decorator(fn):
+        label = name or fn.__name__
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            rerun = getattr(_local, 'rerun', None)
+            if rerun is None:
+                return fn(*args, **kwargs)
+            with rerun.span(label):
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def count_cache(name, hit):
+    if getattr(_local, 'rerun', None) is None:
+        return
+    with _lock:
+        _cache_counts[name]['hits' if hit else 'misses'] += 1
+
+
+def rolling_stats():
+    """Per span: count, p50 and p95 in milliseconds over the last WINDOW profiled reruns."""
+    with _lock:
+        windows = {name: list(values) for name, values in _windows.items()}
+    stats = []
+    for name, values in windows.items():
+        p50, p95 = np.percentile(values, [50, 95]) * 1000
+        stats.append({'span': name, 'count': len(values), 'p50_ms': p50, 'p95_ms': p95})
+    return sorted(stats, key=lambda row: row['p95_ms'], reverse=True)
+
+
+def cache_stats():
+    with _lock:
+        return [{'cache': name, **counts} for name, counts in sorted(_cache_counts.items())]
+
+
+def reset():
+    with _lock:
+        _windows.clear()
+        _cache_counts.clear()
+
+
+def export_json(rerun=None):
+    return json.dumps({
+        'last_rerun': rerun.breakdown() if rerun is not None else None,
+        'rolling': rolling_stats(),
+        'caches': cache_stats(),
+    }, indent=2)
+
+
+def _label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', ' ')
+
+
+def export_prometheus():
+    """Rolling span quantiles and cache counters in Prometheus text format."""
+    lines = ['# HELP diwali_span_seconds Rerun span durations over the rolling window.',
+             '# TYPE diwali_span_seconds summary']
+    for row in rolling_stats():
+        label = _label(row['span'])
+        lines.append(f'diwali_span_seconds{{span="{label}",quantile="0.5"}} {row["p50_ms"] / 1000:.6f}')
+        lines.append(f'diwali_span_seconds{{span="{label}",quantile="0.95"}} {row["p95_ms"] / 1000:.6f}')
+        lines.append(f'diwali_span_seconds_count{{span="{label}"}} {row["count"]}')
+    for kind in ('hits', 'misses'):
+        lines += [f'# HELP diwali_cache_{kind}_total Memoized computation cache {kind}.',
+                  f'# TYPE diwali_cache_{kind}_total counter']
+        for row in cache_stats():
+            lines.append(f'diwali_cache_{kind}_total{{cache="{_label(row["cache"])}"}} {row[kind]}')
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,57 @@
+"""Per-order invoice rendering, kept free of pandas so pool workers start fast.
+
+An invoice job is a plain tuple ``(order, lines)``: ``order`` a dict of
+the order's fields plus Total, Paid and Due, ``lines`` a list of
+``(item, quantity, rate, amount)``. Jobs are pickled to worker processes
+in batches and come back as ``(filename, bytes)`` pairs.
+"""
+from html import escape
+
+INVOICE_CSS = """
+body { font-family: sans-serif; font-size: 13px; max-width: 720px; margin: 24px auto; }
+h1 { font-size: 20px; margin: 0; }
+table { border-collapse: collapse; width: 100%; margin-top: 12px; }
+th, td { border-bottom: 1px solid #ccc; padding: 6px; text-align: left; }
+td.number, th.number { text-align: right; }
+.totals td { border: none; font-weight: bold; }
+.meta { display: flex; justify-content: space-between; margin-top: 12px; }
+"""
+
+
+def _money(amount):
+    return f"₹{amount:,.2f}"
+
+
+def invoice_filename(order):
+    return f"invoices/invoice_{order['Order_ID']:05d}.html"
+
+
+def render_invoice(order, lines, seller):
+    """One order's invoice as a standalone, printable HTML page."""
+    rows = ''.join(
+        f"<tr><td>{escape(str(item))}</td><td class='number'>{quantity:g} kg</td>"
+        f"<td class='number'>{_money(rate)}</td><td class='number'>{_money(amount)}</td></tr>"
+        for item, quantity, rate, amount in lines)
+    customer = ''.join(f"<div>{escape(str(order[field]))}</div>"
+                       for field in ('Phone', 'Address') if order.get(field))
+    notes = f"<p>Notes: {escape(str(order['Notes']))}</p>" if order.get('Notes') else ''
+    return (
+        f"<!DOCTYPE html><html><head><meta charset='utf-8'>"
+        f"<title>Invoice {order['Order_ID']}</title><style>{INVOICE_CSS}</style></head><body>"
+        f"<h1>{escape(seller)}</h1><div>Invoice #{order['Order_ID']}</div>"
+        f"<div class='meta'><div><strong>{escape(str(order['Customer_Name']))}</strong>{customer}</div>"
+        f"<div>Order date: {order['Order_Date'] or '—'}<br>Delivery: {order['Delivery_Date'] or '—'}"
+        f"<br>Status: {escape(str(order['Status']))}</div></div>"
+        f"<table><thead><tr><th>Item</th><th class='number'>Qty</th><th class='number'>Rate</th>"
+        f"<th class='number'>Amount</th></tr></thead><tbody>{rows}</tbody>"
+        f"<tbody class='totals'><tr><td colspan='3'>Total</td><td class='number'>{_money(order['Total'])}</td></tr>"
+        f"<tr><td colspan='3'>Paid</td><td class='number'>{_money(order['Paid'])}</td></tr>"
+        f"<tr><td colspan='3'>Balance due</td><td class='number'>{_money(order['Due'])}</td></tr></tbody></table>"
+        f"{notes}</body></html>"
+    )
+
+
+def render_batch(jobs, seller):
+    """Render a batch of invoice jobs; runs in a worker process."""
+    return [(invoice_filename(order), render_invoice(order, lines, seller).encode('utf-8'))
+            for order, lines in jobs]
@@ -0,0 +1,37 @@
+"""Inverted index from item name to the orders that contain it.
+
+Each posting is one (item, order) pair with the quantity and amount of
+that item in the order, joined to the order's customer, delivery date,
+status and payment. Built once per data version; looking up an item then
+costs time proportional to its own orders.
+"""
+from aggregates import memoize_by_version
+
+POSTING_COLUMNS = ['Order_ID', 'quantity', 'Amount', 'Customer_Name', 'Delivery_Date',
+                   'Status', 'Payment']
+
+
+class ItemIndex:
+    def __init__(self, orders_df, order_items_df):
+        per_order = order_items_df.groupby(['Item_Name', 'Order_ID'], as_index=False, sort=True, observed=True).agg(
+            quantity=('quantity', 'sum'),
+            Amount=('Amount', 'sum'),
+        )
+        postings = per_order.merge(
+            orders_df[['Order_ID', 'Customer_Name', 'Delivery_Date', 'Status', 'Payment']],
+            on='Order_ID', how='inner',
+        )
+        self._postings = postings
+        self._positions = postings.groupby('Item_Name', sort=False, observed=True).indices
+
+    def postings(self, item_name):
+        """One row per order containing ``item_name``, in Order_ID order."""
+        positions = self._positions.get(item_name)
+        if positions is None:
+            return self._postings.iloc[0:0][POSTING_COLUMNS]
+        return self._postings.iloc[positions][POSTING_COLUMNS]
+
+
+@memoize_by_version()
+def item_index(version, orders_df, order_items_df):
+    return ItemIndex(orders_df, order_items_df)
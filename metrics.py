@@ -0,0 +1,31 @@
+"""Dashboard KPIs read from the daily rollup and the per-order summary."""
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class DashboardMetrics:
+    total_orders: int
+    active_orders: int
+    completed_orders: int
+    total_amount: float
+    active_amount: float
+    completed_amount: float
+    # Still owed on all orders, active or completed
+    pending_amount: float
+
+
+def metrics_from_rollup(orders_df, rollup, summary):
+    """Dashboard KPIs with amounts read from the daily rollup and dues net of part payments from ``summary``."""
+    amounts = rollup.amounts()
+    by_status = amounts.groupby(level='Status').sum()
+    counts = orders_df['Status'].value_counts()
+
+    return DashboardMetrics(
+        total_orders=len(orders_df),
+        active_orders=int(counts.get('Active', 0)),
+        completed_orders=int(counts.get('Completed', 0)),
+        total_amount=float(amounts.sum()),
+        active_amount=float(by_status.get('Active', 0)),
+        completed_amount=float(by_status.get('Completed', 0)),
+        pending_amount=float(summary['Pending_Amount'].sum()),
+    )
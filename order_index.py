@@ -0,0 +1,91 @@
+"""Sorted per-status order index behind the paginated All Orders page.
+
+Built once per data version. Date ranges are answered with a binary search
+on the delivery dates. The customer filter matches the start of each word
+of the customer's name, as the Customers page search does, through a
+sorted array of the words of every distinct name, so a query costs a
+binary search per word instead of a string scan over the orders. Both
+that and the payment filter then only look at the orders inside the date
+range, and line items are looked up per order from precomputed row
+positions, so nothing on the page scales with the full order book except
+the build itself.
+"""
+import math
+
+import numpy as np
+import pandas as pd
+
+from aggregates import memoize_by_version
+from customers import name_key
+
+
+class OrderIndex:
+    def __init__(self, orders_df, order_items_df):
+        names = orders_df['Customer_Name'].astype('category')
+        orders = orders_df.assign(Customer_Code=names.cat.codes.to_numpy())
+        self._by_status = {
+            status: frame.sort_values(['Delivery_Date', 'Order_ID'], kind='stable').reset_index(drop=True)
+            for status, frame in orders.groupby('Status', sort=False, observed=True)
+        }
+        self._empty = orders.iloc[0:0]
+        self._dates = {status: frame['Delivery_Date'].to_numpy()
+                       for status, frame in self._by_status.items()}
+        self._order_items_df = order_items_df
+        self._line_positions = order_items_df.groupby('Order_ID').indices
+
+        # Every word of every distinct customer name, sorted, with the code of its name
+        tokens = name_key(pd.Series(names.cat.categories.astype(str))).str.split().explode().dropna()
+        order = np.argsort(tokens.to_numpy(dtype=str), kind='stable')
+        self._tokens = tokens.to_numpy(dtype=str)[order]
+        self._token_owner = tokens.index.to_numpy()[order]
+        self._customer_count = len(names.cat.categories)
+
+    def _customers_matching(self, text):
+        """One flag per customer code, plus a final False for orders without a name (code -1)."""
+        matched = np.ones(self._customer_count + 1, dtype=bool)
+        matched[-1] = False
+        for word in name_key(pd.Series([text])).iloc[0].split():
+            start = np.searchsorted(self._tokens, word, side='left')
+            stop = np.searchsorted(self._tokens, word + '\U0010ffff', side='left')
+            hits = np.zeros_like(matched)
+            hits[self._token_owner[start:stop]] = True
+            matched &= hits
+        return matched
+
+    def query(self, status, customer=None, payment=None,
+              delivery_from=None, delivery_to=None, descending=False):
+        """Orders with ``status`` matching the filters, sorted by delivery date."""
+        frame = self._by_status.get(status)
+        if frame is None:
+            return self._empty
+        dates = self._dates[status]
+        start, stop = 0, len(frame)
+        if delivery_from is not None:
+            start = np.searchsorted(dates, np.datetime64(pd.Timestamp(delivery_from)), side='left')
+        if delivery_to is not None:
+            stop = np.searchsorted(dates, np.datetime64(pd.Timestamp(delivery_to)), side='right')
+        result = frame.iloc[start:stop]
+        if payment is not None:
+            result = result[result['Payment'] == payment]
+        if customer:
+            result = result[self._customers_matching(customer)[result['Customer_Code'].to_numpy()]]
+        return result.iloc[::-1] if descending else result
+
+    def lines(self, order_id):
+        positions = self._line_positions.get(order_id)
+        if positions is None:
+            return self._order_items_df.iloc[0:0]
+        return self._order_items_df.iloc[positions]
+
+
+@memoize_by_version()
+def order_index(version, orders_df, order_items_df):
+    return OrderIndex(orders_df, order_items_df)
+
+
+def paginate(frame, page, page_size):
+    """Rows of 1-based ``page`` and the total page count (at least 1)."""
+    page_count = max(1, math.ceil(len(frame) / page_size))
+    page = min(max(1, page), page_count)
+    start = (page - 1) * page_size
+    return frame.iloc[start:start + page_size], page_count
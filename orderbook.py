@@ -0,0 +1,271 @@
+"""Shared in-memory copy of the three tables that edits patch incrementally.
+
+Saving an order writes it to the store and then updates only the affected
+rows of the cached tables and of the derived aggregates, instead of
+reloading everything from the store. A full reload happens only when the
+store was changed by someone else (another process, or a hand edit).
+"""
+from contextlib import contextmanager
+from dataclasses import dataclass
+import itertools
+import logging
+import threading
+
+import pandas as pd
+
+from aggregates import build_order_summary
+from compact import append_rows, compact_payments, compact_tables, merge_categories, set_value
+from rollups import DailyRollup
+from storage import DATE_COLUMNS, ORDER_COLUMNS, ORDER_ITEM_COLUMNS, PAYMENT_COLUMNS
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_lines(lines):
+    """Line item dicts with Amount recomputed as quantity x rate."""
+    normalized = []
+    for line in lines:
+        quantity, rate = float(line['quantity']), float(line['rate'])
+        normalized.append({'Item_Name': line['Item_Name'], 'quantity': quantity,
+                           'rate': rate, 'Amount': quantity * rate})
+    return normalized
+
+
+@dataclass(frozen=True)
+class BookSnapshot:
+    """The order book's tables and aggregates as of one version."""
+    version: str
+    items_df: pd.DataFrame
+    orders_df: pd.DataFrame
+    order_items_df: pd.DataFrame
+    payments_df: pd.DataFrame
+    summary: pd.DataFrame
+    rollup: DailyRollup
+    # The store's version when the book last read or wrote it; ``version`` adds local patches
+    store_version: str = None
+
+
+class OrderBook:
+    """Tables, payments ledger, per-order summary and daily rollup for one data version.
+
+    Attributes are replaced, never mutated, so a page that grabbed them at
+    the start of a rerun keeps a consistent snapshot while another session
+    saves an edit.
+    """
+
+    def __init__(self, store, cache=None):
+        self.store = store
+        # Optional BookCache that a fresh process loads from instead of the store
+        self.cache = cache
+        self._lock = threading.RLock()
+        self.version = None
+        self._store_version = None
+        # Numbers the versions of patched tables, which the store's version may not tell apart
+        self._patches = itertools.count(1)
+        self.items_df = None
+        self.orders_df = None
+        self.order_items_df = None
+        self.payments_df = None
+        self.summary = None
+        self.rollup = None
+        self._listeners = []
+
+    def subscribe(self, callback):
+        """Call ``callback(version)`` after every reload or patch."""
+        self._listeners.append(callback)
+
+    def _changed(self):
+        for callback in self._listeners:
+            callback(self.version)
+
+    def snapshot(self):
+        """All attributes read together, so they belong to the same version."""
+        with self._lock:
+            return BookSnapshot(self.version, self.items_df, self.orders_df, self.order_items_df,
+                                self.payments_df, self.summary, self.rollup, store_version=self._store_version)
+
+    def sync(self):
+        """Reload from the store if it changed behind our back; return the version."""
+        with self._lock:
+            version = self.store.version()
+            if version != self._store_version:
+                self._reload(version)
+            return self.version
+
+    def persist(self, snapshot=None):
+        """Save ``snapshot`` (default: the current one) for the next process to start from."""
+        if self.cache is None:
+            return
+        try:
+            self.cache.save(snapshot or self.snapshot())
+        except OSError:
+            # Only the next cold start gets slower; the store still has everything
+            logger.warning("could not save the order book snapshot", exc_info=True)
+
+    def _reload(self, version=None):
+        version = version or self.store.version()
+        cached = self.cache.load(version) if self.cache is not None else None
+        if cached is not None:
+            items_df, orders_df, order_items_df = cached.items_df, cached.orders_df, cached.order_items_df
+            payments_df, summary, rollup = cached.payments_df, cached.summary, cached.rollup
+        else:
+            items_df, orders_df, order_items_df = compact_tables(*self.store.load_all())
+            payments_df = compact_payments(self.store.load_payments())
+            summary = build_order_summary(orders_df, order_items_df, payments_df)
+            rollup = DailyRollup.build(orders_df, order_items_df)
+        self.items_df, self.orders_df, self.order_items_df = items_df, orders_df, order_items_df
+        self.payments_df, self.summary, self.rollup = payments_df, summary, rollup
+        self.version = self._store_version = version
+        if cached is None:
+            self.persist()
+        self._changed()
+
+    def _apply(self, write, patch):
+        with self._lock:
+            stale = self.store.version() != self._store_version
+            result = write()
+            if stale:
+                self._reload()
+            else:
+                patch(result)
+                # The store may report its old version right after the write (Sheets does), so
+                # the patched tables get a version of their own for views memoized by version
+                self._store_version = self.store.version()
+                self.version = f"{self._store_version}+{next(self._patches)}"
+                self._changed()
+            return result
+
+    @contextmanager
+    def _batch(self):
+        # Stores that can hold writes (Sheets) send everything written in the block as one request
+        batch = getattr(self.store, 'batch', None)
+        if batch is None:
+            yield
+            return
+        with self._lock:
+            try:
+                with batch():
+                    yield
+            except Exception:
+                # The tables may be patched with writes that never reached the store
+                self._reload()
+                raise
+
+    # Mutations
+
+    def create_order(self, order, lines):
+        """Add a new order and return its Order_ID."""
+        lines = normalize_lines(lines)
+
+        def patch(order_id):
+            new_order = pd.DataFrame([{**order, 'Order_ID': order_id}]).reindex(columns=ORDER_COLUMNS)
+            for column in DATE_COLUMNS:
+                new_order[column] = pd.to_datetime(new_order[column])
+            new_lines = pd.DataFrame([{**line, 'Order_ID': order_id} for line in lines],
+                                     columns=ORDER_ITEM_COLUMNS)
+            self.orders_df = append_rows(self.orders_df, new_order)
+            self.order_items_df = append_rows(self.order_items_df, new_lines)
+            self.summary = pd.concat([self.summary, build_order_summary(new_order, new_lines)])
+            self.rollup = self.rollup.updated(added=(new_order.iloc[0], new_lines))
+
+        return self._apply(lambda: self.store.add_order({**order, 'Order_ID': None}, lines), patch)
+
+    def update_order(self, order_id, fields=None, lines=None):
+        """Change order fields and/or replace its line items."""
+        order_id = int(order_id)
+        fields = dict(fields or {})
+        if lines is not None:
+            lines = normalize_lines(lines)
+
+        def write():
+            with self._batch():
+                if fields:
+                    self.store.update_orders({order_id: fields})
+                if lines is not None:
+                    self.store.replace_order_items(order_id, lines)
+
+        def patch(_):
+            position = self.summary.index.get_loc(order_id)
+            old_order = self.orders_df.iloc[position]
+            old_lines = self.order_items_df[self.order_items_df['Order_ID'] == order_id]
+
+            orders_df = self.orders_df.copy()
+            for column, value in fields.items():
+                if column in DATE_COLUMNS:
+                    value = pd.Timestamp(value)
+                set_value(orders_df, position, column, value)
+            new_order = orders_df.iloc[[position]]
+
+            new_lines = old_lines
+            if lines is not None:
+                new_lines = pd.DataFrame([{**line, 'Order_ID': order_id} for line in lines],
+                                         columns=ORDER_ITEM_COLUMNS)
+                kept = self.order_items_df[self.order_items_df['Order_ID'] != order_id]
+                self.order_items_df = append_rows(kept, new_lines)
+
+            summary = self.summary.copy()
+            payments = self.payments_df[self.payments_df['Order_ID'] == order_id]
+            summary.iloc[position] = build_order_summary(new_order, new_lines, payments).iloc[0]
+            self.orders_df, self.summary = orders_df, summary
+
+            self.rollup = self.rollup.updated(removed=(old_order, old_lines),
+                                              added=(new_order.iloc[0], new_lines))
+
+        self._apply(write, patch)
+
+    def rename_customers(self, mapping):
+        """Rename customers ``{old name: new name}`` on all their orders, e.g. to merge duplicates."""
+        mapping = {old: new for old, new in mapping.items() if old != new}
+
+        def write():
+            names = self.orders_df['Customer_Name']
+            order_ids = self.orders_df.loc[names.isin(list(mapping)), 'Order_ID']
+            changes = {int(order_id): {'Customer_Name': mapping[name]}
+                       for order_id, name in zip(order_ids, names[order_ids.index])}
+            if changes:
+                self.store.update_orders(changes)
+            return len(changes)
+
+        def patch(_):
+            # Summary and rollup are keyed by order and item, not customer, so only names change
+            orders_df = self.orders_df.copy()
+            orders_df['Customer_Name'] = merge_categories(orders_df['Customer_Name'], mapping)
+            self.orders_df = orders_df
+
+        return self._apply(write, patch)
+
+    def record_payment(self, order_id, amount, method=None, paid_at=None, note=None):
+        """Add a (possibly partial) payment to the ledger; return its Payment_ID.
+
+        An order whose payments now cover its total is marked Paid.
+        """
+        order_id = int(order_id)
+        payment = {'Order_ID': order_id, 'Amount': float(amount), 'Method': method,
+                   'Paid_At': pd.Timestamp(paid_at) if paid_at is not None else pd.Timestamp.now().floor('s'),
+                   'Note': note}
+
+        def patch(payment_ids):
+            row = pd.DataFrame([{**payment, 'Payment_ID': payment_ids[0]}], columns=PAYMENT_COLUMNS)
+            self.payments_df = append_rows(self.payments_df, row)
+            position = self.summary.index.get_loc(order_id)
+            summary = self.summary.copy()
+            summary.iloc[position] = build_order_summary(
+                self.orders_df.iloc[[position]], self.order_items_df[self.order_items_df['Order_ID'] == order_id],
+                self.payments_df[self.payments_df['Order_ID'] == order_id]).iloc[0]
+            self.summary = summary
+
+        with self._batch():
+            payment_id = self._apply(lambda: self.store.add_payments([payment]), patch)[0]
+            with self._lock:
+                position = self.summary.index.get_loc(order_id)
+                settled = self.summary['Paid'].iloc[position] >= self.summary['Total'].iloc[position] - 0.005
+                pending = self.orders_df['Payment'].iloc[position] == 'Pending'
+            if settled and pending:
+                self.set_payment(order_id, 'Paid')
+        return payment_id
+
+    def set_status(self, order_id, status):
+        self.update_order(order_id, {'Status': status})
+
+    def set_payment(self, order_id, payment):
+        self.update_order(order_id, {'Payment': payment})
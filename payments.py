@@ -0,0 +1,91 @@
+"""Receivables from the payments ledger: who owes what, and for how long.
+
+The order summary already nets each order's ledger payments off its
+total, so receivables are one vectorized pass over the orders with money
+due: each is bucketed by days since delivery and the buckets are summed
+per customer in a single pivot. Reminder messages are built for all
+customers at once with string operations on whole columns.
+"""
+from urllib.parse import quote
+
+import numpy as np
+import pandas as pd
+
+from aggregates import memoize_by_version
+
+PAYMENT_METHODS = ['Cash', 'UPI', 'Bank Transfer', 'Card']
+# Upper bound (days since delivery, inclusive) and label of each aging bucket
+AGING_BUCKETS = [(7, '0-7 days'), (30, '8-30 days'), (60, '31-60 days'), (np.inf, '60+ days')]
+RECEIVABLE_COLUMNS = ['Customer_Name', 'Phone', 'Orders_Due', 'Outstanding', 'Oldest_Delivery',
+                      'Days_Overdue'] + [label for _, label in AGING_BUCKETS]
+REMINDER_TEMPLATE = ("Namaste {name}, a gentle reminder that ₹{amount} is due for your Diwali snacks order "
+                     "(order {orders}). You can pay by cash or UPI. Thank you!")
+
+
+def due_orders(orders_df, summary, today):
+    """Orders with money due, with Outstanding, Days_Overdue and aging Bucket."""
+    outstanding = summary['Pending_Amount'].reindex(orders_df['Order_ID']).to_numpy()
+    due = orders_df.loc[outstanding > 0.005, ['Order_ID', 'Customer_Name', 'Phone', 'Delivery_Date', 'Status']]
+    days = (pd.Timestamp(today).normalize() - due['Delivery_Date']).dt.days.clip(lower=0)
+    bounds = [-1] + [bound for bound, _ in AGING_BUCKETS]
+    return due.assign(
+        Outstanding=outstanding[outstanding > 0.005],
+        Days_Overdue=days,
+        Bucket=pd.cut(days, bounds, labels=[label for _, label in AGING_BUCKETS]),
+    )
+
+
+def build_receivables(orders_df, summary, today):
+    """Per customer with dues: order count, amount, oldest delivery and the amount in each aging bucket."""
+    due = due_orders(orders_df, summary, today)
+    due = due.assign(Customer_Name=due['Customer_Name'].astype(object))
+    per_customer = due.groupby('Customer_Name').agg(
+        Phone=('Phone', 'last'),
+        Orders_Due=('Order_ID', 'size'),
+        Outstanding=('Outstanding', 'sum'),
+        Oldest_Delivery=('Delivery_Date', 'min'),
+        Days_Overdue=('Days_Overdue', 'max'),
+    )
+    aging = due.pivot_table(index='Customer_Name', columns='Bucket', values='Outstanding',
+                            aggfunc='sum', fill_value=0, observed=False)
+    receivables = per_customer.join(aging.reindex(columns=[label for _, label in AGING_BUCKETS], fill_value=0))
+    receivables = receivables.fillna({label: 0 for _, label in AGING_BUCKETS})
+    return receivables.reset_index().sort_values('Outstanding', ascending=False)[RECEIVABLE_COLUMNS] \
+        .reset_index(drop=True)
+
+
+@memoize_by_version()
+def receivables(version, orders_df, summary, today):
+    """``build_receivables`` cached per version; include the day in the key, ages depend on it."""
+    return build_receivables(orders_df, summary, today)
+
+
+def reminder_messages(receivables_df, orders_df, summary, today, template=REMINDER_TEMPLATE):
+    """One reminder per customer with dues: Customer_Name, Phone, Outstanding, Message, WhatsApp link.
+
+    ``template`` may use {name}, {amount} and {orders}.
+    """
+    due = due_orders(orders_df, summary, today)
+    order_ids = {}
+    for name, order_id in zip(due['Customer_Name'].astype(object), due['Order_ID']):
+        order_ids.setdefault(name, []).append(f"#{order_id}")
+    reminders = receivables_df[['Customer_Name', 'Phone', 'Outstanding']].copy()
+    parts = [(name, f"{amount:,.0f}", ', '.join(order_ids.get(name, ())))
+             for name, amount in zip(reminders['Customer_Name'], reminders['Outstanding'])]
+    reminders['Message'] = [template.format(name=name, amount=amount, orders=orders)
+                            for name, amount, orders in parts]
+    # Quote the fixed text once and only the filled-in parts per customer
+    link = quote(template, safe='/{}')
+    digits = reminders['Phone'].astype(object).fillna('').astype(str).str.replace(r'\D', '', regex=True)
+    # Ten-digit numbers are Indian mobiles; anything else is used as written
+    digits = digits.where(digits.str.len() != 10, '91' + digits)
+    reminders['WhatsApp'] = [
+        f"https://wa.me/{number}?text=" + link.format(name=quote(name), amount=quote(amount), orders=quote(orders))
+        if number else '' for number, (name, amount, orders) in zip(digits, parts)]
+    return reminders
+
+
+@memoize_by_version()
+def reminders(version, receivables_df, orders_df, summary, today, template=REMINDER_TEMPLATE):
+    """``reminder_messages`` cached per version; key it like ``receivables``."""
+    return reminder_messages(receivables_df, orders_df, summary, today, template)
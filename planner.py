@@ -0,0 +1,65 @@
+"""Stock requirement planner shared by the Dashboard and Stock Analysis.
+
+Active demand is bucketed by delivery date into one item x date pivot,
+and current stock is walked forward along it with a cumulative sum, so
+every item and day is handled in a single vectorized pass.
+"""
+from dataclasses import dataclass
+
+import pandas as pd
+
+from aggregates import memoize_by_version
+
+EPSILON = 1e-9
+
+
+@dataclass(frozen=True)
+class StockPlan:
+    # Per item: Stock, Required, Difference, First_Short (NaT if never short)
+    summary: pd.DataFrame
+    # Item x delivery date: kg that must be prepared by that day, cumulative
+    cumulative_to_prepare: pd.DataFrame
+
+    @property
+    def daily_to_prepare(self):
+        """Kg to prepare for each day's deliveries on top of earlier days."""
+        return self.cumulative_to_prepare.diff(axis=1).fillna(self.cumulative_to_prepare)
+
+    @property
+    def shortages(self):
+        return self.summary[self.summary['Difference'] < 0]
+
+
+def build_stock_plan(items_df, orders_df, order_items_df):
+    active = orders_df.loc[orders_df['Status'] == 'Active', ['Order_ID', 'Delivery_Date']]
+    lines = order_items_df[['Order_ID', 'Item_Name', 'quantity']].merge(active, on='Order_ID', how='inner')
+    demand = lines.groupby(['Item_Name', 'Delivery_Date'], observed=True)['quantity'].sum().unstack(fill_value=0)
+    return plan_from_demand(items_df, demand)
+
+
+def plan_from_demand(items_df, demand):
+    """Stock plan from an item x delivery date pivot of active demand in kg."""
+    stock = items_df.set_index('Item_Name')['Stock']
+    item_names = stock.index.append(demand.index.difference(stock.index))
+    demand = demand.reindex(item_names, fill_value=0).sort_index(axis=1)
+    stock = stock.reindex(item_names, fill_value=0)
+
+    cumulative_demand = demand.cumsum(axis=1)
+    to_prepare = cumulative_demand.sub(stock, axis=0).clip(lower=0)
+    short = to_prepare > EPSILON
+    first_short = short.idxmax(axis=1).where(short.any(axis=1)) if len(demand.columns) else None
+
+    required = demand.sum(axis=1)
+    summary = pd.DataFrame({
+        'Stock': stock,
+        'Required': required,
+        'Difference': stock - required,
+        'First_Short': pd.to_datetime(first_short),
+    }, index=item_names)
+    summary.index.name = 'Item_Name'
+    return StockPlan(summary=summary, cumulative_to_prepare=to_prepare)
+
+
+@memoize_by_version()
+def stock_plan_from_rollup(version, items_df, rollup):
+    return plan_from_demand(items_df, rollup.active_demand_by_date())
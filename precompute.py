@@ -0,0 +1,76 @@
+"""Background worker that keeps every derived view computed ahead of requests.
+
+One daemon thread per process watches the order book. Whenever the data
+version changes, whether from an edit in some session or from a write
+elsewhere that the periodic sync picks up, it takes a snapshot and calls
+each memoized builder for the new version. The results land in the same
+process-wide caches the pages read from, so sessions find them ready; a
+session that arrives mid-build waits for the worker's result rather than
+building its own copy. Each warmed snapshot is also saved for the next
+process to start from.
+"""
+import logging
+import threading
+
+from customers import customer_directory
+from item_index import item_index
+from order_index import order_index
+from planner import stock_plan_from_rollup
+from validation import validation_report
+
+logger = logging.getLogger(__name__)
+
+
+def warm(snapshot):
+    """Build every memoized view of ``snapshot`` that the pages read."""
+    version = snapshot.version
+    validation_report(version, snapshot.items_df, snapshot.orders_df, snapshot.order_items_df)
+    order_index(version, snapshot.orders_df, snapshot.order_items_df)
+    stock_plan_from_rollup(version, snapshot.items_df, snapshot.rollup)
+    item_index(version, snapshot.orders_df, snapshot.order_items_df)
+    customer_directory(version, snapshot.orders_df, snapshot.summary)
+    snapshot.rollup.frame()
+
+
+class Precomputer:
+    def __init__(self, book, interval=5.0):
+        self.book = book
+        self.interval = interval
+        self.warmed = None
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        book.subscribe(lambda version: self._wake.set())
+
+    def refresh(self):
+        """Sync the book and warm the caches if its version moved; return the version."""
+        version = self.book.sync()
+        if version != self.warmed:
+            snapshot = self.book.snapshot()
+            warm(snapshot)
+            self.book.persist(snapshot)
+            self.warmed = snapshot.version
+        return version
+
+    def start(self):
+        """Warm the current version in the foreground, then keep watching in the background."""
+        self.refresh()
+        self._thread = threading.Thread(target=self._run, name="precompute", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            if self._stop.is_set():
+                break
+            try:
+                self.refresh()
+            except Exception:
+                # A failed sync (network, locked database) is retried on the next tick
+                logger.exception("precompute refresh failed")
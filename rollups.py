@@ -0,0 +1,96 @@
+"""Materialized rollup of line items by delivery date, item, status and payment.
+
+The rollup is built once per full load with a single group-by and then
+kept current by the order book: adding or changing an order subtracts its
+old lines and adds its new ones, touching only the cells for that order's
+items. Each update returns a new rollup, so readers holding the previous
+one keep a consistent view. Dashboard tables are answered from the
+materialized frame, whose size depends on dates x items, not on orders.
+"""
+import pandas as pd
+
+ROLLUP_KEYS = ['Delivery_Date', 'Item_Name', 'Status', 'Payment']
+ROLLUP_VALUES = ['quantity', 'Amount', 'Lines', 'Orders']
+EPSILON = 1e-9
+
+
+class DailyRollup:
+    def __init__(self, cells=None):
+        # (Delivery_Date, Item_Name, Status, Payment) -> [quantity, Amount, Lines, Orders]
+        self._cells = cells or {}
+        self._frame = None
+
+    @classmethod
+    def build(cls, orders_df, order_items_df):
+        lines = order_items_df[['Order_ID', 'Item_Name', 'quantity', 'Amount']].merge(
+            orders_df[['Order_ID', 'Delivery_Date', 'Status', 'Payment']], on='Order_ID', how='inner')
+        grouped = lines.groupby(ROLLUP_KEYS, observed=True).agg(
+            quantity=('quantity', 'sum'),
+            Amount=('Amount', 'sum'),
+            Lines=('Order_ID', 'size'),
+            Orders=('Order_ID', 'nunique'),
+        )
+        cells = {key: [float(quantity), float(amount), int(count), int(orders)]
+                 for key, quantity, amount, count, orders in zip(
+                     grouped.index, grouped['quantity'], grouped['Amount'], grouped['Lines'], grouped['Orders'])}
+        return cls(cells)
+
+    def updated(self, removed=None, added=None):
+        """A new rollup with ``removed`` and then ``added`` applied.
+
+        Each is an ``(order, lines)`` pair: the order's Delivery_Date, Status
+        and Payment (a dict or Series), and a frame of its line items.
+        """
+        cells = dict(self._cells)
+        for sign, change in ((-1, removed), (1, added)):
+            if change is None:
+                continue
+            order, lines = change
+            # build() groups by these keys, which leaves out lines with any of them missing
+            if not len(lines) or any(pd.isna(order[key]) for key in ('Delivery_Date', 'Status', 'Payment')):
+                continue
+            lines = lines[lines['Item_Name'].notna()]
+            prefix = (pd.Timestamp(order['Delivery_Date']),)
+            suffix = (order['Status'], order['Payment'])
+            per_item = {}
+            for item_name, quantity, amount in zip(lines['Item_Name'], lines['quantity'], lines['Amount']):
+                totals = per_item.setdefault(item_name, [0.0, 0.0, 0])
+                totals[0] += float(quantity)
+                totals[1] += float(amount)
+                totals[2] += 1
+            for item_name, (quantity, amount, count) in per_item.items():
+                key = prefix + (item_name,) + suffix
+                cell = list(cells.get(key, (0.0, 0.0, 0, 0)))
+                cell[0] += sign * quantity
+                cell[1] += sign * amount
+                cell[2] += sign * count
+                cell[3] += sign
+                if cell[2] <= 0 and abs(cell[0]) < EPSILON:
+                    cells.pop(key, None)
+                else:
+                    cells[key] = cell
+        return DailyRollup(cells)
+
+    def frame(self):
+        """The rollup as a DataFrame indexed by ROLLUP_KEYS (cached, read-only)."""
+        if self._frame is None:
+            index = pd.MultiIndex.from_tuples(list(self._cells), names=ROLLUP_KEYS) if self._cells else \
+                pd.MultiIndex.from_tuples([], names=ROLLUP_KEYS)
+            self._frame = pd.DataFrame(list(self._cells.values()), index=index, columns=ROLLUP_VALUES)
+        return self._frame
+
+    def by_item(self, status=None):
+        frame = self.frame()
+        if status is not None:
+            frame = frame[frame.index.get_level_values('Status') == status]
+        return frame.groupby(level='Item_Name').sum()
+
+    def amounts(self):
+        """Amount per (Status, Payment)."""
+        return self.frame()['Amount'].groupby(level=['Status', 'Payment']).sum()
+
+    def active_demand_by_date(self):
+        """Item x delivery date pivot of kg on Active orders."""
+        frame = self.frame()
+        active = frame[frame.index.get_level_values('Status') == 'Active']['quantity']
+        return active.groupby(level=['Item_Name', 'Delivery_Date']).sum().unstack(fill_value=0)
@@ -0,0 +1,39 @@
+"""The app's pages, one module each, imported the first time their page is shown.
+
+Every page module has ``render(ctx)``. The entry script only builds the
+PageContext and the sidebar, so a rerun executes the selected page's code
+alone. Analysis, import and export libraries load only when their page is
+first opened, not at startup.
+"""
+from dataclasses import dataclass
+import importlib
+
+PAGES = {
+    "📊 Dashboard": "dashboard",
+    "📋 All Orders": "orders",
+    "📦 Inventory": "inventory",
+    "📈 Stock Analysis": "stock_analysis",
+    "🔍 Item-wise Customers": "item_customers",
+    "👥 Customers": "customers",
+    "💳 Payments": "payments",
+    "🚚 Deliveries": "deliveries",
+    "🧾 Exports": "exports",
+    "➕ New Order": "new_order",
+    "📥 Import Orders": "import_orders",
+    "🩺 Data Check": "data_check",
+    "📚 Seasons": "seasons",
+}
+
+
+@dataclass(frozen=True)
+class PageContext:
+    """What a page works with during one rerun."""
+    book: object
+    store: object
+    # BookSnapshot taken at the start of the rerun
+    snapshot: object
+    validation: object
+
+
+def render(page, ctx):
+    importlib.import_module(f"{__name__}.{PAGES[page]}").render(ctx)
@@ -0,0 +1,108 @@
+"""Forms and widgets shared by several pages."""
+from datetime import date
+
+import pandas as pd
+import streamlit as st
+
+from compact import lookup
+from payments import PAYMENT_METHODS
+from validation import repair_order_items
+from views import order_listing
+
+PAYMENT_OPTIONS = ['Pending', 'Paid']
+PAGE_SIZES = [10, 25, 50, 100]
+
+
+def apply_repairs(book, report, **options):
+    # Persist the fixes order by order so the cached tables are patched, not reloaded
+    repaired, changed = repair_order_items(book.order_items_df, report, **options)
+    for order_id in changed:
+        lines = repaired[repaired['Order_ID'] == order_id]
+        book.update_order(order_id, lines=lines.to_dict('records'))
+    return changed
+
+
+def order_form(ctx, key, order=None, lines_df=None):
+    # Returns (fields, lines) when submitted with at least one line item
+    items_df = ctx.snapshot.items_df
+    with st.form(key):
+        col1, col2 = st.columns(2)
+        with col1:
+            customer = st.text_input("Customer Name", value=order['Customer_Name'] if order is not None else "")
+            phone = st.text_input("Phone", value=order['Phone'] if order is not None and pd.notna(order['Phone']) else "")
+            address = st.text_input("Address", value=order['Address'] if order is not None and pd.notna(order['Address']) else "")
+        with col2:
+            delivery = st.date_input("Delivery Date", value=order['Delivery_Date'].date() if order is not None else date.today())
+            payment = st.selectbox("Payment", PAYMENT_OPTIONS,
+                                   index=PAYMENT_OPTIONS.index(order['Payment']) if order is not None else 0)
+            notes = st.text_input("Notes", value=order['Notes'] if order is not None and pd.notna(order['Notes']) else "")
+
+        if lines_df is None:
+            lines_df = pd.DataFrame(columns=['Item_Name', 'quantity', 'rate'])
+        edited = st.data_editor(
+            lines_df[['Item_Name', 'quantity', 'rate']].reset_index(drop=True),
+            num_rows="dynamic",
+            column_config={
+                'Item_Name': st.column_config.SelectboxColumn("Item", options=items_df['Item_Name'].tolist(), required=True),
+                'quantity': st.column_config.NumberColumn("Qty (kg)", min_value=0.0, step=0.25, required=True),
+                'rate': st.column_config.NumberColumn("Rate (₹/kg)", min_value=0.0, help="Leave blank to use the item's rate"),
+            },
+            hide_index=True,
+            use_container_width=True,
+        )
+
+        if not st.form_submit_button("💾 Save"):
+            return None
+
+    edited = edited.dropna(subset=['Item_Name', 'quantity'])
+    if not customer.strip() or edited.empty:
+        st.error("Customer name and at least one item are required")
+        return None
+    item_rates = items_df.set_index('Item_Name')['Rate']
+    edited['rate'] = edited['rate'].fillna(lookup(edited['Item_Name'], item_rates))
+    fields = {
+        'Customer_Name': customer.strip(),
+        'Phone': phone or None,
+        'Address': address or None,
+        'Delivery_Date': pd.Timestamp(delivery),
+        'Payment': payment,
+        'Notes': notes or None,
+    }
+    return fields, edited.to_dict('records')
+
+
+def page_of(ctx, index, status, page_size, key, **filters):
+    # Only the selected page of orders is ever rendered
+    listing = order_listing(index, ctx.snapshot.summary, status, st.session_state.get(key, 1), page_size, **filters)
+    if listing.page_count > 1:
+        st.number_input(f"Page (of {listing.page_count}) · {listing.total_count} orders",
+                        min_value=1, max_value=listing.page_count, value=listing.page, step=1, key=key)
+    return listing.orders
+
+
+def payment_form(ctx, order_id):
+    # Records a part or full payment; the order turns Paid once its total is covered
+    due = float(ctx.snapshot.summary.at[order_id, 'Pending_Amount'])
+    if due <= 0:
+        return
+    with st.form(f"payment_{order_id}"):
+        amount = st.number_input("💰 Amount received", min_value=0.0, value=due, step=10.0)
+        method = st.selectbox("Method", PAYMENT_METHODS)
+        if st.form_submit_button("💰 Record Payment", use_container_width=True) and amount > 0:
+            ctx.book.record_payment(order_id, amount, method)
+            st.rerun()
+
+
+def show_order_items(index, order_id):
+    # Line items are looked up only for orders the user chooses to open
+    if st.toggle("📦 Show items", key=f"items_{order_id}"):
+        items = index.lines(order_id)
+        st.dataframe(
+            items[['Item_Name', 'quantity', 'rate', 'Amount']].rename(columns={
+                'Item_Name': 'Item',
+                'quantity': 'Qty (kg)',
+                'rate': 'Rate (₹/kg)'
+            }),
+            hide_index=True,
+            use_container_width=True
+        )
@@ -0,0 +1,57 @@
+"""Customers: search, order history and merging of duplicate names."""
+import streamlit as st
+
+from customers import customer_directory
+
+
+def render(ctx):
+    snapshot = ctx.snapshot
+    orders_df, order_summary_df = snapshot.orders_df, snapshot.summary
+    
+    st.title("👥 Customers")
+    
+    directory = customer_directory(snapshot.version, orders_df, order_summary_df)
+    query = st.text_input("🔍 Search customers", placeholder="Name, part of a name or a near spelling")
+    
+    if query.strip():
+        matches = directory.search(query)
+        if matches.empty:
+            st.info("No matching customers")
+        else:
+            st.dataframe(matches, hide_index=True, use_container_width=True,
+                         column_config={'Total': st.column_config.NumberColumn(format="₹%.0f"),
+                                        'Outstanding': st.column_config.NumberColumn(format="₹%.0f"),
+                                        'Last_Delivery': st.column_config.DateColumn(format="DD MMM YYYY"),
+                                        'Match': st.column_config.ProgressColumn(min_value=0, max_value=1)})
+            selected = st.selectbox("Customer", matches['Customer_Name'])
+            customer = matches.set_index('Customer_Name').loc[selected]
+            
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.metric("Orders", int(customer['Orders']))
+            with col2:
+                st.metric("Total", f"₹{customer['Total']:,.0f}")
+            with col3:
+                st.metric("Outstanding", f"₹{customer['Outstanding']:,.0f}")
+            
+            history = directory.history(selected)
+            st.dataframe(history[['Order_ID', 'Delivery_Date', 'Status', 'Payment', 'Total', 'Pending_Amount']],
+                         hide_index=True, use_container_width=True,
+                         column_config={'Delivery_Date': st.column_config.DateColumn(format="DD MMM YYYY"),
+                                        'Total': st.column_config.NumberColumn(format="₹%.0f"),
+                                        'Pending_Amount': st.column_config.NumberColumn(format="₹%.0f")})
+    
+    st.divider()
+    
+    st.subheader("🔗 Possible Duplicates")
+    suggestions = directory.duplicates()
+    if suggestions.empty:
+        st.success("No duplicate customers found")
+    for row, suggestion in suggestions.iterrows():
+        with st.expander(f"{suggestion['Keep']} ← {', '.join(suggestion['Merge'])} ({suggestion['Reason']})"):
+            keep = st.selectbox("Keep name", [suggestion['Keep'], *suggestion['Merge']], key=f"keep_{row}")
+            if st.button("🔗 Merge", key=f"merge_{row}"):
+                names = [suggestion['Keep'], *suggestion['Merge']]
+                ctx.book.rename_customers({name: keep for name in names if name != keep})
+                st.success(f"Merged into {keep}")
+                st.rerun()
@@ -0,0 +1,79 @@
+"""Dashboard: order and money totals, today's deliveries, top items and stock alerts."""
+from datetime import date
+
+import pandas as pd
+import streamlit as st
+
+from order_index import order_index
+from views import dashboard_view
+
+
+def render(ctx):
+    snapshot = ctx.snapshot
+    items_df, orders_df, order_items_df = snapshot.items_df, snapshot.orders_df, snapshot.order_items_df
+    order_summary_df = snapshot.summary
+    
+    st.title("📊 Dashboard")
+    
+    # Calculate metrics
+    view = dashboard_view(snapshot.version, items_df, orders_df, snapshot.rollup, order_summary_df,
+                          today=pd.Timestamp(date.today()))
+    metrics = view.metrics
+    todays_deliveries = view.todays_deliveries
+    
+    # Metrics
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        st.metric("🔄 Active Orders", metrics.active_orders)
+        st.metric("💰 Active Amount", f"₹{metrics.active_amount:,.0f}")
+    
+    with col2:
+        st.metric("✅ Completed Orders", metrics.completed_orders)
+        st.metric("💰 Completed Amount", f"₹{metrics.completed_amount:,.0f}")
+    
+    with col3:
+        st.metric("📅 Today's Deliveries", len(todays_deliveries))
+        st.metric("⚠️ Pending Payment", f"₹{metrics.pending_amount:,.0f}")
+    
+    with col4:
+        st.metric("📊 Total Orders", metrics.total_orders)
+        st.metric("💵 Total Amount", f"₹{metrics.total_amount:,.0f}")
+    
+    st.divider()
+    
+    # Today's deliveries detail
+    if len(todays_deliveries) > 0:
+        st.subheader("📅 Today's Deliveries")
+        index = order_index(snapshot.version, orders_df, order_items_df)
+        for _, order in todays_deliveries.iterrows():
+            with st.expander(f"👤 {order['Customer_Name']} - ₹{order['Total']:,.0f}"):
+                items = index.lines(order['Order_ID'])
+                st.dataframe(items[['Item_Name', 'quantity', 'rate', 'Amount']], hide_index=True)
+    
+    st.divider()
+    
+    # Top 5 Items by Quantity
+    st.subheader("🏆 Top 5 Items by Quantity Sold")
+    item_summary = view.top_items
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        st.dataframe(item_summary.style.format({'quantity': '{:.2f} kg', 'Amount': '₹{:,.0f}'}))
+    
+    with col2:
+        st.bar_chart(item_summary['quantity'])
+    
+    st.divider()
+    
+    # Stock Alerts
+    st.subheader("⚠️ Stock Alerts")
+    
+    for item_name, item in view.stock_alerts.iterrows():
+        required = item['Required']
+        difference = item['Difference']
+        
+        if difference < 0:
+            st.error(f"🔴 {item_name}: Stock {item['Stock']} kg | Required {required:.1f} kg | **SHORT by {abs(difference):.1f} kg** from {item['First_Short'].strftime('%d %b')}")
+        else:
+            st.warning(f"🟡 {item_name}: Stock {item['Stock']} kg | Required {required:.1f} kg | Only {difference:.1f} kg surplus")
@@ -0,0 +1,28 @@
+"""Data Check: integrity problems in the tables and the automatic repairs."""
+import streamlit as st
+
+from screens.common import apply_repairs
+
+
+def render(ctx):
+    st.title("🩺 Data Check")
+    
+    if ctx.validation.is_clean:
+        st.success("✅ No data problems found")
+    else:
+        st.dataframe(ctx.validation.counts(), hide_index=True, use_container_width=True)
+        st.dataframe(ctx.validation.issues, hide_index=True, use_container_width=True)
+        
+        st.divider()
+        
+        st.subheader("🔧 Repair")
+        fix_items = st.checkbox("Rename unknown items to their single close catalogue match", value=True)
+        fix_amounts = st.checkbox("Recompute Amount as quantity x rate", value=True)
+        fix_rates = st.checkbox("Reset rates to the catalogue rate", value=False)
+        if st.button("🔧 Apply Repairs"):
+            changed = apply_repairs(ctx.book, ctx.validation, fix_items=fix_items, fix_amounts=fix_amounts,
+                                    fix_rates=fix_rates)
+            if changed:
+                st.rerun()
+            else:
+                st.info("Nothing could be repaired automatically; the remaining problems need a manual edit")
@@ -0,0 +1,53 @@
+"""Deliveries: driver batches, packing list and printable delivery sheets."""
+from datetime import date
+
+import streamlit as st
+
+from deliveries import batch_label, delivery_sheets_html, plan_deliveries
+
+
+def render(ctx):
+    snapshot = ctx.snapshot
+    orders_df, order_items_df, order_summary_df = snapshot.orders_df, snapshot.order_items_df, snapshot.summary
+    
+    st.title("🚚 Delivery Planning")
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        delivery_from = st.date_input("From", value=date.today(), key="deliveries_from")
+    with col2:
+        delivery_to = st.date_input("To", value=delivery_from, min_value=delivery_from, key="deliveries_to")
+    with col3:
+        drivers = st.number_input("Drivers", min_value=1, max_value=20, value=2, step=1, key="deliveries_drivers")
+    
+    plan = plan_deliveries(orders_df, order_items_df, order_summary_df, delivery_from, delivery_to, drivers)
+    
+    if plan.stops.empty:
+        st.info("No active deliveries in this period")
+    else:
+        st.subheader("🧭 Batches")
+        st.dataframe(plan.batches.style.format({'Kg': '{:.2f} kg', 'To_Collect': '₹{:,.0f}'}),
+                     use_container_width=True)
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            st.download_button("🖨️ Delivery sheets (HTML)", delivery_sheets_html(plan),
+                               file_name=f"deliveries_{delivery_from:%Y%m%d}_{delivery_to:%Y%m%d}.html",
+                               mime="text/html")
+        with col2:
+            st.download_button("⬇️ Packing list (CSV)", plan.packing_list.to_csv(),
+                               file_name=f"packing_{delivery_from:%Y%m%d}_{delivery_to:%Y%m%d}.csv",
+                               mime="text/csv")
+        
+        st.subheader("📦 Packing List (kg)")
+        st.dataframe(plan.packing_list.style.format('{:.2f}'), use_container_width=True)
+        
+        st.subheader("📍 Stops")
+        for (day, driver), stops in plan.stops.groupby(['Delivery_Date', 'Driver']):
+            with st.expander(f"{batch_label(day, driver)} - {len(stops)} stops"):
+                st.dataframe(stops[['Stop', 'Area', 'Customer_Name', 'Phone', 'Address', 'Items', 'Kg',
+                                    'Pending_Amount']],
+                             column_config={'Kg': st.column_config.NumberColumn(format="%.2f kg"),
+                                            'Pending_Amount': st.column_config.NumberColumn("To Collect",
+                                                                                            format="₹%.0f")},
+                             hide_index=True, use_container_width=True)
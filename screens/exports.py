@@ -0,0 +1,55 @@
+"""Exports: invoices and the season report for selected orders, as one ZIP."""
+from datetime import date
+
+import pandas as pd
+import streamlit as st
+
+from exports import ExportJob, remove_stale_exports
+from screens.common import PAYMENT_OPTIONS
+from settings import EXPORT_WORKERS, SELLER_NAME
+
+
+def render(ctx):
+    snapshot = ctx.snapshot
+    orders_df, order_items_df, order_summary_df = snapshot.orders_df, snapshot.order_items_df, snapshot.summary
+    
+    st.title("🧾 Invoices & Season Report")
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        statuses = st.multiselect("Status", sorted(orders_df['Status'].dropna().unique()), key="exports_status")
+    with col2:
+        payments = st.multiselect("Payment", PAYMENT_OPTIONS, key="exports_payment")
+    with col3:
+        delivery_range = st.date_input("Delivery dates", value=(), key="exports_dates")
+    
+    selected = orders_df
+    if statuses:
+        selected = selected[selected['Status'].isin(statuses)]
+    if payments:
+        selected = selected[selected['Payment'].isin(payments)]
+    if len(delivery_range) == 2:
+        selected = selected[selected['Delivery_Date'].between(pd.Timestamp(delivery_range[0]),
+                                                              pd.Timestamp(delivery_range[1]))]
+    st.caption(f"{len(selected)} orders selected · one HTML invoice each (print to PDF from the browser) "
+               "plus report.xlsx with orders, line items and item totals")
+    
+    job = st.session_state.get("export_job")
+    if st.button("🧾 Generate ZIP", disabled=selected.empty or (job is not None and job.running)):
+        if job is not None:
+            job.discard()
+        remove_stale_exports()
+        job = st.session_state["export_job"] = ExportJob(selected, order_items_df, order_summary_df, SELLER_NAME,
+                                                         EXPORT_WORKERS).start()
+        job.wait(1)
+    
+    if job is not None:
+        if job.running:
+            st.progress(job.done / max(job.total, 1), text=f"Rendered {job.done} of {job.total} invoices")
+            st.button("🔄 Check progress")
+        elif job.error is not None:
+            st.error(f"Export failed: {job.error}")
+        else:
+            with open(job.path, 'rb') as archive_file:
+                st.download_button(f"⬇️ Download {job.total} invoices + report (ZIP)", archive_file,
+                                   file_name=f"diwali_export_{date.today():%Y%m%d}.zip", mime="application/zip")
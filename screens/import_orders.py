@@ -0,0 +1,51 @@
+"""Import Orders: bulk import from a CSV or Excel file, with an error report."""
+import streamlit as st
+
+from importer import OPTIONAL_COLUMNS, REQUIRED_COLUMNS, import_orders
+
+
+def render(ctx):
+    items_df = ctx.snapshot.items_df
+    
+    st.title("📥 Import Orders")
+    
+    st.info("Upload a CSV or Excel file with one row per line item: "
+            f"{', '.join(REQUIRED_COLUMNS)} are required; {', '.join(OPTIONAL_COLUMNS)} are optional.")
+    
+    uploaded = st.file_uploader("Orders file", type=["csv", "xlsx", "xlsm"])
+    date_format = st.selectbox("Date format", ["%m/%d/%Y", "%d/%m/%Y", "%Y-%m-%d"])
+    
+    if uploaded is not None and st.button("📥 Import"):
+        progress_bar = st.progress(0.0, text="Starting import...")
+        
+        def show_progress(result):
+            # The uploaded file's read position tracks how far the reader has got
+            done = min(uploaded.tell() / uploaded.size, 1.0) if uploaded.size else 1.0
+            progress_bar.progress(done, text=f"{result.rows_read:,} rows read · "
+                                             f"{result.orders_created:,} orders created")
+        
+        try:
+            result = import_orders(ctx.store, uploaded, uploaded.name, items_df,
+                                   date_format=date_format, progress=show_progress)
+        except ValueError as error:
+            st.error(str(error))
+        else:
+            progress_bar.progress(1.0, text="Import finished")
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.metric("Orders Created", result.orders_created)
+            with col2:
+                st.metric("Lines Imported", result.lines_imported)
+            with col3:
+                st.metric("Rows Rejected", result.rows_rejected)
+            
+            report = result.error_report()
+            if len(report) > 0:
+                if result.problems_truncated:
+                    st.warning(f"Showing the first {len(report):,} of {result.problems_found:,} problems")
+                st.dataframe(report, hide_index=True, use_container_width=True)
+                st.download_button("⬇️ Download error report", report.to_csv(index=False),
+                                   file_name="import_errors.csv", mime="text/csv")
+        finally:
+            # The import writes to the store directly; chunks written before an error count too
+            ctx.book.sync()
@@ -0,0 +1,25 @@
+"""Inventory: the item catalogue with stock and its value."""
+import streamlit as st
+
+
+def render(ctx):
+    items_df = ctx.snapshot.items_df
+    
+    st.title("📦 Inventory")
+    
+    st.dataframe(
+        items_df.style.format({'Rate': '₹{:.0f}', 'Stock': '{:.2f} kg', 'Value': '₹{:,.0f}'}),
+        hide_index=True,
+        use_container_width=True
+    )
+    
+    st.divider()
+    
+    total_value = items_df['Value'].sum()
+    total_stock = items_df['Stock'].sum()
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        st.metric("📦 Total Stock", f"{total_stock:.1f} kg")
+    with col2:
+        st.metric("💰 Total Inventory Value", f"₹{total_value:,.0f}")
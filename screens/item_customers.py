@@ -0,0 +1,62 @@
+"""Item-wise Customers: every order containing a chosen item."""
+import streamlit as st
+
+from item_index import item_index
+from views import item_customers_view
+
+
+def render(ctx):
+    snapshot = ctx.snapshot
+    items_df, orders_df, order_items_df = snapshot.items_df, snapshot.orders_df, snapshot.order_items_df
+    
+    st.title("🔍 Item-wise Customer Analysis")
+    
+    st.info("Select an item to see all customers who ordered it")
+    
+    index = item_index(snapshot.version, orders_df, order_items_df)
+    
+    selected_item = st.selectbox("Select Item:", items_df['Item_Name'].tolist())
+    
+    if selected_item:
+        st.subheader(f"📊 {selected_item} - Customer Details")
+        
+        # Get statistics
+        item_stats, customer_df = item_customers_view(index, snapshot.rollup, selected_item)
+        
+        if item_stats is not None:
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.metric("Total Orders", int(item_stats['Total_Orders']))
+            with col2:
+                st.metric("Total Quantity", f"{item_stats['quantity']:.2f} kg")
+            with col3:
+                st.metric("Total Revenue", f"₹{item_stats['Amount']:,.0f}")
+            
+            st.divider()
+            
+            # One row per order containing the item
+            if len(customer_df) > 0:
+                st.subheader("👥 Customers Who Ordered This Item")
+                
+                st.dataframe(
+                    customer_df,
+                    column_config={
+                        'Quantity': st.column_config.NumberColumn(format="%.2f kg"),
+                        'Delivery Date': st.column_config.DateColumn(format="DD MMM YYYY"),
+                    },
+                    hide_index=True,
+                    use_container_width=True
+                )
+                
+                # Active vs Completed breakdown
+                active_count = int(item_stats['Active_Orders'])
+                
+                col1, col2 = st.columns(2)
+                with col1:
+                    st.metric("🔄 Active Orders", active_count)
+                with col2:
+                    st.metric("✅ Completed Orders", int(item_stats['Total_Orders']) - active_count)
+            else:
+                st.info("No customers found for this item")
+        else:
+            st.warning("This item hasn't been ordered yet")
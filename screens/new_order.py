@@ -0,0 +1,17 @@
+"""New Order: the order form for a new Active order."""
+from datetime import date
+
+import pandas as pd
+import streamlit as st
+
+from screens.common import order_form
+
+
+def render(ctx):
+    st.title("➕ New Order")
+    
+    submitted = order_form(ctx, "new_order")
+    if submitted:
+        fields, lines = submitted
+        order_id = ctx.book.create_order({**fields, 'Status': 'Active', 'Order_Date': pd.Timestamp(date.today())}, lines)
+        st.success(f"✅ Order #{order_id} saved for {fields['Customer_Name']}")
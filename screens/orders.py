@@ -0,0 +1,117 @@
+"""All Orders: active and completed orders, a page at a time, with edit and payment forms."""
+from datetime import date
+
+import streamlit as st
+
+from order_index import order_index
+from screens.common import PAGE_SIZES, PAYMENT_OPTIONS, order_form, page_of, payment_form, show_order_items
+
+
+def render(ctx):
+    snapshot = ctx.snapshot
+    orders_df, order_items_df = snapshot.orders_df, snapshot.order_items_df
+    
+    st.title("📋 All Orders")
+    
+    index = order_index(snapshot.version, orders_df, order_items_df)
+    
+    # Filters apply to both tabs
+    col1, col2, col3, col4 = st.columns([2, 1, 2, 1])
+    with col1:
+        search = st.text_input("🔎 Customer", placeholder="Search by name")
+    with col2:
+        payment_filter = st.selectbox("💳 Payment", ["All"] + PAYMENT_OPTIONS)
+    with col3:
+        date_range = st.date_input("📅 Delivery between", value=(), format="DD/MM/YYYY")
+    with col4:
+        page_size = st.selectbox("Per page", PAGE_SIZES, index=1)
+    
+    filters = {
+        'customer': search.strip() or None,
+        'payment': None if payment_filter == "All" else payment_filter,
+        'delivery_from': date_range[0] if len(date_range) > 0 else None,
+        'delivery_to': date_range[-1] if len(date_range) > 0 else None,
+    }
+    
+    tab1, tab2 = st.tabs(["🔄 Active Orders", "✅ Completed Orders"])
+    
+    with tab1:
+        active_orders = page_of(ctx, index, 'Active', page_size, "active_page", **filters)
+        
+        if len(active_orders) > 0:
+            for _, order in active_orders.iterrows():
+                order_total = order['Total']
+                delivery = order['Delivery_Date'].date()
+                days_left = (delivery - date.today()).days
+                
+                if days_left < 0:
+                    date_color = "🔴"
+                    date_text = f"OVERDUE by {abs(days_left)} days"
+                elif days_left == 0:
+                    date_color = "🟠"
+                    date_text = "TODAY"
+                elif days_left == 1:
+                    date_color = "🟡"
+                    date_text = "TOMORROW"
+                else:
+                    date_color = "🟢"
+                    date_text = f"in {days_left} days"
+                
+                with st.expander(f"{date_color} {order['Customer_Name']} - {date_text} - ₹{order_total:,.0f}"):
+                    col1, col2 = st.columns([2, 1])
+                    
+                    with col1:
+                        st.write(f"**📱 Phone:** {order['Phone'] if order['Phone'] else 'N/A'}")
+                        st.write(f"**📍 Address:** {order['Address']}")
+                        st.write(f"**📅 Delivery:** {delivery.strftime('%d %b %Y')}")
+                        st.write(f"**💳 Payment:** {order['Payment']}")
+                        if order['Notes']:
+                            st.write(f"**📝 Notes:** {order['Notes']}")
+                    
+                    with col2:
+                        # Edit button
+                        edit_key = f"editing_{order['Order_ID']}"
+                        if st.button("✏️ Edit", key=f"edit_{order['Order_ID']}", use_container_width=True):
+                            st.session_state[edit_key] = not st.session_state.get(edit_key, False)
+                        if st.button("✅ Mark Completed", key=f"complete_{order['Order_ID']}", use_container_width=True):
+                            ctx.book.set_status(order['Order_ID'], 'Completed')
+                            st.rerun()
+                        st.metric("Order Total", f"₹{order_total:,.2f}")
+                        payment_form(ctx, order['Order_ID'])
+                    
+                    if st.session_state.get(edit_key, False):
+                        items = index.lines(order['Order_ID'])
+                        submitted = order_form(ctx, f"edit_form_{order['Order_ID']}", order, items)
+                        if submitted:
+                            fields, lines = submitted
+                            ctx.book.update_order(order['Order_ID'], fields, lines)
+                            st.session_state[edit_key] = False
+                            st.rerun()
+                    
+                    st.divider()
+                    
+                    # Order items
+                    show_order_items(index, order['Order_ID'])
+                    
+                    st.markdown(f"### **Total: ₹{order_total:,.2f}**")
+        else:
+            st.info("No active orders found!")
+    
+    with tab2:
+        completed_orders = page_of(ctx, index, 'Completed', page_size, "completed_page", descending=True, **filters)
+        
+        if len(completed_orders) > 0:
+            for _, order in completed_orders.iterrows():
+                order_total = order['Total']
+                delivery = order['Delivery_Date'].date()
+                
+                with st.expander(f"✅ {order['Customer_Name']} - {delivery.strftime('%d %b %Y')} - ₹{order_total:,.0f}"):
+                    st.write(f"**📱 Phone:** {order['Phone'] if order['Phone'] else 'N/A'}")
+                    st.write(f"**💳 Payment:** {order['Payment']}")
+                    
+                    show_order_items(index, order['Order_ID'])
+                    payment_form(ctx, order['Order_ID'])
+                    
+                    st.markdown(f"### **Total: ₹{order_total:,.2f}**")
+        else:
+            st.info("No completed orders found!")
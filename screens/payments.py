@@ -0,0 +1,56 @@
+"""Payments: receivables by age, reminder messages and recent payments."""
+from datetime import date
+
+import pandas as pd
+import streamlit as st
+
+from payments import receivables, reminders
+
+
+def render(ctx):
+    snapshot = ctx.snapshot
+    orders_df, order_summary_df = snapshot.orders_df, snapshot.summary
+    
+    st.title("💳 Payments & Receivables")
+    
+    today = pd.Timestamp(date.today())
+    dues = receivables(f"{snapshot.version}|{today:%Y-%m-%d}", orders_df, order_summary_df, today)
+    aging_columns = [column for column in dues.columns if column.endswith('days')]
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("⚠️ Outstanding", f"₹{dues['Outstanding'].sum():,.0f}")
+    with col2:
+        st.metric("👥 Customers with Dues", len(dues))
+    with col3:
+        st.metric("💰 Received", f"₹{snapshot.payments_df['Amount'].sum():,.0f}")
+    
+    if dues.empty:
+        st.success("Nothing outstanding")
+    else:
+        st.subheader("⏳ Aging")
+        st.bar_chart(dues[aging_columns].sum())
+        st.dataframe(dues, hide_index=True, use_container_width=True,
+                     column_config={column: st.column_config.NumberColumn(format="₹%.0f")
+                                    for column in ['Outstanding'] + aging_columns}
+                     | {'Oldest_Delivery': st.column_config.DateColumn(format="DD MMM YYYY")})
+        
+        st.subheader("📨 Reminders")
+        messages = reminders(f"{snapshot.version}|{today:%Y-%m-%d}", dues, orders_df, order_summary_df, today)
+        st.download_button("⬇️ Reminder messages (CSV)", messages.to_csv(index=False),
+                           file_name=f"reminders_{today:%Y%m%d}.csv", mime="text/csv")
+        st.dataframe(messages.head(50), hide_index=True, use_container_width=True,
+                     column_config={'Outstanding': st.column_config.NumberColumn(format="₹%.0f"),
+                                    'WhatsApp': st.column_config.LinkColumn(display_text="Open")})
+    
+    st.divider()
+    
+    st.subheader("🧾 Recent Payments")
+    recent = snapshot.payments_df.tail(50).iloc[::-1]
+    if recent.empty:
+        st.info("No payments recorded yet")
+    else:
+        recent = recent.merge(orders_df[['Order_ID', 'Customer_Name']], on='Order_ID', how='left')
+        st.dataframe(recent[['Paid_At', 'Order_ID', 'Customer_Name', 'Amount', 'Method', 'Note']],
+                     hide_index=True, use_container_width=True,
+                     column_config={'Amount': st.column_config.NumberColumn(format="₹%.0f")})
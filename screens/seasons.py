@@ -0,0 +1,62 @@
+"""Seasons: comparison with archived seasons, archiving and starting a new season."""
+from datetime import date
+
+import streamlit as st
+
+from archive import (SeasonArchive, item_demand_growth, repeat_customers, revenue_by_season, season_lines,
+                     season_of)
+from settings import ARCHIVE_PATH
+
+
+@st.cache_resource
+def get_archive():
+    return SeasonArchive(ARCHIVE_PATH)
+
+
+def render(ctx):
+    snapshot = ctx.snapshot
+    orders_df, order_items_df = snapshot.orders_df, snapshot.order_items_df
+    
+    st.title("📚 Season Comparison")
+    
+    # History is only read here, never on the everyday load path
+    archive = get_archive()
+    seasons = season_of(orders_df['Delivery_Date']).dropna()
+    live_season = seasons.max() if len(seasons) else str(date.today().year)
+    archived = archive.seasons()
+    st.caption(f"Live season: {live_season} · Archived: {', '.join(archived) if archived else 'none'}")
+    
+    lines = season_lines(f"{archive.version()}|{snapshot.version}", archive, live_season, orders_df, order_items_df)
+    
+    if lines['Season'].nunique() < 2:
+        st.info("Archive at least one earlier season to compare seasons")
+    else:
+        st.subheader("💰 Revenue by Season")
+        revenue = revenue_by_season(lines)
+        st.dataframe(revenue.style.format({'Revenue': '₹{:,.0f}', 'Revenue_Growth': '{:+.0%}'}, na_rep="—"),
+                     use_container_width=True)
+        st.bar_chart(revenue['Revenue'])
+        
+        st.subheader("🔁 Repeat Customers")
+        st.dataframe(repeat_customers(lines).style.format({'Repeat_Rate': '{:.0%}'}), use_container_width=True)
+        
+        st.subheader("📦 Item Demand by Season (kg)")
+        growth = item_demand_growth(lines)
+        st.dataframe(growth.style.format('{:.2f}').format({'Growth': '{:+.0%}'}, na_rep="—"),
+                     use_container_width=True)
+    
+    st.divider()
+    
+    st.subheader("🗄️ Archive")
+    if st.button("🗄️ Archive live orders"):
+        written = archive.archive_store(ctx.store)
+        ctx.book.sync()
+        st.success(f"Archived seasons: {', '.join(written)}")
+    
+    start_new = st.checkbox("I have archived the live orders and want to start a new season")
+    if st.button("🆕 Start New Season", disabled=not start_new):
+        archive.archive_store(ctx.store)
+        ctx.store.replace_all(ctx.store.load_items(), orders_df.iloc[0:0], order_items_df.iloc[0:0])  # also clears payments
+        # Written straight to the store, so the book reloads instead of waiting for its next check
+        ctx.book.sync()
+        st.rerun()
@@ -0,0 +1,33 @@
+"""Stock Analysis: stock against active demand and the production plan for shortages."""
+import streamlit as st
+
+from planner import stock_plan_from_rollup
+from views import stock_analysis_table
+
+
+def render(ctx):
+    snapshot = ctx.snapshot
+    items_df = snapshot.items_df
+    
+    st.title("📈 Stock vs Orders Analysis")
+    
+    plan = stock_plan_from_rollup(snapshot.version, items_df, snapshot.rollup)
+    analysis_df = stock_analysis_table(plan)
+    st.dataframe(analysis_df, hide_index=True, use_container_width=True)
+    
+    st.divider()
+    
+    # Production plan: kg that must be ready by each delivery day
+    shortages = plan.shortages
+    
+    if len(shortages) > 0:
+        st.subheader("🗓️ Production Plan (cumulative kg to prepare)")
+        schedule = plan.cumulative_to_prepare.loc[shortages.index]
+        schedule.columns = schedule.columns.strftime('%d %b')
+        st.dataframe(schedule.style.format('{:.2f}'), use_container_width=True)
+        
+        st.subheader("🛒 Shopping List - Items to Prepare/Purchase")
+        for item_name, item in shortages.iterrows():
+            st.write(f"- **{item_name}**: Need {abs(item['Difference']):.1f} kg (first needed {item['First_Short'].strftime('%d %b')})")
+    else:
+        st.success("✅ All items have sufficient stock for active orders!")
@@ -0,0 +1,184 @@
+"""Embedded CSV data used to seed an empty store on first run."""
+from io import StringIO
+
+import pandas as pd
+
+ITEMS_DATA = """Item_Name,Rate,Stock,Value
+Besan Laddu,580,10,5800
+Chakli,400,8,3200
+Shev (Masala),380,6.5,2470
+Shev(Thin),380,6,2280
+Shankarpade(Salty),380,4.75,1805
+Shankarpade(Sweet),380,1,380
+Chivda,290,10,2900
+Anarse,720,0,0
+Karanji (Pitthi),540,0,0
+Karanji (Ola Naral),540,0,0
+Rava Laddu,400,1,400"""
+
+ORDERS_DATA = """Order_ID,Customer_Name,Phone,Address,Delivery_Date,Status,Payment,Order_Date,Notes
+1,Pradnya Ingle,,Amravati,10/8/2025,Completed,Paid,10/6/2025,
+2,Dhakulkar Sir,,Amravati,10/8/2025,Completed,Paid,10/6/2025,
+3,Jagdale Madam,,Amravati,10/9/2025,Completed,Paid,10/7/2025,
+4,Bhagat Sir,,Amravati,10/11/2025,Completed,Paid,10/8/2025,
+5,Raja Bhau,,Amravati,10/16/2025,Completed,Paid,10/10/2025,
+6,Rani Bhonde,,Amravati,10/16/2025,Completed,Paid,10/10/2025,
+7,Katle Sister,,Amravati,10/20/2025,Active,Pending,10/17/2025,
+8,Bhatkar,,Amravati,10/20/2025,Active,Pending,10/17/2025,
+9,Harne,,Amravati,10/20/2025,Active,Pending,10/17/2025,
+10,Vanita Bai,,Amravati,10/17/2025,Completed,Paid,10/12/2025,
+11,Jadhav Madam,,Amravati,10/17/2025,Completed,Paid,10/15/2025,
+12,Bapat,,Amravati,10/17/2025,Completed,Paid,10/16/2025,
+13,Wavage Saheb,,Amravati,10/20/2025,Active,Pending,10/11/2025,
+14,Thakur Saheb,,Amravati,10/20/2025,Active,Pending,10/11/2025,
+15,Meenal Thakare Madam,,Amravati,10/20/2025,Active,Pending,10/11/2025,
+16,Wadve Sir,,Amravati,10/17/2025,Completed,Pending,10/11/2025,
+17,Pradnya Madam Ingle,,Amravati,10/17/2025,Completed,Pending,10/11/2025,
+18,Ambore Madam,,Amravati,10/18/2025,Active,Pending,10/11/2025,
+19,Kate Sir,,Amravati,10/18/2025,Completed,Pending,10/11/2025,
+20,Girase Madam,,Amravati,10/19/2025,Active,Pending,10/11/2025,
+21,Sonal Pachange,,Amravati,10/17/2025,Completed,Pending,10/11/2025,
+22,Thoke Sir,,Amravati,10/19/2025,Active,Pending,10/11/2025,
+23,Sunil Bhau Bhonde,,Amravati,10/19/2025,Active,Pending,10/11/2025,
+24,Yogesh Bhau,,Amravati,10/19/2025,Active,Pending,10/11/2025,
+25,Pradnya Madam Ingle(Friend),,Amravati,10/17/2025,Completed,Pending,10/11/2025,
+26,Yeole Madam,,Amravati,10/18/2025,Completed,Pending,10/11/2025,
+27,Anagha Ronghe,,Amravati,10/19/2025,Active,Pending,10/11/2025,
+28,Sonam Savde,,Amravati,10/19/2025,Active,Pending,10/11/2025,
+29,Sunanda Kaldate,,Amravati,10/19/2025,Active,Pending,10/11/2025,
+30,Snehal Ingle,,Amravati,10/19/2025,Active,Pending,10/11/2025,
+31,Minakshi Bole,,Amravati,10/19/2025,Active,Pending,10/11/2025
+32,Patil Kaku,,Amravati,10/18/2025,Active,Pending,10/12/2025"""
+
+ORDER_ITEMS_DATA = """Order_ID,Item_Name,quantity,rate,Amount
+1,Shev (Masala),0.25,380,95
+1,Shev(Thin),0.125,380,47.5
+1,Shankarpade(Salty),0.25,380,95
+2,Shankarpade(Salty),0.5,380,190
+2,Chakli,0.5,400,200
+3,Chivda,0.25,290,72.5
+3,Shev (Masala),0.25,380,95
+3,Chakli,0.25,400,100
+3,Besan Laddu,0.5,580,290
+4,Shev (Masala),0.5,380,190
+4,Shev(Thin),0.5,380,190
+4,Shankarpade(Sweet),0.5,380,190
+4,Chakli,0.5,400,200
+5,Chivda,2,290,580
+5,Shev(Thin),1,380,380
+5,Shev (Masala),1,380,380
+5,Chakli,1,400,400
+5,Besan Laddu,1,580,580
+5,Shankarpade(Salty),1,380,380
+5,Shankarpade(Sweet),0.5,380,190
+6,Rani Bhonde,2,580,1160
+6,Rani Bhonde,0.5,380,190
+7,Besan Laddu,0.5,580,290
+7,Shankarpade(Salty),0.5,380,190
+8,Besan Laddu,0.5,580,290
+9,Chakli,0.5,400,200
+9,Shankarpade(Salty),0.5,380,190
+9,Chivda,0.5,290,145
+9,Karanji (Ola Naral),0.5,540,270
+10,Shev (Masala),0.5,380,190
+11,Besan Laddu,0.5,580,290
+11,Karanji (Ola Naral),0.5,540,270
+12,Shev (Masala),0.25,380,95
+12,Shev(Thin),0.25,380,95
+12,Chakli,0.25,400,100
+12,Shankarpade(Salty),0.25,380,95
+12,Shankarpade(Sweet),0.25,380,95
+13,Besan Laddu,1,580,580
+14,Besan Laddu,0.5,580,290
+15,Shev (Masala),2,380,760
+15,Shev(Thin),0.5,380,190
+15,Besan Laddu,2,580,1160
+15,Shankarpade(Salty),1,380,380
+15,Karanji (Ola Naral),1.5,540,810
+16,Shev (Masala),0.5,380,190
+16,Shev(Thin),0.5,380,190
+16,Karanji (Pitthi),0.5,540,270
+16,Shankarpade(Salty),0.5,380,190
+16,Besan Laddu,0.5,580,290
+17,Besan Laddu,1,580,580
+17,Shev (Masala),0.5,380,190
+17,Shev(Thin),1,380,380
+17,Shankarpade(Sweet),0.5,380,190
+17,Shankarpade(Salty),0.5,380,190
+17,Chakli,0.5,400,200
+18,Chakli,1.5,400,600
+18,Besan Laddu,0.5,580,290
+18,Rava Laddu,0.5,400,200
+18,Shev (Masala),0.5,380,190
+18,Shankarpade(Salty),0.5,380,190
+18,Karanji (Pitthi),0.5,540,270
+18,Anarse,0.25,760,190
+19,Besan Laddu,0.5,580,290
+19,Shankarpade(Salty),0.5,380,190
+19,Shev(Thin),0.25,380,95
+20,Shev (Masala),1,380,380
+20,Karanji (Ola Naral),0.5,540,270
+20,Chivda,1,290,290
+20,Karanji (Pitthi),0.5,540,270
+21,Chivda,1,290,290
+21,Shankarpade(Sweet),1,380,380
+21,Chakli,0.5,400,200
+21,Karanji,0.5,540,270
+22,Chakli,0.5,400,200
+22,Chivda,0.5,145,72.5
+22,Shankarpade(Sweet),0.5,380,190
+22,Karanji (Ola Naral),0.5,540,270
+22,Shev (Masala),0.5,380,190
+22,Anarse,0.5,760,380
+23,Besan Laddu,1,580,580
+24,Chakli,0.5,400,200
+24,Besan Laddu,0.5,580,290
+25,Besan Laddu,0.5,580,290
+25,Shev(Thin),0.5,380,190
+26,Chakli,2,400,800
+26,Chivda,2,290,580
+26,Shev (Masala),2,380,760
+26,Shankarpade(Sweet),2,380,760
+27,Besan Laddu,0.5,580,290
+27,Chakli,0.5,400,200
+27,Chivda,0.5,290,145
+27,Karanji,0.25,540,135
+27,Shev(Thin),0.5,380,190
+27,Shankarpade(Sweet),0.5,380,190
+28,Besan Laddu,1,580,580
+28,Chakli,1,400,400
+28,Chivda,1,290,290
+28,Karanji (Ola Naral),1,540,540
+28,Shankarpade(Sweet),1,380,380
+28,Shev (Masala),1,380,380
+29,Chivda,0.5,290,145
+29,Shev (Masala),0.5,380,190
+29,Shev(Thin),0.5,380,190
+29,Chakli,1,400,400
+29,Shankarpade(Salty),0.5,380,190
+29,Karanji (Pitthi),1,540,540
+30,Chivda,0.5,290,145
+30,Chakli,0.5,400,200
+30,Shev (Masala),0.5,380,190
+30,Karanji (Pitthi),0.5,540,270
+30,Shankarpade(Salty),0.5,380,190
+31,Shev (Masala),0.5,380,190
+31,Shev(Thin),0.5,380,190
+31,Shankarpade(Salty),0.5,380,190
+31,Shankarpade(Sweet),0.5,380,190
+31,Chakli,0.5,400,200
+31,Chivda,0.5,290,145
+32,Besan Laddu,0.5,580,290
+32,Karanji (Ola Naral),0.5,540,270"""
+
+
+def seed_frames():
+    items_df = pd.read_csv(StringIO(ITEMS_DATA))
+    orders_df = pd.read_csv(StringIO(ORDERS_DATA))
+    order_items_df = pd.read_csv(StringIO(ORDER_ITEMS_DATA))
+    
+    # Convert dates
+    orders_df['Delivery_Date'] = pd.to_datetime(orders_df['Delivery_Date'], format='%m/%d/%Y')
+    orders_df['Order_Date'] = pd.to_datetime(orders_df['Order_Date'], format='%m/%d/%Y')
+    
+    return items_df, orders_df, order_items_df
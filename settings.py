@@ -0,0 +1,20 @@
+"""Deployment settings, read once per process from DIWALI_* environment variables."""
+import os
+
+# Storage backend; the embedded CSVs only seed an empty database
+STORE_BACKEND = os.environ.get("DIWALI_STORE", "sqlite")
+DB_PATH = os.environ.get("DIWALI_DB_PATH", "diwali_orders.db")
+AUTO_REPAIR = os.environ.get("DIWALI_AUTO_REPAIR") == "1"
+ARCHIVE_PATH = os.environ.get("DIWALI_ARCHIVE_PATH", "archive")
+# Directory for the order book snapshot that warm-starts a restarted process; empty disables it
+SNAPSHOT_PATH = os.environ.get("DIWALI_SNAPSHOT_PATH", ".snapshots")
+# Seconds between background checks for outside writes; 0 syncs on every rerun instead
+REFRESH_SECONDS = float(os.environ.get("DIWALI_REFRESH_SECONDS", "5"))
+SELLER_NAME = os.environ.get("DIWALI_SELLER_NAME", "Diwali Snacks")
+# Invoice render processes for bulk exports; 0 picks one per core, up to four
+EXPORT_WORKERS = int(os.environ.get("DIWALI_EXPORT_WORKERS", "0"))
+# Port for the read-only JSON API served alongside the app; unset or 0 disables it
+API_PORT = int(os.environ.get("DIWALI_API_PORT") or 0)
+# The API has no authentication; set 0.0.0.0 only on a network you trust
+API_HOST = os.environ.get("DIWALI_API_HOST", "127.0.0.1")
+ADMIN = os.environ.get("DIWALI_ADMIN") == "1"
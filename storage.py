@@ -0,0 +1,720 @@
+"""Storage backends behind load_data().
+
+Every backend returns the same three DataFrames the app has always used
+(items, orders, order line items), plus the payments ledger, and exposes a
+version key that changes whenever the stored data changes, so derived
+tables can be cached against it.
+"""
+from contextlib import contextmanager
+import sqlite3
+import threading
+import time
+import uuid
+
+import pandas as pd
+
+ITEM_COLUMNS = ['Item_Name', 'Rate', 'Stock', 'Value']
+ORDER_COLUMNS = ['Order_ID', 'Customer_Name', 'Phone', 'Address', 'Delivery_Date',
+                 'Status', 'Payment', 'Order_Date', 'Notes']
+ORDER_ITEM_COLUMNS = ['Order_ID', 'Item_Name', 'quantity', 'rate', 'Amount']
+DATE_COLUMNS = ['Delivery_Date', 'Order_Date']
+# One row per payment received; an order may be paid in several parts
+PAYMENT_COLUMNS = ['Payment_ID', 'Order_ID', 'Amount', 'Method', 'Paid_At', 'Note']
+
+
+class Store:
+    """Interface shared by all storage backends."""
+
+    def version(self):
+        raise NotImplementedError
+
+    def is_empty(self):
+        raise NotImplementedError
+
+    def load_items(self):
+        raise NotImplementedError
+
+    def load_orders(self):
+        raise NotImplementedError
+
+    def load_order_items(self):
+        raise NotImplementedError
+
+    def load_payments(self, order_ids=None):
+        raise NotImplementedError
+
+    def replace_all(self, items_df, orders_df, order_items_df, payments_df=None):
+        raise NotImplementedError
+
+    def add_order(self, order, lines):
+        raise NotImplementedError
+
+    def update_orders(self, changes):
+        raise NotImplementedError
+
+    def replace_order_items(self, order_id, lines):
+        raise NotImplementedError
+
+    def append_orders(self, orders_df, order_items_df, ref_ids=None):
+        raise NotImplementedError
+
+    def add_payments(self, payments):
+        raise NotImplementedError
+
+    def load_all(self):
+        return self.load_items(), self.load_orders(), self.load_order_items()
+
+
+def seed_if_empty(store):
+    """One-time import of the embedded CSV data into a fresh SQLiteStore.
+
+    Starting a new season empties the orders table on purpose, so an empty
+    table alone does not mean fresh; the store remembers that it was seeded.
+    """
+    if store.is_seeded():
+        return
+    if store.is_empty():
+        from seed_data import seed_frames
+        store.replace_all(*seed_frames())
+    store.mark_seeded()
+
+
+def _to_sql_date(value):
+    if value is None or pd.isna(value):
+        return None
+    return pd.Timestamp(value).strftime('%Y-%m-%d')
+
+
+def _to_sql_timestamp(value):
+    return pd.Timestamp(value).strftime('%Y-%m-%d %H:%M:%S')
+
+
+def _payment_rows(payments):
+    """Payment dicts with Paid_At defaulting to now."""
+    now = pd.Timestamp.now().floor('s')
+    return [{**payment, 'Amount': float(payment['Amount']),
+             'Paid_At': pd.Timestamp(payment.get('Paid_At') or now)} for payment in payments]
+
+
+def _none_if_missing(value):
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return None
+    return value
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS items (
+    Item_Name TEXT PRIMARY KEY,
+    Rate REAL NOT NULL,
+    Stock REAL NOT NULL,
+    Value REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS orders (
+    Order_ID INTEGER PRIMARY KEY,
+    Customer_Name TEXT NOT NULL,
+    Phone TEXT,
+    Address TEXT,
+    Delivery_Date TEXT,
+    Status TEXT NOT NULL,
+    Payment TEXT NOT NULL,
+    Order_Date TEXT,
+    Notes TEXT
+);
+CREATE TABLE IF NOT EXISTS order_items (
+    Line_ID INTEGER PRIMARY KEY AUTOINCREMENT,
+    Order_ID INTEGER NOT NULL,
+    Item_Name TEXT NOT NULL,
+    quantity REAL NOT NULL,
+    rate REAL NOT NULL,
+    Amount REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS payments (
+    Payment_ID INTEGER PRIMARY KEY AUTOINCREMENT,
+    Order_ID INTEGER NOT NULL,
+    Amount REAL NOT NULL,
+    Method TEXT,
+    Paid_At TEXT NOT NULL,
+    Note TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_order_items_order ON order_items (Order_ID);
+CREATE INDEX IF NOT EXISTS idx_payments_order ON payments (Order_ID);
+-- Pages filter the OrderBook's in-memory tables, so these only slowed down writes
+DROP INDEX IF EXISTS idx_order_items_item;
+DROP INDEX IF EXISTS idx_orders_status;
+DROP INDEX IF EXISTS idx_orders_delivery;
+INSERT OR IGNORE INTO meta (key, value) VALUES ('version', '0');
+-- Databases from before the marker: one that has items was set up already
+INSERT OR IGNORE INTO meta (key, value) SELECT 'seeded', '1' WHERE EXISTS (SELECT 1 FROM items);
+"""
+
+# Every write to a data table bumps the version counter, including writes
+# made by other processes or by hand with the sqlite3 shell
+VERSION_TRIGGER = """
+CREATE TRIGGER IF NOT EXISTS bump_version_{table}_{op} AFTER {op} ON {table}
+FOR EACH ROW BEGIN
+    UPDATE meta SET value = CAST(value AS INTEGER) + 1 WHERE key = 'version';
+END;
+"""
+
+
+class SQLiteStore(Store):
+    """SQLite-backed store, indexed by Order_ID for the per-order writes."""
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+            for table in ('items', 'orders', 'order_items', 'payments'):
+                for op in ('INSERT', 'UPDATE', 'DELETE'):
+                    conn.executescript(VERSION_TRIGGER.format(table=table, op=op))
+            conn.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('instance', ?)",
+                         (uuid.uuid4().hex,))
+            self.instance = conn.execute(
+                "SELECT value FROM meta WHERE key = 'instance'").fetchone()[0]
+
+    def _connect(self):
+        # One connection per thread; Streamlit runs each session in its own thread
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def version(self):
+        row = self._connect().execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+        return f"sqlite:{self.instance}:{row[0]}"
+
+    def is_empty(self):
+        return self._connect().execute('SELECT COUNT(*) FROM orders').fetchone()[0] == 0
+
+    def is_seeded(self):
+        return self._connect().execute("SELECT 1 FROM meta WHERE key = 'seeded'").fetchone() is not None
+
+    def mark_seeded(self):
+        with self._write_lock, self._connect() as conn:
+            conn.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('seeded', '1')")
+
+    def _read(self, sql, params=()):
+        return pd.read_sql_query(sql, self._connect(), params=params)
+
+    def load_items(self):
+        return self._read(f"SELECT {', '.join(ITEM_COLUMNS)} FROM items ORDER BY rowid")
+
+    def load_orders(self):
+        orders_df = self._read(f"SELECT {', '.join(ORDER_COLUMNS)} FROM orders ORDER BY Order_ID")
+        for column in DATE_COLUMNS:
+            orders_df[column] = pd.to_datetime(orders_df[column], format='%Y-%m-%d')
+        return orders_df
+
+    def load_order_items(self):
+        return self._read(f"SELECT {', '.join(ORDER_ITEM_COLUMNS)} FROM order_items ORDER BY Line_ID")
+
+    def load_payments(self, order_ids=None):
+        clauses, params = [], []
+        if order_ids is not None:
+            order_ids = [int(order_id) for order_id in order_ids]
+            if not order_ids:
+                return pd.DataFrame(columns=PAYMENT_COLUMNS)
+            clauses.append(f"Order_ID IN ({', '.join('?' * len(order_ids))})")
+            params.extend(order_ids)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ''
+        payments_df = self._read(
+            f"SELECT {', '.join(PAYMENT_COLUMNS)} FROM payments{where} ORDER BY Payment_ID", params)
+        payments_df['Paid_At'] = pd.to_datetime(payments_df['Paid_At'], format='%Y-%m-%d %H:%M:%S')
+        return payments_df
+
+    def replace_all(self, items_df, orders_df, order_items_df, payments_df=None):
+        with self._write_lock, self._connect() as conn:
+            conn.execute('DELETE FROM payments')
+            conn.execute('DELETE FROM order_items')
+            conn.execute('DELETE FROM orders')
+            conn.execute('DELETE FROM items')
+            conn.executemany(
+                f"INSERT INTO items ({', '.join(ITEM_COLUMNS)}) VALUES (?, ?, ?, ?)",
+                items_df[ITEM_COLUMNS].itertuples(index=False, name=None))
+            conn.executemany(
+                f"INSERT INTO orders ({', '.join(ORDER_COLUMNS)}) VALUES ({', '.join('?' * len(ORDER_COLUMNS))})",
+                (self._order_row(order) for order in orders_df.to_dict('records')))
+            conn.executemany(
+                f"INSERT INTO order_items ({', '.join(ORDER_ITEM_COLUMNS)}) VALUES (?, ?, ?, ?, ?)",
+                order_items_df[ORDER_ITEM_COLUMNS].itertuples(index=False, name=None))
+            if payments_df is not None and len(payments_df):
+                self._insert_payments(conn, payments_df.to_dict('records'))
+
+    def add_payments(self, payments):
+        """Record payment dicts (Order_ID, Amount, Method, Paid_At, Note); return their Payment_IDs."""
+        with self._write_lock, self._connect() as conn:
+            return self._insert_payments(conn, _payment_rows(payments))
+
+    @staticmethod
+    def _insert_payments(conn, payments):
+        payment_ids = []
+        for payment in payments:
+            payment_id = _none_if_missing(payment.get('Payment_ID'))
+            cursor = conn.execute(
+                f"INSERT INTO payments ({', '.join(PAYMENT_COLUMNS)}) VALUES ({', '.join('?' * len(PAYMENT_COLUMNS))})",
+                (None if payment_id is None else int(payment_id), int(payment['Order_ID']), float(payment['Amount']),
+                 _none_if_missing(payment.get('Method')), _to_sql_timestamp(payment['Paid_At']),
+                 _none_if_missing(payment.get('Note'))))
+            payment_ids.append(cursor.lastrowid)
+        return payment_ids
+
+    def add_order(self, order, lines):
+        """Insert an order and its line items in one transaction, returning the new Order_ID."""
+        with self._write_lock, self._connect() as conn:
+            order = dict(order)
+            if order.get('Order_ID') is None:
+                order['Order_ID'] = conn.execute(
+                    'SELECT COALESCE(MAX(Order_ID), 0) + 1 FROM orders').fetchone()[0]
+            conn.execute(
+                f"INSERT INTO orders ({', '.join(ORDER_COLUMNS)}) VALUES ({', '.join('?' * len(ORDER_COLUMNS))})",
+                self._order_row(order))
+            self._insert_lines(conn, order['Order_ID'], lines)
+        return int(order['Order_ID'])
+
+    def replace_order_items(self, order_id, lines):
+        """Swap an order's line items for ``lines`` in one transaction."""
+        with self._write_lock, self._connect() as conn:
+            conn.execute('DELETE FROM order_items WHERE Order_ID = ?', (int(order_id),))
+            self._insert_lines(conn, order_id, lines)
+
+    def append_orders(self, orders_df, order_items_df, ref_ids=None):
+        """Bulk insert new orders and line items in one transaction.
+
+        Orders are keyed by a ``Ref`` column and get consecutive Order_IDs
+        here, under the write lock. Line items carry a ``Ref`` that names
+        either one of these orders or one already created (``ref_ids``).
+        Returns ``{Ref: Order_ID}`` for the new orders.
+        """
+        with self._write_lock, self._connect() as conn:
+            next_id = conn.execute('SELECT COALESCE(MAX(Order_ID), 0) + 1 FROM orders').fetchone()[0]
+            created = {ref: next_id + offset for offset, ref in enumerate(orders_df['Ref'])}
+            order_ids = {**(ref_ids or {}), **created}
+            conn.executemany(
+                f"INSERT INTO orders ({', '.join(ORDER_COLUMNS)}) VALUES ({', '.join('?' * len(ORDER_COLUMNS))})",
+                (self._order_row({**order, 'Order_ID': created[order['Ref']]})
+                 for order in orders_df.to_dict('records')))
+            conn.executemany(
+                f"INSERT INTO order_items ({', '.join(ORDER_ITEM_COLUMNS)}) VALUES (?, ?, ?, ?, ?)",
+                ((order_ids[line.Ref], line.Item_Name, float(line.quantity), float(line.rate), float(line.Amount))
+                 for line in order_items_df.itertuples(index=False)))
+        return created
+
+    @staticmethod
+    def _insert_lines(conn, order_id, lines):
+        conn.executemany(
+            f"INSERT INTO order_items ({', '.join(ORDER_ITEM_COLUMNS)}) VALUES (?, ?, ?, ?, ?)",
+            [(int(order_id), line['Item_Name'], line['quantity'], line['rate'], line['Amount'])
+             for line in lines])
+
+    def update_orders(self, changes):
+        """Apply ``{Order_ID: {column: value}}`` in one transaction."""
+        with self._write_lock, self._connect() as conn:
+            for order_id, fields in changes.items():
+                columns = [column for column in fields if column in ORDER_COLUMNS and column != 'Order_ID']
+                if len(columns) != len(fields):
+                    raise KeyError(f"Unknown order columns: {sorted(set(fields) - set(columns))}")
+                values = [_to_sql_date(fields[column]) if column in DATE_COLUMNS
+                          else _none_if_missing(fields[column]) for column in columns]
+                conn.execute(
+                    f"UPDATE orders SET {', '.join(f'{column} = ?' for column in columns)} WHERE Order_ID = ?",
+                    values + [int(order_id)])
+
+    @staticmethod
+    def _order_row(order):
+        row = []
+        for column in ORDER_COLUMNS:
+            value = order.get(column)
+            if column in DATE_COLUMNS:
+                value = _to_sql_date(value)
+            elif column == 'Order_ID':
+                value = int(value)
+            else:
+                value = _none_if_missing(value)
+            row.append(value)
+        return row
+
+
+def filter_orders(orders_df, status=None, payment=None, customer=None,
+                  delivery_from=None, delivery_to=None):
+    """Orders matching every filter that is given."""
+    mask = pd.Series(True, index=orders_df.index)
+    if status is not None:
+        mask &= orders_df['Status'] == status
+    if payment is not None:
+        mask &= orders_df['Payment'] == payment
+    if customer is not None:
+        mask &= orders_df['Customer_Name'] == customer
+    if delivery_from is not None:
+        mask &= orders_df['Delivery_Date'] >= pd.Timestamp(delivery_from).normalize()
+    if delivery_to is not None:
+        mask &= orders_df['Delivery_Date'] <= pd.Timestamp(delivery_to).normalize()
+    return orders_df[mask].reset_index(drop=True)
+
+
+def _column_letter(position):
+    letters = ''
+    position += 1
+    while position:
+        position, remainder = divmod(position - 1, 26)
+        letters = chr(ord('A') + remainder) + letters
+    return letters
+
+
+class PendingOrderUpdates:
+    """Coalesces order field changes so they are written in one batch.
+
+    Later changes to the same order and column replace earlier ones; nothing
+    reaches the store until the changes are taken.
+    """
+
+    def __init__(self):
+        self._changes = {}
+
+    def __len__(self):
+        return len(self._changes)
+
+    def set(self, order_id, **fields):
+        self._changes.setdefault(int(order_id), {}).update(fields)
+
+    def take(self):
+        """The coalesced ``{Order_ID: {column: value}}``, leaving nothing pending."""
+        changes, self._changes = self._changes, {}
+        return changes
+
+
+class GoogleSheetsStore(Store):
+    """Store backed by a Google Sheets spreadsheet with one worksheet per table.
+
+    All four worksheets (items, orders, line items, payments) are fetched with a single batched range read and
+    kept in memory as the cell values the API returned. The spreadsheet's last
+    update time is the version key; it is checked at most once every
+    ``check_interval`` seconds, and while it is unchanged reads are served
+    from the local copy without touching the API. Writes are sent as batched
+    value updates, never cell by cell, and applied to the local copy too, so
+    a write costs one request and the next read none. Writes made inside
+    ``batch()`` are held and sent together as one request.
+
+    ``spreadsheet`` is a ``gspread.Spreadsheet`` or any object with the same
+    ``values_*`` methods, so a local fake can stand in for the API.
+    """
+
+    SHEETS = {'items': 'Items', 'orders': 'Orders', 'order_items': 'Order_Items', 'payments': 'Payments'}
+    COLUMNS = {'items': ITEM_COLUMNS, 'orders': ORDER_COLUMNS, 'order_items': ORDER_ITEM_COLUMNS,
+               'payments': PAYMENT_COLUMNS}
+    DATE_FORMAT = '%m/%d/%Y'
+    TIMESTAMP_FORMAT = '%m/%d/%Y %H:%M:%S'
+    APPEND = {'valueInputOption': 'USER_ENTERED', 'insertDataOption': 'INSERT_ROWS'}
+
+    def __init__(self, spreadsheet, sheets=None, check_interval=30, clock=time.monotonic):
+        self.spreadsheet = spreadsheet
+        self.sheets = {**self.SHEETS, **(sheets or {})}
+        self.check_interval = check_interval
+        self._clock = clock
+        self._lock = threading.RLock()
+        self._revision = None
+        self._checked_at = None
+        # Cell values of each sheet as of _values_revision, with our own writes applied
+        self._values = None
+        self._values_revision = None
+        self._frames = {}
+        # Our writes since start; the update time alone may not move right after one
+        self._writes = 0
+        self._order_rows = {}
+        # Inside batch(): coalesced order fields and the other ranges to write, by range
+        self._pending = None
+        self._pending_ranges = {}
+
+    def _current_revision(self):
+        with self._lock:
+            now = self._clock()
+            if self._checked_at is None or now - self._checked_at >= self.check_interval:
+                getter = getattr(self.spreadsheet, 'get_lastUpdateTime', None)
+                self._revision = getter() if getter else self.spreadsheet.lastUpdateTime
+                self._checked_at = now
+            return self._revision
+
+    def version(self):
+        return f"sheets:{self.spreadsheet.id}:{self._current_revision()}:{self._writes}"
+
+    def _load(self):
+        with self._lock:
+            revision = self._current_revision()
+            if self._values is None or self._values_revision != revision:
+                self._values = self._fetch()
+                self._values_revision = revision
+                self._frames = {}
+            return tuple(self._frame_of(table) for table in self.COLUMNS)
+
+    def _fetch(self):
+        response = self.spreadsheet.values_batch_get(
+            [self.sheets[table] for table in self.COLUMNS],
+            params={'valueRenderOption': 'UNFORMATTED_VALUE',
+                    'dateTimeRenderOption': 'FORMATTED_STRING'})
+        return {table: value_range.get('values', [])
+                for table, value_range in zip(self.COLUMNS, response['valueRanges'])}
+
+    def _frame_of(self, table):
+        # Parsed on first use after a fetch or a write to that sheet
+        frame = self._frames.get(table)
+        if frame is None:
+            frame = self._frames[table] = self._parse(table, self._values[table])
+            if table == 'orders':
+                # Sheet row of each order (header is row 1) for targeted updates
+                self._order_rows = {int(order_id): position + 2
+                                    for position, order_id in enumerate(frame['Order_ID'])}
+        return frame
+
+    def _parse(self, table, values):
+        frame = self._frame(values, self.COLUMNS[table])
+        if table == 'items':
+            for column in ('Rate', 'Stock', 'Value'):
+                frame[column] = pd.to_numeric(frame[column]).fillna(0)
+        elif table == 'orders':
+            frame['Order_ID'] = pd.to_numeric(frame['Order_ID']).astype('int64')
+            for column in DATE_COLUMNS:
+                frame[column] = pd.to_datetime(frame[column], format=self.DATE_FORMAT)
+        elif table == 'order_items':
+            for column in ('quantity', 'rate', 'Amount'):
+                frame[column] = pd.to_numeric(frame[column]).fillna(0)
+            frame['Order_ID'] = pd.to_numeric(frame['Order_ID']).astype('int64')
+        else:
+            for column in ('Payment_ID', 'Order_ID'):
+                frame[column] = pd.to_numeric(frame[column]).astype('int64')
+            frame['Amount'] = pd.to_numeric(frame['Amount']).fillna(0)
+            frame['Paid_At'] = pd.to_datetime(frame['Paid_At'], format=self.TIMESTAMP_FORMAT)
+        return frame
+
+    @staticmethod
+    def _frame(values, columns):
+        if not values:
+            return pd.DataFrame(columns=columns)
+        header, rows = values[0], values[1:]
+        width = len(header)
+        rows = [list(row) + [None] * (width - len(row)) for row in rows if any(cell != '' for cell in row)]
+        frame = pd.DataFrame(rows, columns=header).replace('', None)
+        return frame.reindex(columns=columns)
+
+    def _wrote(self, *tables):
+        # The local copy already holds the write, so it stays valid for the current revision
+        for table in tables:
+            self._frames.pop(table, None)
+        self._writes += 1
+
+    def is_empty(self):
+        return self._load()[1].empty
+
+    def load_all(self):
+        return self._load()[:3]
+
+    def load_items(self):
+        return self._load()[0]
+
+    def load_orders(self):
+        return self._load()[1]
+
+    def load_order_items(self):
+        return self._load()[2]
+
+    def load_payments(self, order_ids=None):
+        payments_df = self._load()[3]
+        if order_ids is None:
+            return payments_df
+        return payments_df[payments_df['Order_ID'].isin([int(order_id) for order_id in order_ids])].reset_index(drop=True)
+
+    def _cell(self, column, value):
+        if column in DATE_COLUMNS:
+            return '' if value is None or pd.isna(value) else pd.Timestamp(value).strftime(self.DATE_FORMAT)
+        if column == 'Paid_At':
+            return pd.Timestamp(value).strftime(self.TIMESTAMP_FORMAT)
+        value = _none_if_missing(value)
+        if value is None:
+            return ''
+        return value.item() if hasattr(value, 'item') else value
+
+    def _rows(self, frame, columns):
+        return [[self._cell(column, record.get(column)) for column in columns]
+                for record in frame.to_dict('records')]
+
+    @contextmanager
+    def batch(self):
+        """Hold the order updates, line item rewrites and payments made in the block; send them as one request.
+
+        Reads inside the block already see the held writes. If the block
+        raises, nothing is sent and the local copy is dropped.
+        """
+        with self._lock:
+            if self._pending is not None:
+                yield self
+                return
+            self._pending = PendingOrderUpdates()
+            try:
+                yield self
+            except BaseException:
+                self._pending, self._pending_ranges = None, {}
+                self._values = None
+                self._writes += 1
+                raise
+            try:
+                self._send_pending()
+            except BaseException:
+                self._values = None
+                self._writes += 1
+                raise
+            finally:
+                self._pending = None
+
+    def _send_pending(self):
+        if self._pending is None:
+            return
+        data = self._order_cells(self._pending.take())
+        data += [{'range': name, 'values': values} for name, values in self._pending_ranges.items()]
+        self._pending_ranges = {}
+        if data:
+            self.spreadsheet.values_batch_update({'valueInputOption': 'USER_ENTERED', 'data': data})
+
+    def _order_cells(self, changes):
+        data = []
+        for order_id, fields in changes.items():
+            row = self._order_rows[int(order_id)]
+            for column, value in fields.items():
+                letter = _column_letter(ORDER_COLUMNS.index(column))
+                data.append({'range': f"{self.sheets['orders']}!{letter}{row}",
+                             'values': [[self._cell(column, value)]]})
+        return data
+
+    def _append(self, table, rows):
+        """Add ``rows`` after the last row of ``table``: held in a batch, else appended now."""
+        values = self._values[table]
+        if self._pending is not None:
+            self._pending_ranges[f"{self.sheets[table]}!A{len(values) + 1}"] = rows
+        else:
+            self.spreadsheet.values_append(self.sheets[table], self.APPEND, {'values': rows})
+        values.extend(rows)
+
+    def replace_all(self, items_df, orders_df, order_items_df, payments_df=None):
+        if payments_df is None:
+            payments_df = pd.DataFrame(columns=PAYMENT_COLUMNS)
+        frames = {'items': items_df, 'orders': orders_df, 'order_items': order_items_df, 'payments': payments_df}
+        values = {table: [columns] + self._rows(frames[table], columns) for table, columns in self.COLUMNS.items()}
+        with self._lock:
+            revision = self._current_revision()
+            self._send_pending()
+            self.spreadsheet.values_batch_clear(body={'ranges': [self.sheets[table] for table in self.COLUMNS]})
+            self.spreadsheet.values_batch_update({
+                'valueInputOption': 'USER_ENTERED',
+                'data': [{'range': f"{self.sheets[table]}!A1", 'values': values[table]} for table in self.COLUMNS],
+            })
+            self._values, self._values_revision = values, revision
+            self._wrote(*self.COLUMNS)
+
+    def add_order(self, order, lines):
+        """Append an order and its line items, returning the new Order_ID."""
+        with self._lock:
+            orders_df = self._load()[1]
+            order = dict(order)
+            if order.get('Order_ID') is None:
+                order['Order_ID'] = int(orders_df['Order_ID'].max()) + 1 if len(orders_df) else 1
+            lines = [{**line, 'Order_ID': order['Order_ID']} for line in lines]
+            self._send_pending()
+            self._append('orders', self._rows(pd.DataFrame([order]), ORDER_COLUMNS))
+            if lines:
+                self._append('order_items', self._rows(pd.DataFrame(lines), ORDER_ITEM_COLUMNS))
+            self._wrote('orders', 'order_items')
+        return int(order['Order_ID'])
+
+    def append_orders(self, orders_df, order_items_df, ref_ids=None):
+        """Append new orders and line items with one append per sheet; see SQLiteStore."""
+        with self._lock:
+            existing = self._load()[1]['Order_ID']
+            next_id = int(existing.max()) + 1 if len(existing) else 1
+            created = {ref: next_id + offset for offset, ref in enumerate(orders_df['Ref'])}
+            order_ids = {**(ref_ids or {}), **created}
+            orders = orders_df.assign(Order_ID=orders_df['Ref'].map(created))
+            lines = order_items_df.assign(Order_ID=order_items_df['Ref'].map(order_ids))
+            self._send_pending()
+            if len(orders):
+                self._append('orders', self._rows(orders, ORDER_COLUMNS))
+            if len(lines):
+                self._append('order_items', self._rows(lines, ORDER_ITEM_COLUMNS))
+            self._wrote('orders', 'order_items')
+        return created
+
+    def add_payments(self, payments):
+        """Append payment dicts with one append call; return their Payment_IDs."""
+        with self._lock:
+            existing = self._load()[3]['Payment_ID']
+            next_id = int(existing.max()) + 1 if len(existing) else 1
+            payments = [{**payment, 'Payment_ID': next_id + offset}
+                        for offset, payment in enumerate(_payment_rows(payments))]
+            if payments:
+                self._append('payments', self._rows(pd.DataFrame(payments), PAYMENT_COLUMNS))
+                self._wrote('payments')
+        return [payment['Payment_ID'] for payment in payments]
+
+    def update_orders(self, changes):
+        """Apply ``{Order_ID: {column: value}}`` in one batched update."""
+        with self._lock:
+            self._load()
+            for order_id, fields in changes.items():
+                if int(order_id) not in self._order_rows:
+                    raise KeyError(f"Order {order_id} not found in sheet {self.sheets['orders']!r}")
+                unknown = set(fields) - set(ORDER_COLUMNS[1:])
+                if unknown:
+                    raise KeyError(f"Unknown order columns: {sorted(unknown)}")
+            pending = self._pending if self._pending is not None else PendingOrderUpdates()
+            for order_id, fields in changes.items():
+                pending.set(order_id, **fields)
+                row = self._values['orders'][self._order_rows[int(order_id)] - 1]
+                for column, value in fields.items():
+                    position = ORDER_COLUMNS.index(column)
+                    row.extend([''] * (position + 1 - len(row)))
+                    row[position] = self._cell(column, value)
+            if pending is not self._pending and len(pending):
+                self.spreadsheet.values_batch_update(
+                    {'valueInputOption': 'USER_ENTERED', 'data': self._order_cells(pending.take())})
+            if changes:
+                self._wrote('orders')
+
+    def replace_order_items(self, order_id, lines):
+        """Rewrite the line items sheet with ``lines`` in place of the order's old ones.
+
+        Sheets has no row-level delete through the values API, so the whole
+        table is written back in one update, padded with blank rows where it
+        got shorter; blank rows are skipped on read.
+        """
+        with self._lock:
+            order_items_df = self._load()[2]
+            kept = order_items_df[order_items_df['Order_ID'] != int(order_id)]
+            added = pd.DataFrame([{**line, 'Order_ID': int(order_id)} for line in lines],
+                                 columns=ORDER_ITEM_COLUMNS)
+            rows = self._rows(kept, ORDER_ITEM_COLUMNS) + self._rows(added, ORDER_ITEM_COLUMNS)
+            rows += [[''] * len(ORDER_ITEM_COLUMNS)] * (len(self._values['order_items']) - 1 - len(rows))
+            values = [ORDER_ITEM_COLUMNS] + rows
+            name = f"{self.sheets['order_items']}!A1"
+            if self._pending is not None:
+                self._pending_ranges[name] = values
+            else:
+                self.spreadsheet.values_batch_update({'valueInputOption': 'USER_ENTERED',
+                                                      'data': [{'range': name, 'values': values}]})
+            self._values['order_items'] = [list(row) for row in values]
+            self._wrote('order_items')
+
+
+def open_spreadsheet(service_account_info, spreadsheet_url):
+    """Authorize a gspread client and open the spreadsheet by URL."""
+    import gspread
+    from google.oauth2.service_account import Credentials
+
+    scopes = ['https://www.googleapis.com/auth/spreadsheets',
+              'https://www.googleapis.com/auth/drive.readonly']
+    credentials = Credentials.from_service_account_info(service_account_info, scopes=scopes)
+    return gspread.authorize(credentials).open_by_url(spreadsheet_url)
@@ -0,0 +1,100 @@
+"""Seeded festival-scale data shaped like the real tables, for benchmarks.
+
+Demand is skewed the way the real season is: a few SKUs (laddu, chakli,
+chivda) take most of the orders, a minority of customers order repeatedly,
+and deliveries bunch up in the days just before Diwali.
+"""
+import numpy as np
+import pandas as pd
+
+from seed_data import seed_frames
+
+SCALES = {'1k': 1_000, '100k': 100_000, '1M': 1_000_000}
+DIWALI = pd.Timestamp('2025-10-20')
+LINES_PER_ORDER = 4.5
+QUANTITIES = np.array([0.25, 0.5, 1.0, 1.5, 2.0])
+QUANTITY_WEIGHTS = np.array([0.2, 0.4, 0.3, 0.05, 0.05])
+
+
+def _zipf_weights(n, exponent):
+    weights = 1.0 / np.arange(1, n + 1) ** exponent
+    return weights / weights.sum()
+
+
+def generate_tables(n_lines, seed=0, today=DIWALI - pd.Timedelta(days=3)):
+    """Return (items_df, orders_df, order_items_df) with about ``n_lines`` line items.
+
+    Columns and dtypes match what a store's load_all() returns. Orders due
+    before ``today`` are mostly completed and paid.
+    """
+    rng = np.random.default_rng(seed)
+    items_df = seed_frames()[0]
+    # More stock at scale so shortages stay a minority, as in a real season
+    items_df['Stock'] = items_df['Stock'] * max(1.0, n_lines / 120)
+    items_df['Value'] = items_df['Stock'] * items_df['Rate']
+
+    n_orders = max(1, int(n_lines / LINES_PER_ORDER))
+    n_customers = max(1, n_orders // 2)
+    customer_ids = rng.choice(n_customers, n_orders, p=_zipf_weights(n_customers, 0.6))
+    order_ids = np.arange(1, n_orders + 1)
+
+    # Deliveries over three weeks, peaking on the days before Diwali
+    offsets = np.clip(np.round(rng.normal(-3, 3, n_orders)), -18, 3).astype(int)
+    delivery = DIWALI + pd.to_timedelta(offsets, unit='D')
+    lead = pd.to_timedelta(rng.integers(1, 8, n_orders), unit='D')
+    done = (delivery < today) & (rng.random(n_orders) < 0.95)
+    paid = done & (rng.random(n_orders) < 0.9) | (~done & (rng.random(n_orders) < 0.2))
+
+    orders_df = pd.DataFrame({
+        'Order_ID': order_ids,
+        'Customer_Name': pd.Series([f"Customer {n}" for n in customer_ids], dtype=object),
+        'Phone': pd.Series([f"98{n:08d}" for n in customer_ids], dtype=object),
+        'Address': pd.Series(rng.choice(['Amravati', 'Badnera', 'Akola', 'Nagpur'], n_orders,
+                                        p=[0.85, 0.08, 0.05, 0.02]), dtype=object),
+        'Delivery_Date': delivery,
+        'Status': pd.Series(np.where(done, 'Completed', 'Active'), dtype=object),
+        'Payment': pd.Series(np.where(paid, 'Paid', 'Pending'), dtype=object),
+        'Order_Date': delivery - lead,
+        'Notes': None,
+    })
+
+    lines_per_order = 1 + rng.poisson(LINES_PER_ORDER - 1, n_orders)
+    line_order_ids = np.repeat(order_ids, lines_per_order)
+    n_total = len(line_order_ids)
+    picks = rng.choice(len(items_df), n_total, p=_zipf_weights(len(items_df), 1.1))
+    quantity = rng.choice(QUANTITIES, n_total, p=QUANTITY_WEIGHTS)
+    rate = items_df['Rate'].to_numpy()[picks].astype(float)
+    order_items_df = pd.DataFrame({
+        'Order_ID': line_order_ids,
+        'Item_Name': pd.Series(items_df['Item_Name'].to_numpy()[picks], dtype=object),
+        'quantity': quantity,
+        'rate': rate,
+        'Amount': quantity * rate,
+    })
+    return items_df, orders_df, order_items_df
+
+
+def generate_payments(orders_df, order_items_df, seed=0):
+    """A payments ledger for generated orders, like a store's load_payments().
+
+    Paid orders are settled in one or two payments; about a third of the
+    Pending ones have a part payment on record.
+    """
+    rng = np.random.default_rng(seed)
+    totals = order_items_df.groupby('Order_ID')['Amount'].sum().reindex(orders_df['Order_ID'], fill_value=0)
+    paid = (orders_df['Payment'] == 'Paid').to_numpy()
+    partial = ~paid & (rng.random(len(orders_df)) < 0.33)
+    split = paid & (rng.random(len(orders_df)) < 0.25)
+
+    first_share = np.where(split | partial, rng.choice([0.25, 0.5, 0.75], len(orders_df)), 1.0)
+    first = pd.DataFrame({'Order_ID': orders_df['Order_ID'].to_numpy(),
+                          'Amount': totals.to_numpy() * first_share,
+                          'Paid_At': orders_df['Order_Date'].to_numpy()})[paid | partial]
+    second = pd.DataFrame({'Order_ID': orders_df['Order_ID'].to_numpy(),
+                           'Amount': totals.to_numpy() * (1 - first_share),
+                           'Paid_At': orders_df['Delivery_Date'].to_numpy()})[split]
+    payments_df = pd.concat([first, second], ignore_index=True).sort_values('Paid_At', kind='stable')
+    payments_df.insert(0, 'Payment_ID', np.arange(1, len(payments_df) + 1))
+    payments_df['Method'] = pd.Series(rng.choice(['Cash', 'UPI'], len(payments_df), p=[0.4, 0.6]), dtype=object)
+    payments_df['Note'] = None
+    return payments_df.reset_index(drop=True)[['Payment_ID', 'Order_ID', 'Amount', 'Method', 'Paid_At', 'Note']]
@@ -0,0 +1,36 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+from fake_gspread import FakeSpreadsheet
+from seed_data import seed_frames
+from storage import GoogleSheetsStore
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture(params=[True, False], ids=['revision moves', 'revision stale'])
+def spreadsheet(request):
+    return FakeSpreadsheet(bump_on_write=request.param)
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+@pytest.fixture
+def store(spreadsheet, clock):
+    """A GoogleSheetsStore over a fake spreadsheet holding the seed data."""
+    store = GoogleSheetsStore(spreadsheet, check_interval=30, clock=clock)
+    store.replace_all(*seed_frames())
+    return store
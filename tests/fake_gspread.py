@@ -0,0 +1,61 @@
+"""In-memory stand-in for a ``gspread.Spreadsheet``, covering the calls GoogleSheetsStore makes."""
+import re
+
+
+class FakeSpreadsheet:
+    """Worksheets as lists of rows, with a count of every API call.
+
+    ``lastUpdateTime`` only moves when ``bump_on_write`` is set, because
+    real Sheets often reports the old time just after a write.
+    """
+
+    id = 'fake-spreadsheet'
+
+    def __init__(self, bump_on_write=True):
+        self.bump_on_write = bump_on_write
+        self.sheets = {}
+        self.revision = 0
+        self.calls = []
+
+    def touch(self):
+        """Simulate a write from somewhere else."""
+        self.revision += 1
+
+    def _wrote(self):
+        if self.bump_on_write:
+            self.revision += 1
+
+    def get_lastUpdateTime(self):
+        self.calls.append('lastUpdateTime')
+        return f"2025-10-01T00:00:{self.revision:02d}Z"
+
+    def values_batch_get(self, ranges, params=None):
+        self.calls.append('values_batch_get')
+        return {'valueRanges': [{'values': [list(row) for row in self.sheets.get(name, [])]} for name in ranges]}
+
+    def values_batch_clear(self, params=None, body=None):
+        self.calls.append('values_batch_clear')
+        for name in body['ranges']:
+            self.sheets[name] = []
+        self._wrote()
+
+    def values_batch_update(self, body):
+        self.calls.append('values_batch_update')
+        for data in body['data']:
+            name, cell = data['range'].split('!')
+            column_letters, row = re.fullmatch(r'([A-Z]+)(\d+)', cell).groups()
+            column = ord(column_letters) - ord('A')
+            rows = self.sheets.setdefault(name, [])
+            for offset, values in enumerate(data['values']):
+                index = int(row) - 1 + offset
+                while len(rows) <= index:
+                    rows.append([])
+                target = rows[index]
+                target.extend([''] * (column + len(values) - len(target)))
+                target[column:column + len(values)] = values
+        self._wrote()
+
+    def values_append(self, range_name, params, body):
+        self.calls.append('values_append')
+        self.sheets.setdefault(range_name, []).extend(list(row) for row in body['values'])
+        self._wrote()
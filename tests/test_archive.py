@@ -0,0 +1,23 @@
+import pandas as pd
+
+from archive import SeasonArchive, season_of
+from seed_data import seed_frames
+from storage import SQLiteStore
+
+
+def test_missing_delivery_dates_have_no_season():
+    seasons = season_of(pd.Series(pd.to_datetime(['2024-11-01', None, '2025-10-20'])))
+    assert seasons.isna().tolist() == [False, True, False]
+    assert seasons.max() == '2025'
+
+
+def test_orders_without_a_delivery_date_get_no_partition(tmp_path):
+    items_df, orders_df, order_items_df = seed_frames()
+    orders_df.loc[orders_df.index[0], 'Delivery_Date'] = pd.NaT
+    store = SQLiteStore(str(tmp_path / 'orders.db'))
+    store.replace_all(items_df, orders_df, order_items_df)
+    archive = SeasonArchive(str(tmp_path / 'archive'))
+    written = archive.archive_store(store)
+    assert written == archive.seasons()
+    assert all(season.isdigit() for season in written)
+    assert len(archive.read('orders')) == len(orders_df) - 1
@@ -0,0 +1,72 @@
+import gc
+import io
+import os
+import time
+
+from openpyxl import load_workbook
+
+from aggregates import build_order_summary
+from compact import compact_tables
+import exports
+from exports import ExportJob, invoice_jobs, remove_stale_exports, season_report
+from seed_data import seed_frames
+
+
+def tables():
+    # The seeded orders have no payment ledger; those marked Paid were paid in full
+    items_df, orders_df, order_items_df = compact_tables(*seed_frames())
+    return orders_df, order_items_df, build_order_summary(orders_df, order_items_df)
+
+
+def test_orders_marked_paid_without_payments_print_as_paid():
+    orders_df, order_items_df, summary = tables()
+    orders = orders_df[orders_df['Payment'] == 'Paid']
+    assert len(orders)
+    invoices = [order for batch in invoice_jobs(orders, order_items_df, summary) for order, _ in batch]
+    assert all(order['Paid'] == order['Total'] and order['Due'] == 0 for order in invoices)
+
+
+def test_season_report_paid_column_covers_the_total_of_paid_orders():
+    orders_df, order_items_df, summary = tables()
+    sheet = load_workbook(io.BytesIO(season_report(orders_df, order_items_df, summary)))['Orders']
+    header, *rows = sheet.iter_rows(values_only=True)
+    for row in map(dict, (zip(header, row) for row in rows)):
+        assert abs(row['Paid'] + row['Due'] - row['Total']) < 0.005
+        if row['Payment'] == 'Paid':
+            assert row['Due'] == 0
+
+
+def finished_job():
+    orders_df, order_items_df, summary = tables()
+    job = ExportJob(orders_df.head(3), order_items_df, summary, 'Seller').start()
+    assert job.wait(30) and job.error is None
+    return job
+
+
+def test_export_zip_is_deleted_with_its_job():
+    job = finished_job()
+    path = job.path
+    assert os.path.exists(path)
+    # What a session ending without another export leaves behind
+    del job
+    gc.collect()
+    assert not os.path.exists(path)
+
+
+def test_discarded_export_zip_is_deleted():
+    job = finished_job()
+    path = job.path
+    job.discard()
+    assert not os.path.exists(path) and job.path is None
+
+
+def test_stale_export_zips_are_removed(tmp_path, monkeypatch):
+    monkeypatch.setattr(exports.tempfile, 'gettempdir', lambda: str(tmp_path))
+    stale, fresh, other = (tmp_path / name for name in ('diwali_export_a.zip', 'diwali_export_b.zip', 'notes.zip'))
+    for path in (stale, fresh, other):
+        path.write_bytes(b'')
+    day_ago = time.time() - exports.STALE_EXPORT_SECONDS - 60
+    os.utime(stale, (day_ago, day_ago))
+    os.utime(other, (day_ago, day_ago))
+    remove_stale_exports()
+    assert not stale.exists() and fresh.exists() and other.exists()
@@ -0,0 +1,85 @@
+import io
+from datetime import datetime
+
+import pytest
+from openpyxl import Workbook
+
+from importer import import_orders
+from seed_data import seed_frames
+from storage import SQLiteStore
+
+COLUMNS = ['Customer_Name', 'Phone', 'Delivery_Date', 'Item_Name', 'quantity']
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = SQLiteStore(str(tmp_path / 'orders.db'))
+    items_df, orders_df, order_items_df = seed_frames()[:3]
+    store.replace_all(items_df, orders_df.iloc[0:0], order_items_df.iloc[0:0])
+    return store
+
+
+def csv_file(rows, columns=COLUMNS):
+    lines = [','.join(columns)] + [','.join(str(value) for value in row) for row in rows]
+    return io.BytesIO('\n'.join(lines).encode())
+
+
+def excel_file(rows, columns=COLUMNS):
+    workbook = Workbook()
+    workbook.active.append(columns)
+    for row in rows:
+        workbook.active.append(row)
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+    buffer.seek(0)
+    return buffer
+
+
+def run(store, file, filename='orders.csv', **options):
+    return import_orders(store, file, filename, store.load_items(), **options)
+
+
+@pytest.mark.parametrize('date_format', ['%m/%d/%Y', '%d/%m/%Y', '%Y-%m-%d'])
+def test_excel_date_cells_import_under_any_date_format(store, date_format):
+    rows = [['Meera', '98220', datetime(2025, 10, 20), 'Chakli', 1.5]]
+    result = run(store, excel_file(rows), 'orders.xlsx', date_format=date_format)
+    assert result.rows_rejected == 0
+    assert store.load_orders()['Delivery_Date'].tolist() == [datetime(2025, 10, 20)]
+
+
+def test_excel_text_dates_use_the_chosen_format(store):
+    rows = [['Meera', '98220', '20/10/2025', 'Chakli', 1.5]]
+    result = run(store, excel_file(rows), 'orders.xlsx', date_format='%d/%m/%Y')
+    assert result.rows_rejected == 0
+    assert store.load_orders()['Delivery_Date'].tolist() == [datetime(2025, 10, 20)]
+
+
+def test_rows_without_a_ref_are_grouped_by_customer(store):
+    columns = ['Order_Ref'] + COLUMNS
+    rows = [['A1', 'Anjali', '98221', '10/20/2025', 'Chakli', 1],
+            ['A1', 'Anjali', '98221', '10/20/2025', 'Besan Laddu', 1],
+            ['', 'Meera', '98220', '10/20/2025', 'Chakli', 2],
+            ['', 'Kavita', '98223', '10/20/2025', 'Chakli', 3],
+            ['', 'Meera', '98220', '10/20/2025', 'Besan Laddu', 0.5]]
+    result = run(store, csv_file(rows, columns))
+    assert result.orders_created == 3
+    orders_df = store.load_orders().set_index('Customer_Name')
+    lines = store.load_order_items()
+    quantities = {name: sorted(lines.loc[lines['Order_ID'] == orders_df.at[name, 'Order_ID'], 'quantity'])
+                  for name in orders_df.index}
+    assert quantities == {'Anjali': [1, 1], 'Meera': [0.5, 2], 'Kavita': [3]}
+
+
+def test_status_and_payment_are_normalised_or_rejected(store):
+    columns = COLUMNS + ['Status', 'Payment']
+    rows = [['Meera', '98220', '10/20/2025', 'Chakli', 1, 'completed', 'PAID'],
+            ['Kavita', '98223', '10/20/2025', 'Chakli', 1, '', ''],
+            ['Anjali', '98221', '10/20/2025', 'Chakli', 1, 'done', 'Paid'],
+            ['Sunita', '98224', '10/20/2025', 'Chakli', 1, 'Active', 'yes']]
+    result = run(store, csv_file(rows, columns))
+    assert result.rows_rejected == 2
+    report = result.error_report()
+    assert report[['Row', 'Column', 'Value']].values.tolist() == [[4, 'Status', 'done'], [5, 'Payment', 'yes']]
+    orders_df = store.load_orders().set_index('Customer_Name')
+    assert orders_df.loc[['Meera', 'Kavita'], ['Status', 'Payment']].values.tolist() == [
+        ['Completed', 'Paid'], ['Active', 'Pending']]
@@ -0,0 +1,43 @@
+import pandas as pd
+
+from compact import compact_tables
+from order_index import OrderIndex
+from seed_data import seed_frames
+
+
+def index_of(orders_df=None):
+    items_df, seeded_orders, order_items_df = seed_frames()[:3]
+    _, orders_df, order_items_df = compact_tables(items_df, seeded_orders if orders_df is None else orders_df,
+                                                  order_items_df)
+    return OrderIndex(orders_df, order_items_df)
+
+
+def customers(frame):
+    return set(frame['Customer_Name'].astype(str))
+
+
+def test_customer_filter_matches_word_prefixes():
+    index = index_of()
+    assert customers(index.query('Completed', customer='bhag')) == {'Bhagat Sir'}
+    assert customers(index.query('Completed', customer='RANI bh')) == {'Rani Bhonde'}
+    assert 'Rani Bhonde' not in customers(index.query('Completed', customer='honde'))
+
+
+def test_customer_filter_ignores_case_and_punctuation():
+    index = index_of()
+    assert customers(index.query('Completed', customer='  jagdale,  madam ')) == {'Jagdale Madam'}
+
+
+def test_customer_filter_combines_with_payment():
+    index = index_of()
+    assert index.query('Completed', customer='bhag', payment='Pending').empty
+
+
+def test_orders_without_a_customer_name_never_match():
+    orders_df = seed_frames()[1]
+    orders_df.loc[orders_df.index[0], 'Customer_Name'] = None
+    index = index_of(orders_df)
+    status = orders_df.loc[orders_df.index[0], 'Status']
+    unnamed = orders_df.loc[orders_df.index[0], 'Order_ID']
+    assert unnamed not in index.query(status, customer='a')['Order_ID'].tolist()
+    assert pd.isna(index.query(status).set_index('Order_ID').at[unnamed, 'Customer_Name'])
@@ -0,0 +1,72 @@
+from aggregates import memoize_by_version
+from book_cache import BookCache
+from orderbook import OrderBook
+
+
+@memoize_by_version()
+def paid_total(version, payments_df):
+    return float(payments_df['Amount'].sum())
+
+
+def first_order(book):
+    return book.orders_df['Order_ID'].iloc[0]
+
+
+def test_each_patch_gets_a_new_version(store):
+    book = OrderBook(store)
+    versions = {book.sync()}
+    for amount in (10.0, 20.0):
+        book.record_payment(first_order(book), amount, 'Cash')
+        assert book.version not in versions
+        versions.add(book.version)
+
+
+def test_views_memoized_by_version_see_the_patch(store):
+    book = OrderBook(store)
+    book.sync()
+    before = paid_total(book.version, book.payments_df)
+    book.record_payment(first_order(book), 10.0, 'Cash')
+    assert paid_total(book.version, book.payments_df) == before + 10.0
+
+
+def test_sync_after_a_patch_does_not_reload(store):
+    book = OrderBook(store)
+    book.sync()
+    book.record_payment(first_order(book), 10.0, 'Cash')
+    orders_df = book.orders_df
+    version = book.version
+    assert book.sync() == version
+    assert book.orders_df is orders_df
+
+
+def test_patched_snapshot_is_what_a_restart_loads(store, tmp_path):
+    book = OrderBook(store, BookCache(str(tmp_path)))
+    book.sync()
+    book.record_payment(first_order(book), 10.0, 'Cash')
+    book.persist()
+    restarted = OrderBook(store, BookCache(str(tmp_path)))
+    restarted.sync()
+    assert len(restarted.payments_df) == len(book.payments_df)
+
+
+def test_settling_payment_and_its_flag_are_one_request(store):
+    book = OrderBook(store)
+    book.sync()
+    pending = book.orders_df[book.orders_df['Payment'] == 'Pending']['Order_ID']
+    order_id = int(pending.iloc[0])
+    store.spreadsheet.calls.clear()
+    book.record_payment(order_id, float(book.summary.at[order_id, 'Total']), 'Cash')
+    assert store.spreadsheet.calls == ['values_batch_update']
+    assert book.orders_df.set_index('Order_ID').at[order_id, 'Payment'] == 'Paid'
+    assert store.load_orders().set_index('Order_ID').at[order_id, 'Payment'] == 'Paid'
+
+
+def test_edit_with_fields_and_lines_is_one_request(store):
+    book = OrderBook(store)
+    book.sync()
+    order_id = first_order(book)
+    store.spreadsheet.calls.clear()
+    book.update_order(order_id, {'Notes': 'ring twice'}, [{'Item_Name': 'Chakli', 'quantity': 2.0, 'rate': 400.0}])
+    assert store.spreadsheet.calls == ['values_batch_update']
+    lines = store.load_order_items()
+    assert list(lines.loc[lines['Order_ID'] == order_id, 'quantity']) == [2.0]
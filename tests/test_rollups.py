@@ -0,0 +1,47 @@
+import pandas as pd
+import pytest
+
+from orderbook import OrderBook
+from rollups import DailyRollup
+from seed_data import seed_frames
+from storage import SQLiteStore
+
+
+@pytest.fixture
+def book(tmp_path):
+    store = SQLiteStore(str(tmp_path / 'orders.db'))
+    store.replace_all(*seed_frames())
+    book = OrderBook(store)
+    book.sync()
+    return book
+
+
+def assert_matches_rebuild(book):
+    patched = book.rollup.frame().sort_index()
+    rebuilt = DailyRollup.build(book.orders_df, book.order_items_df).frame().sort_index()
+    pd.testing.assert_frame_equal(patched, rebuilt, check_dtype=False)
+
+
+def test_patched_rollup_equals_a_rebuild(book):
+    order_id = book.create_order(
+        {'Customer_Name': 'Asha', 'Phone': None, 'Address': 'Pune', 'Delivery_Date': pd.Timestamp('2025-10-20'),
+         'Status': 'Active', 'Payment': 'Pending', 'Order_Date': pd.Timestamp('2025-10-10'), 'Notes': None},
+        [{'Item_Name': 'Chakli', 'quantity': 1.0, 'rate': 400.0}])
+    book.set_status(order_id, 'Completed')
+    book.record_payment(order_id, 400.0, 'Cash')
+    book.update_order(order_id, {'Delivery_Date': pd.Timestamp('2025-10-21')},
+                      [{'Item_Name': 'Chakli', 'quantity': 2.0, 'rate': 400.0},
+                       {'Item_Name': 'Besan Laddu', 'quantity': 0.5, 'rate': 580.0}])
+    other = int(book.orders_df['Order_ID'].iloc[0])
+    book.update_order(other, lines=[{'Item_Name': 'Chakli', 'quantity': 0.25, 'rate': 400.0}])
+    assert_matches_rebuild(book)
+
+
+def test_orders_without_a_delivery_date_stay_out_of_the_rollup(book):
+    order_id = int(book.orders_df['Order_ID'].iloc[0])
+    book.update_order(order_id, {'Delivery_Date': None})
+    book.update_order(order_id, lines=[{'Item_Name': 'Chakli', 'quantity': 3.0, 'rate': 400.0}])
+    book.set_status(order_id, 'Completed')
+    assert_matches_rebuild(book)
+    book.update_order(order_id, {'Delivery_Date': pd.Timestamp('2025-10-22')})
+    assert_matches_rebuild(book)
@@ -0,0 +1,157 @@
+import pandas as pd
+import pytest
+
+from seed_data import seed_frames
+from storage import GoogleSheetsStore
+
+
+@pytest.fixture
+def reader(store, spreadsheet, clock):
+    """A second store over the same spreadsheet, e.g. in another process."""
+    return GoogleSheetsStore(spreadsheet, check_interval=30, clock=clock)
+
+
+def same_tables(store, reader):
+    for mine, theirs in zip(store.load_all() + (store.load_payments(),), reader.load_all() + (reader.load_payments(),)):
+        pd.testing.assert_frame_equal(mine.reset_index(drop=True), theirs.reset_index(drop=True))
+
+
+def line(item='Chakli', quantity=1.0, rate=400.0):
+    return {'Item_Name': item, 'quantity': quantity, 'rate': rate, 'Amount': quantity * rate}
+
+
+def new_order(name):
+    return {'Order_ID': None, 'Customer_Name': name, 'Phone': None, 'Address': 'Pune',
+            'Delivery_Date': pd.Timestamp('2025-10-20'), 'Status': 'Active', 'Payment': 'Pending',
+            'Order_Date': pd.Timestamp('2025-10-10'), 'Notes': None}
+
+
+def test_seeded_tables_are_read_back(reader):
+    items_df, orders_df, order_items_df = seed_frames()[:3]
+    assert len(reader.load_items()) == len(items_df)
+    assert len(reader.load_orders()) == len(orders_df)
+    assert len(reader.load_order_items()) == len(order_items_df)
+
+
+def test_one_batched_read_for_all_sheets(reader, spreadsheet):
+    spreadsheet.calls.clear()
+    reader.load_all()
+    reader.load_payments()
+    assert spreadsheet.calls.count('values_batch_get') == 1
+
+
+def test_unchanged_spreadsheet_is_served_from_cache(reader, spreadsheet, clock):
+    reader.load_all()
+    spreadsheet.calls.clear()
+    reader.load_orders()
+    assert spreadsheet.calls == []
+    clock.now += 60
+    reader.load_orders()
+    assert spreadsheet.calls == ['lastUpdateTime']
+
+
+def test_outside_writes_are_seen_after_the_check_interval(store, spreadsheet, clock):
+    version = store.version()
+    spreadsheet.touch()
+    assert store.version() == version
+    clock.now += 60
+    assert store.version() != version
+    spreadsheet.calls.clear()
+    store.load_orders()
+    assert spreadsheet.calls == ['values_batch_get']
+
+
+def test_consecutive_orders_get_distinct_ids(store):
+    first = store.add_order(new_order('Asha'), [line()])
+    second = store.add_order(new_order('Meera'), [line('Shankarpali', 0.5, 300.0)])
+    assert second == first + 1
+    orders = store.load_orders().set_index('Order_ID')
+    assert orders.loc[first, 'Customer_Name'] == 'Asha'
+    assert orders.loc[second, 'Customer_Name'] == 'Meera'
+    lines = store.load_order_items()
+    assert list(lines.loc[lines['Order_ID'] == second, 'Item_Name']) == ['Shankarpali']
+
+
+def test_order_updates_are_one_batched_call(store, spreadsheet):
+    order_ids = list(store.load_orders()['Order_ID'][:3])
+    spreadsheet.calls.clear()
+    store.update_orders({order_id: {'Status': 'Completed', 'Payment': 'Paid'} for order_id in order_ids})
+    assert spreadsheet.calls.count('values_batch_update') == 1
+    orders = store.load_orders().set_index('Order_ID').loc[order_ids]
+    assert (orders['Status'] == 'Completed').all()
+    assert (orders['Payment'] == 'Paid').all()
+
+
+def test_replaced_line_items_are_visible_immediately(store):
+    order_id = int(store.load_orders()['Order_ID'].iloc[0])
+    store.replace_order_items(order_id, [line('Chakli', 2.0, 400.0)])
+    lines = store.load_order_items()
+    assert list(lines.loc[lines['Order_ID'] == order_id, 'quantity']) == [2.0]
+
+
+def test_payments_get_consecutive_ids(store):
+    order_id = int(store.load_orders()['Order_ID'].iloc[0])
+    first = store.add_payments([{'Order_ID': order_id, 'Amount': 100.0, 'Method': 'UPI',
+                                 'Paid_At': pd.Timestamp('2025-10-12 10:00'), 'Note': None}])
+    second = store.add_payments([{'Order_ID': order_id, 'Amount': 50.0, 'Method': 'Cash',
+                                  'Paid_At': pd.Timestamp('2025-10-12 11:00'), 'Note': None}])
+    assert second == [first[0] + 1]
+    assert list(store.load_payments([order_id])['Amount']) == [100.0, 50.0]
+
+
+def test_each_write_is_one_request_and_reads_stay_local(store, reader, spreadsheet):
+    order_ids = list(store.load_orders()['Order_ID'][:3])
+    spreadsheet.calls.clear()
+    for order_id in order_ids:
+        store.update_orders({order_id: {'Status': 'Completed'}})
+        assert (store.load_orders().set_index('Order_ID').loc[order_id, 'Status']) == 'Completed'
+    store.add_payments([{'Order_ID': order_ids[0], 'Amount': 100.0, 'Method': 'UPI', 'Note': None}])
+    store.add_order(new_order('Asha'), [line()])
+    store.replace_order_items(order_ids[1], [line('Chakli', 2.0, 400.0)])
+    store.load_all()
+    store.load_payments()
+    assert spreadsheet.calls == ['values_batch_update'] * 3 + ['values_append'] * 3 + ['values_batch_update']
+    same_tables(store, reader)
+
+
+def test_own_writes_change_the_version(store):
+    version = store.version()
+    store.update_orders({int(store.load_orders()['Order_ID'].iloc[0]): {'Payment': 'Paid'}})
+    assert store.version() != version
+
+
+def test_batch_sends_one_request(store, reader, spreadsheet):
+    order_id = int(store.load_orders()['Order_ID'].iloc[0])
+    spreadsheet.calls.clear()
+    with store.batch():
+        store.update_orders({order_id: {'Status': 'Completed'}})
+        store.add_payments([{'Order_ID': order_id, 'Amount': 100.0, 'Method': 'UPI', 'Note': None}])
+        store.update_orders({order_id: {'Payment': 'Paid', 'Status': 'Active'}})
+        store.replace_order_items(order_id, [line('Chakli', 2.0, 400.0)])
+        assert store.load_orders().set_index('Order_ID').loc[order_id, 'Payment'] == 'Paid'
+        assert spreadsheet.calls == []
+    assert spreadsheet.calls == ['values_batch_update']
+    order = reader.load_orders().set_index('Order_ID').loc[order_id]
+    assert (order['Status'], order['Payment']) == ('Active', 'Paid')
+    same_tables(store, reader)
+
+
+def test_coalesced_order_fields_are_sent_once(store, spreadsheet, monkeypatch):
+    order_id = int(store.load_orders()['Order_ID'].iloc[0])
+    sent = []
+    monkeypatch.setattr(spreadsheet, 'values_batch_update', lambda body: sent.extend(body['data']))
+    with store.batch():
+        for status in ('Completed', 'Active', 'Completed'):
+            store.update_orders({order_id: {'Status': status}})
+    assert [data['values'] for data in sent] == [[['Completed']]]
+
+
+def test_failed_batch_sends_nothing(store, reader, spreadsheet):
+    order_id = int(store.load_orders()['Order_ID'].iloc[0])
+    spreadsheet.calls.clear()
+    with pytest.raises(RuntimeError):
+        with store.batch():
+            store.update_orders({order_id: {'Status': 'Completed'}})
+            raise RuntimeError
+    assert 'values_batch_update' not in spreadsheet.calls
+    same_tables(store, reader)
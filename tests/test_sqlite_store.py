@@ -0,0 +1,40 @@
+import sqlite3
+
+from seed_data import seed_frames
+from storage import SQLiteStore, seed_if_empty
+
+
+def start_new_season(store):
+    items_df, orders_df, order_items_df = store.load_all()
+    store.replace_all(items_df, orders_df.iloc[0:0], order_items_df.iloc[0:0])
+
+
+def test_fresh_database_is_seeded(tmp_path):
+    store = SQLiteStore(str(tmp_path / 'orders.db'))
+    seed_if_empty(store)
+    assert len(store.load_orders()) == len(seed_frames()[1])
+
+
+def test_new_season_is_not_reseeded_on_restart(tmp_path):
+    path = str(tmp_path / 'orders.db')
+    store = SQLiteStore(path)
+    seed_if_empty(store)
+    start_new_season(store)
+
+    restarted = SQLiteStore(path)
+    seed_if_empty(restarted)
+    assert restarted.load_orders().empty
+    assert len(restarted.load_items()) == len(seed_frames()[0])
+
+
+def test_database_from_before_the_marker_is_not_reseeded(tmp_path):
+    path = str(tmp_path / 'orders.db')
+    store = SQLiteStore(path)
+    seed_if_empty(store)
+    start_new_season(store)
+    with sqlite3.connect(path) as conn:
+        conn.execute("DELETE FROM meta WHERE key = 'seeded'")
+
+    restarted = SQLiteStore(path)
+    seed_if_empty(restarted)
+    assert restarted.load_orders().empty
@@ -0,0 +1,241 @@
+"""Integrity checks for the three tables, with optional repairs.
+
+All checks are vectorized over whole columns and produce one issues table,
+cached per data version. The same checks can be run standalone over CSV
+files, streaming the line items in chunks:
+
+    python validation.py --items items.csv --orders orders.csv --lines order_items.csv
+    python validation.py --seed
+"""
+import argparse
+import csv
+import difflib
+import sys
+from dataclasses import dataclass
+from io import StringIO
+
+import pandas as pd
+
+from aggregates import memoize_by_version
+from compact import lookup
+from storage import ITEM_COLUMNS, ORDER_COLUMNS, ORDER_ITEM_COLUMNS
+
+ISSUE_COLUMNS = ['Table', 'Row', 'Order_ID', 'Column', 'Problem', 'Value', 'Suggestion']
+STATUSES = ['Active', 'Completed']
+PAYMENTS = ['Pending', 'Paid']
+TOLERANCE = 0.005
+FUZZY_CUTOFF = 0.85
+
+
+@dataclass(frozen=True)
+class ValidationReport:
+    issues: pd.DataFrame
+
+    @property
+    def is_clean(self):
+        return self.issues.empty
+
+    def counts(self):
+        return self.issues.groupby(['Table', 'Problem']).size().rename('Count').reset_index()
+
+
+def _issues(table, frame, mask, column, problem, values=None, suggestions=None):
+    mask = mask.to_numpy()
+    if not mask.any():
+        return pd.DataFrame(columns=ISSUE_COLUMNS)
+    selected = frame[mask]
+    values = selected[column] if values is None else values[mask]
+    return pd.DataFrame({
+        'Table': table,
+        'Row': selected.index.to_numpy(),
+        'Order_ID': selected['Order_ID'].to_numpy() if 'Order_ID' in selected else None,
+        'Column': column,
+        'Problem': problem,
+        'Value': values.astype(str).to_numpy(),
+        'Suggestion': None if suggestions is None else suggestions[mask].to_numpy(),
+    })
+
+
+def _concat(frames):
+    frames = [frame for frame in frames if len(frame)]
+    if not frames:
+        return pd.DataFrame(columns=ISSUE_COLUMNS)
+    return pd.concat(frames, ignore_index=True)
+
+
+def suggest_items(names, catalogue, aliases=None, fuzzy=True):
+    """Map unknown item names to a catalogue item, or None if there's no clear match.
+
+    Explicit ``aliases`` win; otherwise a fuzzy match is accepted only when
+    exactly one catalogue item is close enough, so an ambiguous name such as
+    plain "Karanji" is left for a human to fix.
+    """
+    catalogue = list(catalogue)
+    aliases = aliases or {}
+    suggestions = {}
+    for name in names:
+        if name in aliases:
+            suggestions[name] = aliases[name]
+            continue
+        matches = difflib.get_close_matches(str(name), catalogue, n=2, cutoff=FUZZY_CUTOFF) if fuzzy else []
+        suggestions[name] = matches[0] if len(matches) == 1 else None
+    return suggestions
+
+
+def check_schema(table, frame, columns):
+    missing = [column for column in columns if column not in frame.columns]
+    return pd.DataFrame({'Table': table, 'Row': None, 'Order_ID': None, 'Column': missing,
+                         'Problem': 'missing column', 'Value': None, 'Suggestion': None},
+                        columns=ISSUE_COLUMNS)
+
+
+def check_items(items_df):
+    rate = pd.to_numeric(items_df['Rate'], errors='coerce')
+    return _concat([
+        _issues('items', items_df, items_df['Item_Name'].duplicated(keep=False), 'Item_Name', 'duplicate item'),
+        _issues('items', items_df, rate.isna() | (rate <= 0), 'Rate', 'rate missing or not positive'),
+    ])
+
+
+def check_orders(orders_df):
+    return _concat([
+        _issues('orders', orders_df, orders_df['Order_ID'].duplicated(keep=False), 'Order_ID', 'duplicate Order_ID'),
+        _issues('orders', orders_df, orders_df['Customer_Name'].isna(), 'Customer_Name', 'missing customer'),
+        _issues('orders', orders_df, orders_df['Delivery_Date'].isna(), 'Delivery_Date', 'missing delivery date'),
+        _issues('orders', orders_df, ~orders_df['Status'].isin(STATUSES), 'Status', 'unknown status'),
+        _issues('orders', orders_df, ~orders_df['Payment'].isin(PAYMENTS), 'Payment', 'unknown payment state'),
+    ])
+
+
+def check_order_items(order_items_df, items_df, order_ids, aliases=None, fuzzy=True):
+    catalogue = items_df.set_index('Item_Name')['Rate']
+    item_rate = lookup(order_items_df['Item_Name'], catalogue)
+    unknown = item_rate.isna()
+    suggestions = lookup(order_items_df['Item_Name'], suggest_items(
+        order_items_df.loc[unknown, 'Item_Name'].unique(), catalogue.index, aliases, fuzzy))
+
+    quantity = pd.to_numeric(order_items_df['quantity'], errors='coerce')
+    rate = pd.to_numeric(order_items_df['rate'], errors='coerce')
+    amount = pd.to_numeric(order_items_df['Amount'], errors='coerce')
+    computed = quantity * rate
+
+    return _concat([
+        _issues('order_items', order_items_df, unknown, 'Item_Name', 'unknown item', suggestions=suggestions),
+        _issues('order_items', order_items_df, ~order_items_df['Order_ID'].isin(order_ids),
+                'Order_ID', 'line item for unknown order'),
+        _issues('order_items', order_items_df, quantity.isna() | (quantity <= 0),
+                'quantity', 'quantity missing or not positive'),
+        _issues('order_items', order_items_df, ~unknown & ((rate - item_rate).abs() > TOLERANCE),
+                'rate', 'rate differs from catalogue', suggestions=item_rate),
+        _issues('order_items', order_items_df, amount.isna() | ((amount - computed).abs() > TOLERANCE),
+                'Amount', 'Amount != quantity x rate', suggestions=computed),
+    ])
+
+
+def check_csv_fields(text_or_file, table, expected_columns):
+    """Rows whose field count differs from the header, e.g. a dropped trailing Notes."""
+    reader = csv.reader(StringIO(text_or_file) if isinstance(text_or_file, str) else text_or_file)
+    header = next(reader, [])
+    issues = []
+    for row_number, row in enumerate(reader):
+        if row and len(row) != len(header):
+            issues.append((table, row_number, None, None,
+                           f"{len(row)} fields, header has {len(header)}", ','.join(row), None))
+    frames = [pd.DataFrame(issues, columns=ISSUE_COLUMNS),
+              check_schema(table, pd.DataFrame(columns=header), expected_columns)]
+    return _concat(frames)
+
+
+def validate_tables(items_df, orders_df, order_items_df, aliases=None, fuzzy=True):
+    issues = _concat([
+        check_schema('items', items_df, ITEM_COLUMNS),
+        check_schema('orders', orders_df, ORDER_COLUMNS),
+        check_schema('order_items', order_items_df, ORDER_ITEM_COLUMNS),
+        check_items(items_df),
+        check_orders(orders_df),
+        check_order_items(order_items_df, items_df, orders_df['Order_ID'], aliases, fuzzy),
+    ])
+    return ValidationReport(issues=issues)
+
+
+@memoize_by_version()
+def validation_report(version, items_df, orders_df, order_items_df):
+    return validate_tables(items_df, orders_df, order_items_df)
+
+
+def repair_order_items(order_items_df, report, fix_items=True, fix_amounts=True, fix_rates=False):
+    """Apply the report's suggestions to a copy of the line items.
+
+    Returns the repaired frame and the Order_IDs whose lines changed. Item
+    names are only replaced where the report has an unambiguous suggestion;
+    catalogue rates are only applied when ``fix_rates`` is set, because a
+    negotiated price is not necessarily a mistake.
+    """
+    issues = report.issues[(report.issues['Table'] == 'order_items') & report.issues['Suggestion'].notna()]
+    repaired = order_items_df.copy()
+    changed = pd.Index([])
+
+    def apply(problem, column):
+        fixes = issues[issues['Problem'] == problem]
+        if len(fixes):
+            repaired.loc[fixes['Row'].to_numpy(), column] = (
+                fixes['Suggestion'].astype(repaired[column].dtype).to_numpy())
+        return pd.Index(fixes['Order_ID'])
+
+    if fix_items:
+        changed = changed.append(apply('unknown item', 'Item_Name'))
+    if fix_rates:
+        changed = changed.append(apply('rate differs from catalogue', 'rate'))
+    if fix_amounts or fix_rates:
+        computed = repaired['quantity'] * repaired['rate']
+        wrong = (repaired['Amount'] - computed).abs() > TOLERANCE
+        repaired.loc[wrong, 'Amount'] = computed[wrong]
+        changed = changed.append(pd.Index(repaired.loc[wrong, 'Order_ID']))
+    return repaired, sorted(int(order_id) for order_id in changed.unique())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check orders data for integrity problems.")
+    parser.add_argument('--items', help="items CSV")
+    parser.add_argument('--orders', help="orders CSV")
+    parser.add_argument('--lines', help="order line items CSV, read in chunks")
+    parser.add_argument('--seed', action='store_true', help="check the embedded seed data")
+    parser.add_argument('--chunksize', type=int, default=100000)
+    args = parser.parse_args(argv)
+
+    if args.seed:
+        import seed_data
+        raw = [('items', seed_data.ITEMS_DATA, ITEM_COLUMNS),
+               ('orders', seed_data.ORDERS_DATA, ORDER_COLUMNS),
+               ('order_items', seed_data.ORDER_ITEMS_DATA, ORDER_ITEM_COLUMNS)]
+        frames = [check_csv_fields(text, table, columns) for table, text, columns in raw]
+        frames.append(validate_tables(*seed_data.seed_frames()).issues)
+    else:
+        if not (args.items and args.orders and args.lines):
+            parser.error("--items, --orders and --lines are required unless --seed is given")
+        items_df = pd.read_csv(args.items)
+        orders_df = pd.read_csv(args.orders)
+        frames = [check_schema('items', items_df, ITEM_COLUMNS),
+                  check_schema('orders', orders_df, ORDER_COLUMNS)]
+        # The remaining checks index these columns directly
+        if all(frame.empty for frame in frames):
+            for column in ('Delivery_Date', 'Order_Date'):
+                orders_df[column] = pd.to_datetime(orders_df[column], format='mixed', errors='coerce')
+            frames += [check_items(items_df), check_orders(orders_df)]
+            for chunk in pd.read_csv(args.lines, chunksize=args.chunksize):
+                schema = check_schema('order_items', chunk, ORDER_ITEM_COLUMNS)
+                if not schema.empty:
+                    frames.append(schema)
+                    break
+                frames.append(check_order_items(chunk, items_df, orders_df['Order_ID']))
+
+    issues = _concat(frames)
+    if issues.empty:
+        print("No problems found")
+        return 0
+    issues.to_csv(sys.stdout, index=False)
+    return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,111 @@
+"""Per-page computations, callable without Streamlit.
+
+Each function returns the data a page renders, so pages can be timed and
+tested on their own; the Streamlit script only formats and displays it.
+"""
+from dataclasses import dataclass
+
+import pandas as pd
+
+from instrumentation import timed
+from metrics import DashboardMetrics, metrics_from_rollup
+from order_index import paginate
+from planner import stock_plan_from_rollup
+from storage import filter_orders
+
+LOW_STOCK_KG = 2
+TOP_ITEMS = 5
+
+
+@dataclass(frozen=True)
+class DashboardView:
+    metrics: DashboardMetrics
+    # Active orders due today, with their order Total
+    todays_deliveries: pd.DataFrame
+    top_items: pd.DataFrame
+    # Stock plan rows with less than LOW_STOCK_KG to spare
+    stock_alerts: pd.DataFrame
+
+
+def top_items(rollup, n=TOP_ITEMS):
+    return rollup.by_item()[['quantity', 'Amount']].sort_values('quantity', ascending=False).head(n)
+
+
+def item_stats(rollup):
+    """Per item: orders containing it, kg, revenue and how many of those orders are active."""
+    stats = rollup.by_item()
+    return pd.DataFrame({
+        'Total_Orders': stats['Orders'].astype('int64'),
+        'quantity': stats['quantity'],
+        'Amount': stats['Amount'],
+        'Active_Orders': rollup.by_item(status='Active')['Orders'].reindex(stats.index, fill_value=0).astype('int64'),
+    })
+
+
+@timed()
+def dashboard_view(version, items_df, orders_df, rollup, summary, today):
+    """Everything on the Dashboard, answered from the rollup rather than the line items."""
+    todays = filter_orders(orders_df, status='Active', delivery_from=today, delivery_to=today)
+    todays = todays.assign(Total=summary['Total'].reindex(todays['Order_ID']).to_numpy())
+    plan = stock_plan_from_rollup(version, items_df, rollup)
+    return DashboardView(
+        metrics=metrics_from_rollup(orders_df, rollup, summary),
+        todays_deliveries=todays,
+        top_items=top_items(rollup),
+        stock_alerts=plan.summary[plan.summary['Difference'] < LOW_STOCK_KG],
+    )
+
+
+@timed()
+def stock_analysis_table(plan):
+    """The Stock Analysis page's main table, formatted for display."""
+    summary = plan.summary
+    return pd.DataFrame({
+        'Item': summary.index,
+        'Current Stock': summary['Stock'].map('{:.1f} kg'.format),
+        'Required': summary['Required'].map('{:.1f} kg'.format),
+        'Difference': summary['Difference'].map('{:.1f} kg'.format),
+        'Status': summary['Difference'].ge(0).map({True: "✅ OK", False: "⚠️ SHORT"}),
+        'Runs Short': summary['First_Short'].dt.strftime('%d %b %Y').fillna("—"),
+    })
+
+
+@timed()
+def item_customers_view(index, rollup, item_name):
+    """Stats for one item and a table of the orders containing it.
+
+    Values are left unformatted (the page formats them client-side), so the
+    cost is a slice of the item's postings. Returns (None, None) if the item
+    has never been ordered.
+    """
+    stats = item_stats(rollup)
+    if item_name not in stats.index:
+        return None, None
+    customers = index.postings(item_name)
+    customer_df = pd.DataFrame({
+        'Customer': customers['Customer_Name'],
+        'Quantity': customers['quantity'],
+        'Delivery Date': customers['Delivery_Date'],
+        'Status': customers['Status'],
+        'Payment': customers['Payment']
+    })
+    return stats.loc[item_name], customer_df
+
+
+@dataclass(frozen=True)
+class OrderPage:
+    # This page's orders, with their order Total
+    orders: pd.DataFrame
+    page: int
+    page_count: int
+    total_count: int
+
+
+@timed()
+def order_listing(index, summary, status, page=1, page_size=25, descending=False, **filters):
+    """One page of orders with ``status`` matching ``filters`` (see OrderIndex.query)."""
+    matches = index.query(status, descending=descending, **filters)
+    rows, page_count = paginate(matches, page, page_size)
+    rows = rows.assign(Total=summary['Total'].reindex(rows['Order_ID']).to_numpy())
+    return OrderPage(orders=rows, page=min(max(1, page), page_count),
+                     page_count=page_count, total_count=len(matches))